@@ -1,60 +1,58 @@
 import streamlit as st
 import numpy as np
 import pandas as pd
-import re
-import pickle
-import matplotlib.pyplot as plt
 import seaborn as sns
-from tensorflow.keras.preprocessing.text import Tokenizer
-from tensorflow.keras.preprocessing.sequence import pad_sequences
-from keras.models import load_model
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+import contextlib
+import html
 import os
+import time
+import uuid
 import plotly.express as px
 import plotly.graph_objects as go
 from wordcloud import WordCloud
+from sentimen import engine
+from sentimen.attribution import token_attributions
+from sentimen.nltk_setup import ensure_nltk_resources
+from sentimen.ensemble import ensemble_predict, preload_models
+from sentimen.near_duplicates import NearDuplicateIndex
+from sentimen.prediction_cache import get_prediction_cache, predict_with_cache
+from sentimen.server import predict_remote
+from sentimen.shadow import get_shadow_scorer
+from sentimen.store import CREATED_AT_FORMAT, RESULT_STORE_PATH, write_results as write_store_results
+from sentimen.streaming import get_stream, running_streams, stop_stream
+from sentimen.tracing import STAGE_LABELS, STAGE_METRICS, Trace, start_metrics_server
+from sentimen.wordfreq import WordFrequencies
+from sentimen.engine import (
+    CASCADE_ENABLED,
+    CASCADE_NEUTRAL_SCORE,
+    KEYWORD_WEIGHT,
+    MODEL_TYPES,
+    MODEL_WEIGHT,
+    SENTIMENT_THRESHOLD,
+    TOKENIZER_PATH,
+    cascade_needs_model,
+    check_sentiment_keywords,
+    check_sentiment_keywords_batch,
+    combine_scores,
+    get_blend,
+    get_model_path,
+    pad_token_sequences,
+    predict_padded,
+    preprocess_text,
+    preprocess_texts,
+    sentiment_label,
+    texts_to_padded,
+)
 
+# Cek resource NLTK sekali per proses (hanya membaca disk, tanpa download).
+# Download dilakukan terpisah dengan: python -m sentimen.nltk_setup
+@st.cache_resource(show_spinner=False)
 def initialize_nltk():
-    try:
-        # Set NLTK data path to a directory we have write access to
-        nltk_data_dir = os.path.join(os.getcwd(), 'nltk_data')
-        os.makedirs(nltk_data_dir, exist_ok=True)
-        nltk.data.path.append(nltk_data_dir)
-        
-        # Download required resources with error handling
-        required_resources = ['punkt', 'stopwords', 'wordnet', 'omw-1.4']
-        
-        for resource in required_resources:
-            try:
-                nltk.download(resource, download_dir=nltk_data_dir)
-            except Exception as e:
-                st.warning(f"Gagal mengunduh resource NLTK '{resource}': {str(e)}")
-                
-    except Exception as e:
-        st.error(f"Error inisialisasi NLTK: {str(e)}")
+    return ensure_nltk_resources()
 
 # Panggil fungsi inisialisasi
 initialize_nltk()
 
-# Fallback tokenizer yang lebih robust
-def robust_tokenizer(text):
-    try:
-        # Coba gunakan word_tokenize standar
-        return word_tokenize(text)
-    except:
-        try:
-            # Fallback 1: Split sederhana dengan regex
-            return re.findall(r"\w+", text.lower())
-        except:
-            # Fallback 2: Split paling dasar
-            return text.lower().split()
-
-# Gunakan tokenizer yang aman
-safe_word_tokenize = robust_tokenizer
-
 # Set konfigurasi halaman
 st.set_page_config(
     page_title="Analisis Sentimen Program Makan Bergizi",
@@ -103,122 +101,50 @@ st.markdown("""
     .lstm-color { background-color: #3498DB; color: white; }
     .bilstm-color { background-color: #9B59B6; color: white; }
     .gru-color { background-color: #2ECC71; color: white; }
+    .ensemble-color { background-color: #E67E22; color: white; }
 </style>
 """, unsafe_allow_html=True)
 
-# Daftar kata positif dan negatif
-POSITIVE_WORDS = [
-    "dukung", "kuat", "cerah", "meningkat", "sehat", "cerdas", 
-    "penting", "damping", "senang", "terima kasih", "bisa", 
-    "lahap", "baik", "mantap", "membantu"
-]
-
-NEGATIVE_WORDS = [
-    "gila", "najis", "mending", "jajan", "tentang", "tidak", 
-    "ketimbang", "bukan", "menghina", "belum", "tega", "malah", 
-    "sakit", "mubazir", "tolol", "korupsi", "bajingan", "kasian", 
-    "persetan", "tai", "sialan", "kasihan", "anjing", "goblok", 
-    "ironis", "konyol", "mampus", "bangsat","buruk"
-]
-
-# Fungsi untuk memeriksa kata-kata kunci dalam teks
-def check_sentiment_keywords(text):
-    text_lower = text.lower()
-    
-    # Cek kata-kata positif
-    positive_matches = []
-    for word in POSITIVE_WORDS:
-        if word in text_lower:
-            positive_matches.append(word)
-    
-    # Cek kata-kata negatif
-    negative_matches = []
-    for word in NEGATIVE_WORDS:
-        if word in text_lower:
-            negative_matches.append(word)
-    
-    # Tentukan sentimen berdasarkan jumlah kata yang cocok
-    positive_count = len(positive_matches)
-    negative_count = len(negative_matches)
-    
-    # Kembalikan hasil
-    return {
-        'positive_count': positive_count,
-        'negative_count': negative_count,
-        'positive_matches': positive_matches,
-        'negative_matches': negative_matches,
-        'keyword_sentiment': 'Positif' if positive_count > negative_count else 'Negatif' if negative_count > positive_count else 'Netral',
-        'keyword_score': calculate_keyword_score(positive_count, negative_count)
-    }
+# Alamat server inferensi bersama (python -m sentimen.server), jika diatur.
+# Jika kosong, model dimuat langsung di proses Streamlit ini.
+INFERENCE_SERVER_URL = os.environ.get('SENTIMEN_SERVER_URL', '')
 
-# Fungsi untuk menghitung skor berdasarkan jumlah kata positif dan negatif
-def calculate_keyword_score(positive_count, negative_count):
-    total = positive_count + negative_count
-    if total == 0:
-        return 0.5  # Netral jika tidak ada kata kunci yang cocok
-    
-    # Konversi ke skor 0-1
-    return positive_count / total
+# Pilihan mode ensemble (rata-rata skor LSTM, BI-LSTM dan GRU)
+ENSEMBLE_MODE = "Ensemble"
 
-# Fungsi preprocessing teks
-def preprocess_text(text):
-    try:
-        # Lowercase
-        text = text.lower()
-        
-        # Hapus URL
-        text = re.sub(r'http\S+', '', text)
-        
-        # Hapus username Twitter
-        text = re.sub(r'@\w+', '', text)
-        
-        # Hapus hashtag
-        text = re.sub(r'#\w+', '', text)
-        
-        # Hapus angka dan tanda baca
-        text = re.sub(r'[^\w\s]', '', text)
-        text = re.sub(r'\d+', '', text)
-        
-        # Tokenisasi dengan fallback
-        tokens = safe_word_tokenize(text)
-        
-        try:
-            # Hapus stopwords (dengan fallback jika stopwords tidak tersedia)
-            stop_words = set(stopwords.words('indonesian')) if 'stopwords' in nltk.data.path else set()
-            tokens = [word for word in tokens if word not in stop_words]
-        except:
-            tokens = tokens  # Jika stopwords gagal, gunakan tokens asli
-            
-        # Stemming dengan Sastrawi
-        try:
-            factory = StemmerFactory()
-            stemmer = factory.create_stemmer()
-            tokens = [stemmer.stem(word) for word in tokens]
-        except:
-            tokens = tokens  # Jika stemming gagal, gunakan tokens asli
-        
-        # Gabungkan kembali
-        processed_text = ' '.join(tokens)
-        return processed_text, tokens
-    
-    except Exception as e:
-        st.error(f"Error dalam preprocessing teks: {str(e)}")
-        return text.lower(), text.lower().split()  # Fallback paling dasar
+# Cache prediksi (memori + SQLite) untuk teks berulang pada analisis batch, aktif jika
+# SENTIMEN_PREDICTION_CACHE=1
+PREDICTION_CACHE_ENABLED = os.environ.get('SENTIMEN_PREDICTION_CACHE', '') == '1'
+
+# Ambang Jaccard deteksi hampir-duplikat pada analisis batch (misalnya SENTIMEN_NEAR_DUPLICATES=0.8).
+# Model hanya dijalankan sekali per klaster; kosong berarti tidak aktif
+NEAR_DUPLICATE_THRESHOLD = float(os.environ.get('SENTIMEN_NEAR_DUPLICATES', '') or 0)
+
+# Sumber default halaman Live Streaming: file JSONL/CSV yang terus bertambah atau URL X search API
+STREAM_SOURCE_DEFAULT = os.environ.get('SENTIMEN_STREAM_SOURCE', '')
+
+# Jeda polling agregat pada halaman Live Streaming dalam detik
+STREAM_REFRESH_SECONDS = float(os.environ.get('SENTIMEN_STREAM_REFRESH', '2'))
+
+# Port endpoint metrik Prometheus (durasi per tahap), aktif jika SENTIMEN_METRICS_PORT diatur
+METRICS_PORT = os.environ.get('SENTIMEN_METRICS_PORT', '')
+
+# Atribusi token (occlusion) pada analisis teks: satu prediksi batch tambahan per teks.
+# Aktif secara default, SENTIMEN_EXPLAIN=0 menonaktifkan
+EXPLAIN_ENABLED = os.environ.get('SENTIMEN_EXPLAIN', '1') != '0'
+
+# Model bayangan (misalnya SENTIMEN_SHADOW_MODEL=GRU) yang menilai input analisis teks yang sama di
+# thread latar setelah hasil ditampilkan; kesesuaian dan selisih latensi tampil di panel debug
+SHADOW_MODEL = os.environ.get('SENTIMEN_SHADOW_MODEL', '')
+
+# Panel debug (rincian tahap analisis terakhir) di sidebar langsung aktif jika SENTIMEN_DEBUG_PANEL=1
+DEBUG_PANEL_DEFAULT = os.environ.get('SENTIMEN_DEBUG_PANEL', '') == '1'
 
 # Function to load model (cached agar tidak reload setiap interaksi)
 @st.cache_resource
 def load_sentiment_model(model_type="BI-LSTM"):
     try:
-        if model_type == "BI-LSTM":
-            model = load_model('model/model_BI_LSTM.h5')
-        elif model_type == "GRU":
-            model = load_model('model/model_GRU.h5')
-        elif model_type == "LSTM":
-            model = load_model('model/model_LSTM.h5')
-        else:
-            st.error(f"Model type {model_type} tidak dikenali.")
-            return None
-        return model
+        return engine.load_sentiment_model(model_type)
     except Exception as e:
         st.error(f"Error loading model: {e}")
         return None
@@ -227,20 +153,279 @@ def load_sentiment_model(model_type="BI-LSTM"):
 @st.cache_resource
 def get_tokenizer():
     # Cek apakah file tokenizer sudah ada
-    if not os.path.exists('tokenizer.pickle'):
+    if not os.path.exists(TOKENIZER_PATH):
         st.error("File tokenizer 'tokenizer.pickle' tidak ditemukan. Pastikan file tersebut ada di direktori yang sama.")
         return None
     
     # Muat tokenizer dari file
     try:
-        with open('tokenizer.pickle', 'rb') as handle:
-            tokenizer = pickle.load(handle)
-        return tokenizer
+        return engine.get_tokenizer()
     except Exception as e:
         st.error(f"Error loading tokenizer: {e}")
         return None
 
-# Fungsi untuk membuat wordcloud
+# Preload dan warm-up semua model sekaligus (sekali per proses)
+@st.cache_resource(show_spinner="Memuat dan memanaskan semua model...")
+def preload_all_models():
+    try:
+        return preload_models()
+    except Exception as e:
+        st.error(f"Error loading model: {e}")
+        return {}
+
+# Endpoint metrik dijalankan sekali per proses (bukan setiap rerun)
+@st.cache_resource(show_spinner=False)
+def start_metrics_endpoint(port):
+    return start_metrics_server(port)
+
+# Fungsi untuk mencari file model/tokenizer yang tidak ditemukan
+def find_missing_model_files(model_type):
+    if INFERENCE_SERVER_URL and model_type != ENSEMBLE_MODE:
+        return []  # Model dan tokenizer berada di server inferensi
+
+    files_missing = []
+    if model_type == ENSEMBLE_MODE:
+        # Ensemble cukup membutuhkan minimal satu model
+        model_paths = [get_model_path(name) for name in MODEL_TYPES]
+        if not any(os.path.exists(path) for path in model_paths):
+            files_missing += [f"Model '{path}'" for path in model_paths]
+    else:
+        model_path = get_model_path(model_type if model_type in MODEL_TYPES else "LSTM")
+        if not os.path.exists(model_path):
+            files_missing.append(f"Model '{model_path}'")
+    if not os.path.exists(TOKENIZER_PATH):
+        files_missing.append(f"Tokenizer '{TOKENIZER_PATH}'")
+    return files_missing
+
+# Fungsi untuk mengambil class CSS badge algoritma
+def get_algo_color(model_type):
+    return {
+        "BI-LSTM": "bilstm-color",
+        "GRU": "gru-color",
+        ENSEMBLE_MODE: "ensemble-color"
+    }.get(model_type, "lstm-color")
+
+# Kolom-kolom ekspor X/Twitter yang ikut ditampilkan pada hasil batch
+BATCH_ID_COLUMNS = ['id_str', 'conversation_id_str', 'user_id_str']
+BATCH_INFO_COLUMNS = ['id_str', 'created_at', 'username', 'tweet_url']
+
+# Fungsi untuk menganalisis seluruh baris sebuah DataFrame ekspor tweet
+def analyze_dataframe(df, model_type, text_column='full_text', batch_size=1024, trace=None, cascade=False):
+    trace = trace or Trace('analisis_batch', metrics=None)
+    texts = df[text_column].fillna('').astype(str).tolist()
+
+    # Analisis kata kunci untuk semua baris
+    with trace.span('keywords'):
+        keyword_results = pd.DataFrame(check_sentiment_keywords_batch(texts), index=df.index)
+        keyword_results['positive_matches'] = keyword_results['positive_matches'].str.join(', ')
+        keyword_results['negative_matches'] = keyword_results['negative_matches'].str.join(', ')
+
+    info_columns = [col for col in BATCH_INFO_COLUMNS if col in df.columns and col != text_column]
+    results = df[info_columns].copy()
+    results[text_column] = texts
+    results = pd.concat([results, keyword_results], axis=1)
+
+    # Mode cascade: hanya baris yang labelnya masih bergantung pada skor model yang diprediksi.
+    # Kolom hasil model diisi per model_index; baris lain bernilai kosong (NaN).
+    needs_model = cascade_needs_model(results['keyword_score'], model_type) if cascade else \
+        np.ones(len(texts), dtype=bool)
+    model_index = results.index[needs_model]
+    model_texts = [text for text, needed in zip(texts, needs_model) if needed]
+
+    if INFERENCE_SERVER_URL and model_type != ENSEMBLE_MODE:
+        remote_results = []
+        with trace.span('predict', remote=True):
+            for start in range(0, len(model_texts), batch_size):
+                remote_results += predict_remote(model_texts[start:start + batch_size], model_type,
+                                                  INFERENCE_SERVER_URL)
+        model = tokenizer = None
+    else:
+        remote_results = None
+        model_ready = not find_missing_model_files(model_type)
+        with trace.span('model_load'):
+            if model_type == ENSEMBLE_MODE:
+                model = preload_all_models() if model_ready else None
+            else:
+                model = load_sentiment_model(model_type) if model_ready else None
+            tokenizer = get_tokenizer() if model_ready else None
+
+    model_used = True
+    # Jika semua baris dilewati cascade, server tidak perlu dipanggil dan hasilnya tetap dihitung
+    # seperti jalur lokal (skor model netral), bukan sebagai analisis kata kunci saja
+    if remote_results is not None and (not model_texts or
+                                       any(result['model_type'] is not None for result in remote_results)):
+        results['processed_text'] = pd.Series([result['processed_text'] for result in remote_results],
+                                              index=model_index, dtype=object)
+        results['model_score'] = pd.Series([result['model_score'] for result in remote_results],
+                                           index=model_index, dtype=float)
+    elif model is not None and tokenizer is not None and PREDICTION_CACHE_ENABLED and model_type != ENSEMBLE_MODE:
+        # Teks yang pernah diprediksi (retweet, copy-paste) diambil dari cache
+        with trace.span('predict', cached=True):
+            processed_texts, model_scores = predict_with_cache(
+                model_texts, model_type, get_prediction_cache(), batch_size=batch_size
+            ) if model_texts else ([], [])
+        results['processed_text'] = pd.Series(processed_texts, index=model_index, dtype=object)
+        results['model_score'] = pd.Series(model_scores, index=model_index, dtype=float)
+    elif model is not None and tokenizer is not None:
+        with trace.span('preprocess'):
+            processed_texts, _ = preprocess_texts(model_texts)
+        results['processed_text'] = pd.Series(processed_texts, index=model_index, dtype=object)
+        if NEAR_DUPLICATE_THRESHOLD:
+            # Indeks baru per analisis: id klaster berurutan 0..n-1 sesuai representatifnya, sehingga
+            # skor representatif dapat langsung disebar ke anggota klaster dengan indeks array
+            with trace.span('near_duplicates'):
+                cluster_ids, new_clusters = NearDuplicateIndex(NEAR_DUPLICATE_THRESHOLD).assign(processed_texts)
+            results['cluster_id'] = pd.Series(cluster_ids, index=model_index).reindex(results.index, fill_value=-1)
+            processed_texts = [text for _, text in new_clusters]
+        else:
+            cluster_ids = slice(None)
+        with trace.span('tokenize'):
+            padded_sequences = texts_to_padded(tokenizer, processed_texts)
+        with trace.span('predict'):
+            if not processed_texts:
+                results['model_score'] = np.nan
+            elif model_type == ENSEMBLE_MODE:
+                ensemble = ensemble_predict(padded_sequences, batch_size=batch_size)
+                for name, scores in ensemble['scores'].items():
+                    results[f'model_score_{name}'] = pd.Series(np.asarray(scores)[cluster_ids], index=model_index)
+                results['model_score'] = pd.Series(np.asarray(ensemble['mean'])[cluster_ids], index=model_index)
+            else:
+                results['model_score'] = pd.Series(predict_padded(model, padded_sequences, batch_size)[cluster_ids],
+                                                   index=model_index)
+    else:
+        model_used = False
+        results['model_score'] = np.nan
+        results['combined_score'] = results['keyword_score']
+        results['sentiment'] = results['keyword_sentiment']
+
+    if model_used:
+        # Bobot sama dengan analisis teks tunggal; baris yang dilewati cascade memakai skor model
+        # netral, labelnya tetap sama untuk skor model berapa pun
+        results['combined_score'] = combine_scores(results['model_score'].fillna(CASCADE_NEUTRAL_SCORE),
+                                                   results['keyword_score'], model_type)
+        results['sentiment'] = results['combined_score'].map(lambda score: sentiment_label(score, model_type))
+        if cascade:
+            results['model_skipped'] = ~needs_model
+
+    return results
+
+# Fungsi untuk membuat pie chart distribusi label pada hasil batch
+def create_batch_sentiment_pie(results):
+    counts = results['sentiment'].value_counts()
+
+    fig = px.pie(
+        names=counts.index,
+        values=counts.values,
+        hole=.4,
+        color=counts.index,
+        color_discrete_map={
+            'Positif': 'rgba(46, 204, 113, 0.8)',
+            'Negatif': 'rgba(231, 76, 60, 0.8)',
+            'Netral': 'rgba(149, 165, 166, 0.8)'
+        },
+        title='Distribusi Sentimen'
+    )
+    fig.update_layout(title_font=dict(size=20, color='#389cff'), title_x=0.5)
+    return fig
+
+# Fungsi untuk membuat histogram skor sentimen pada hasil batch
+def create_batch_score_histogram(results):
+    fig = px.histogram(
+        results,
+        x='combined_score',
+        nbins=20,
+        color='sentiment',
+        color_discrete_map={'Positif': 'green', 'Negatif': 'red', 'Netral': 'gray'},
+        labels={'combined_score': 'Skor Sentimen', 'sentiment': 'Sentimen'},
+        title='Sebaran Skor Sentimen'
+    )
+    fig.update_layout(
+        yaxis_title='Jumlah Tweet',
+        xaxis=dict(range=[0, 1]),
+        title_font=dict(size=20, color='#389cff'),
+        title_x=0.5,
+    )
+    return fig
+
+# Fungsi untuk membuat grafik tren harian pada hasil batch
+def create_batch_daily_trend(results):
+    if 'created_at' not in results.columns:
+        return None
+
+    created_at = pd.to_datetime(results['created_at'], format=CREATED_AT_FORMAT, errors='coerce')
+    if created_at.isna().all():
+        return None
+
+    daily = (
+        results.assign(tanggal=created_at.dt.date)
+        .dropna(subset=['tanggal'])
+        .groupby(['tanggal', 'sentiment'])
+        .size()
+        .reset_index(name='jumlah')
+    )
+
+    fig = px.line(
+        daily,
+        x='tanggal',
+        y='jumlah',
+        color='sentiment',
+        markers=True,
+        color_discrete_map={'Positif': 'green', 'Negatif': 'red', 'Netral': 'gray'},
+        labels={'tanggal': 'Tanggal', 'jumlah': 'Jumlah Tweet', 'sentiment': 'Sentimen'},
+        title='Tren Sentimen Harian'
+    )
+    fig.update_layout(title_font=dict(size=20, color='#389cff'), title_x=0.5)
+    return fig
+
+# Fungsi untuk membuat bar chart kata kunci yang paling sering muncul
+def create_batch_keyword_bars(results, top_n=15):
+    keyword_counts = []
+    for column, label in [('positive_matches', 'Positif'), ('negative_matches', 'Negatif')]:
+        words = results[column].str.split(', ').explode()
+        words = words[words.astype(bool)]
+        for word, count in words.value_counts().items():
+            keyword_counts.append({'kata': word, 'jumlah': count, 'jenis': label})
+
+    if not keyword_counts:
+        return None
+
+    keyword_df = pd.DataFrame(keyword_counts).sort_values('jumlah', ascending=False).head(top_n)
+
+    fig = px.bar(
+        keyword_df,
+        x='jumlah',
+        y='kata',
+        color='jenis',
+        orientation='h',
+        color_discrete_map={'Positif': 'green', 'Negatif': 'red'},
+        labels={'kata': 'Kata Kunci', 'jumlah': 'Jumlah Tweet', 'jenis': 'Jenis'},
+        title='Kata Kunci Terbanyak'
+    )
+    fig.update_layout(
+        yaxis=dict(categoryorder='total ascending'),
+        title_font=dict(size=20, color='#389cff'),
+        title_x=0.5,
+    )
+    return fig
+
+# Semua grafik hasil batch dibuat sekali per hasil analisis. results_key berubah setiap kali
+# analisis baru selesai, sehingga DataFrame hasil (_results) tidak perlu di-hash setiap rerun.
+@st.cache_data(max_entries=4, show_spinner=False)
+def create_batch_charts(_results, results_key):
+    return {
+        'pie': create_batch_sentiment_pie(_results),
+        'histogram': create_batch_score_histogram(_results),
+        'trend': create_batch_daily_trend(_results),
+        'keywords': create_batch_keyword_bars(_results)
+    }
+
+def _wordcloud():
+    return WordCloud(width=800, height=400, background_color='white',
+                     colormap='viridis', max_words=100)
+
+# Fungsi untuk membuat wordcloud sebagai gambar RGB (ditampilkan dengan st.image).
+# Di-cache per isi token, dan tidak ada figure Matplotlib yang dibuat ulang setiap rerun.
+@st.cache_data(max_entries=64, show_spinner=False)
 def create_wordcloud(text_tokens):
     if not text_tokens:
         return None
@@ -249,16 +434,73 @@ def create_wordcloud(text_tokens):
     text = ' '.join(text_tokens)
     
     # Buat wordcloud
-    wordcloud = WordCloud(width=800, height=400, background_color='white', 
-                          colormap='viridis', max_words=100).generate(text)
-    
-    # Plot wordcloud
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.imshow(wordcloud, interpolation='bilinear')
-    ax.axis("off")
+    return _wordcloud().generate(text).to_array()
+
+# Fungsi wordcloud dari frekuensi kata (hasil WordFrequencies.most_common) untuk analisis batch
+@st.cache_data(max_entries=16, show_spinner=False)
+def create_frequency_wordcloud(frequencies):
+    if not frequencies:
+        return None
+    return _wordcloud().generate_from_frequencies(dict(frequencies)).to_array()
+
+# Fungsi grafik volume dan porsi positif per bucket waktu dari snapshot agregat stream
+def create_stream_trend(window, resolution_label):
+    buckets = pd.DataFrame(window['buckets'])
+    if buckets.empty:
+        return None
+    buckets['start'] = pd.to_datetime(buckets['start'])
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=buckets['start'], y=buckets['volume'], name='Volume', marker_color='#389cff'))
+    fig.add_trace(go.Scatter(x=buckets['start'], y=buckets['positive_share'], name='Porsi Positif',
+                             mode='lines+markers', line=dict(color='green'), yaxis='y2'))
+    fig.update_layout(
+        title=f'Volume dan Sentimen per {resolution_label}',
+        title_font=dict(size=20, color='#389cff'),
+        title_x=0.5,
+        yaxis=dict(title='Jumlah Tweet'),
+        yaxis2=dict(title='Porsi Positif', overlaying='y', side='right', range=[0, 1], tickformat='.0%'),
+        legend=dict(orientation='h', y=-0.2)
+    )
+    return fig
+
+# Fungsi bar chart kata kunci terbanyak di jendela stream (Counter berjalan pada agregat)
+def create_stream_keyword_bars(window):
+    keyword_df = pd.DataFrame(
+        [{'kata': word, 'jumlah': count, 'jenis': 'Positif'} for word, count in window['top_positive_words']] +
+        [{'kata': word, 'jumlah': count, 'jenis': 'Negatif'} for word, count in window['top_negative_words']]
+    )
+    if keyword_df.empty:
+        return None
+
+    fig = px.bar(
+        keyword_df,
+        x='jumlah',
+        y='kata',
+        color='jenis',
+        orientation='h',
+        color_discrete_map={'Positif': 'green', 'Negatif': 'red'},
+        labels={'kata': 'Kata Kunci', 'jumlah': 'Jumlah Tweet', 'jenis': 'Jenis'},
+        title='Kata Kunci Terbanyak'
+    )
+    fig.update_layout(
+        yaxis=dict(categoryorder='total ascending'),
+        title_font=dict(size=20, color='#389cff'),
+        title_x=0.5,
+    )
     return fig
 
-# Fungsi untuk membuat gauge chart sentimen
+# Grafik stream dibuat sekali per versi agregat: polling tanpa data baru tidak membuat ulang grafik.
+# Cache berlaku untuk semua sesi, sehingga kuncinya memuat sumber, model dan run_id stream.
+@st.cache_data(max_entries=8, show_spinner=False)
+def create_stream_charts(_window, source, model_type, run_id, version, resolution_label):
+    return {
+        'trend': create_stream_trend(_window, resolution_label),
+        'keywords': create_stream_keyword_bars(_window)
+    }
+
+# Fungsi untuk membuat gauge chart sentimen (grafik skor tunggal di-cache per skor)
+@st.cache_data(max_entries=256, show_spinner=False)
 def create_sentiment_gauge(score):
     fig = go.Figure(go.Indicator(
         mode = "gauge+number",
@@ -292,6 +534,7 @@ def create_sentiment_gauge(score):
     return fig
 
 # Fungsi untuk membuat bar chart perbandingan emosi
+@st.cache_data(max_entries=256, show_spinner=False)
 def create_emotion_bars(score):
     emotions = ['Positif', 'Negatif']
     values = [score, 1-score]
@@ -319,6 +562,7 @@ def create_emotion_bars(score):
     return fig
 
 # Fungsi untuk membuat pie chart distribusi sentimen
+@st.cache_data(max_entries=256, show_spinner=False)
 def create_sentiment_pie(score):
     labels = ['Positif', 'Negatif']
     values = [score, 1-score]
@@ -350,6 +594,118 @@ def create_sentiment_pie(score):
     
     return fig
 
+# Fungsi untuk membuat strip token berwarna dari atribusi occlusion. Hijau: token menaikkan skor
+# model, merah: menurunkan; warna makin pekat untuk pengaruh yang makin besar. Token yang tidak
+# dikenali model ditampilkan abu-abu.
+def create_token_strip(tokens, attributions):
+    scale = max((abs(value) for value in attributions if value is not None), default=0.0) or 1.0
+    spans = []
+    for token, value in zip(tokens, attributions):
+        if value is None:
+            style = "color: #999999; border: 1px dashed #cccccc;"
+            title = "tidak dikenali model"
+        else:
+            alpha = 0.1 + 0.8 * abs(value) / scale
+            color = f"rgba(46, 204, 113, {alpha:.2f})" if value >= 0 else f"rgba(231, 76, 60, {alpha:.2f})"
+            style = f"background-color: {color}; color: black;"
+            title = f"{value:+.4f}"
+        spans.append(f'<span title="{title}" style="{style} padding: 2px 6px; margin: 2px; '
+                     f'border-radius: 4px; display: inline-block;">{html.escape(token)}</span>')
+    return f'<div style="line-height: 2.2;">{"".join(spans)}</div>'
+
+# Fungsi untuk menampilkan hasil analisis teks. Dipanggil setelah analisis selesai dan setiap
+# rerun berikutnya (hasil disimpan di session state). Render grafik dicatat sebagai span
+# jika trace diberikan.
+def show_analysis_result(result, trace=None):
+    def render_span(chart):
+        return trace.span('render', chart=chart) if trace is not None else contextlib.nullcontext()
+
+    model_type = result['model_type']
+    final_sentiment = result['sentiment']
+    final_score = result['score']
+
+    if result.get('model_skipped'):
+        st.info("⚡ Mode cascade: model tidak dijalankan karena hasil kata kunci sudah menentukan label.")
+
+    # Tampilkan hasil preprocessing
+    if result['processed_text'] is not None:
+        with st.expander("🔍 Lihat Hasil Preprocessing"):
+            st.code(result['processed_text'])
+
+    # Tampilkan hasil prediksi
+    st.markdown("---")
+    st.markdown('<p class="subtitle-text">Hasil Analisis</p>', unsafe_allow_html=True)
+
+    # Buat kolom untuk menampilkan hasil
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        # Tampilkan skor sentimen
+        if final_sentiment == "Positif":
+            sentiment_color = "green"
+            sentiment_emoji = "😀"
+        else:
+            sentiment_color = "red"
+            sentiment_emoji = "😔"
+
+        st.markdown(f"<h1 style='text-align: center; color: {sentiment_color};'>{sentiment_emoji} {final_sentiment}</h1>",
+                    unsafe_allow_html=True)
+
+        # Tambahkan kartu informasi dengan styling
+        st.markdown(f"""
+        <div style="padding: 15px; border-radius: 10px; background-color: #f8f9fa; border-left: 5px solid {sentiment_color}; margin-bottom: 20px;color:black;">
+            <h3 style="color: {sentiment_color};">Informasi Analisis</h3>
+            <p><strong>Model:</strong> {model_type}</p>
+            <p><strong>Skor Sentimen:</strong> {final_score:.2%}</p>
+            <p><strong>Interpretasi:</strong> Teks ini mengekspresikan sentimen {final_sentiment.lower()} terhadap program makan bergizi gratis.</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2, render_span('gauge'):
+        # Tampilkan gauge chart untuk skor sentimen
+        gauge_chart = create_sentiment_gauge(final_score)
+        st.plotly_chart(gauge_chart, use_container_width=True)
+
+    # Rincian skor dan latensi setiap model pada mode ensemble
+    if result['ensemble'] is not None:
+        st.markdown('<p class="subtitle-text">Rincian Ensemble</p>', unsafe_allow_html=True)
+        st.dataframe(pd.DataFrame(result['ensemble']), use_container_width=True, hide_index=True)
+
+    # Atribusi token: perubahan skor model jika token tersebut dihapus dari teks
+    attribution = result.get('attribution')
+    if attribution is not None and attribution['tokens']:
+        st.markdown('<p class="subtitle-text">Atribusi Token</p>', unsafe_allow_html=True)
+        st.markdown(create_token_strip(attribution['tokens'], attribution['attributions']),
+                    unsafe_allow_html=True)
+        st.caption("Hijau: token menaikkan skor model, merah: menurunkan (selisih skor jika token dihapus). "
+                   "Arahkan kursor ke token untuk melihat nilainya.")
+
+    # Tambahkan visualisasi tambahan
+    st.markdown("---")
+    st.markdown('<p class="subtitle-text">Visualisasi Hasil</p>', unsafe_allow_html=True)
+
+    # Tampilkan beberapa visualisasi dengan tabs
+    tabs = st.tabs(["📊 Perbandingan", "🥧 Distribusi", "☁️ Word Cloud"])
+
+    with tabs[0], render_span('bars'):
+        # Bar chart perbandingan skor
+        emotion_bars = create_emotion_bars(final_score)
+        st.plotly_chart(emotion_bars, use_container_width=True)
+
+    with tabs[1], render_span('pie'):
+        # Pie chart distribusi sentimen
+        sentiment_pie = create_sentiment_pie(final_score)
+        st.plotly_chart(sentiment_pie, use_container_width=True)
+
+    with tabs[2], render_span('wordcloud'):
+        # WordCloud dari teks yang diproses, atau dari input teks langsung jika model tidak tersedia
+        words = result['tokens'] or result['input_text'].lower().split()
+        wordcloud_image = create_wordcloud(words)
+        if wordcloud_image is not None:
+            st.image(wordcloud_image, use_container_width=True)
+        else:
+            st.info("Tidak cukup kata untuk membuat word cloud.")
+
 # Fungsi untuk halaman analisis
 def show_analysis_page():
     # Judul aplikasi dengan styling
@@ -360,7 +716,7 @@ def show_analysis_page():
     model_type = st.session_state.get('model_type', 'BI-LSTM')
     
     # Tampilkan algoritma yang dipilih dengan styling
-    algo_color = "bilstm-color" if model_type == "BI-LSTM" else "gru-color" if model_type == "GRU" else "lstm-color"
+    algo_color = get_algo_color(model_type)
     st.markdown(f'<div style="color: black;" class="highlight-box"><span class="algo-badge {algo_color}">{model_type}</span> Model yang dipilih untuk analisis sentimen</div>', 
                 unsafe_allow_html=True)
     
@@ -388,169 +744,403 @@ def show_analysis_page():
         if not input_text.strip():
             st.warning("⚠️ Silakan masukkan teks untuk dianalisis.")
             return
-        
+
         # Cek file-file yang diperlukan
-        if model_type == "BI-LSTM":
-            model_path = 'model/model_BI_LSTM.h5'
-        elif model_type == "GRU":
-            model_path = 'model/model_GRU.h5'
-        else:  # LSTM
-            model_path = 'model/model_LSTM.h5'
-            
-        tokenizer_path = 'tokenizer.pickle'
-        
-        files_missing = []
-        if not os.path.exists(model_path):
-            files_missing.append(f"Model '{model_path}'")
-        if not os.path.exists(tokenizer_path):
-            files_missing.append(f"Tokenizer '{tokenizer_path}'")
-        
+        files_missing = find_missing_model_files(model_type)
+
         if files_missing:
             st.warning(f"⚠️ File berikut tidak ditemukan: {', '.join(files_missing)}. Menggunakan analisis berdasarkan kata kunci saja.")
             model_available = False
         else:
             model_available = True
-        
+
+        # Setiap tahap diukur dengan span; tahap yang selesai langsung ditampilkan beserta durasinya
+        status = st.status("Menganalisis sentimen...", expanded=False)
+        trace = Trace('analisis_teks', model=model_type, chars=len(input_text), on_span=lambda span: status.write(
+            f"✅ {STAGE_LABELS.get(span['stage'], span['stage'])}: {span['duration_ms']:.1f} ms"
+        ))
         try:
-            # Tambahkan progress bar untuk UX yang lebih baik
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
             # Analisis berdasarkan kata kunci
-            status_text.text("Menganalisis kata kunci...")
-            progress_bar.progress(20)
-            keyword_results = check_sentiment_keywords(input_text)
-            
+            with trace.span('keywords'):
+                keyword_results = check_sentiment_keywords(input_text)
+
+            # Mode cascade: model tidak dimuat maupun dijalankan jika skornya tidak dapat
+            # mengubah label yang sudah ditentukan kata kunci
+            model_skipped = bool(model_available and st.session_state.get('cascade', CASCADE_ENABLED) and
+                                 not cascade_needs_model([keyword_results['keyword_score']], model_type)[0])
+
             # Load model dan tokenizer jika tersedia
             model_prediction = None
-            if model_available:
-                status_text.text(f"Memuat model {model_type}...")
-                progress_bar.progress(40)
-                model = load_sentiment_model(model_type)
-                tokenizer = get_tokenizer()
-                
+            ensemble = None
+            processed_text = None
+            tokens = None
+            attribution = None
+            shadow_input = None
+            if model_skipped:
+                pass
+            elif model_available and INFERENCE_SERVER_URL and model_type != ENSEMBLE_MODE:
+                # Preprocessing dan prediksi dilakukan oleh server inferensi (batch bersama)
+                with trace.span('predict', remote=True):
+                    remote_result = predict_remote([input_text], model_type, INFERENCE_SERVER_URL)[0]
+                processed_text = remote_result['processed_text'] or ''
+                tokens = processed_text.split()
+                model_prediction = remote_result['model_score']
+            elif model_available:
+                with trace.span('model_load'):
+                    if model_type == ENSEMBLE_MODE:
+                        model = preload_all_models() or None
+                    else:
+                        model = load_sentiment_model(model_type)
+                    tokenizer = get_tokenizer()
+
                 if model is not None and tokenizer is not None:
                     # Preprocess teks
-                    status_text.text("Preprocessing teks...")
-                    progress_bar.progress(60)
-                    processed_text, tokens = preprocess_text(input_text)
-                    
-                    # Tampilkan hasil preprocessing
-                    with st.expander("🔍 Lihat Hasil Preprocessing"):
-                        st.code(processed_text)
-                    
+                    with trace.span('preprocess'):
+                        processed_text, tokens = preprocess_text(input_text)
+
                     # Tokenize dan padding teks
-                    status_text.text("Tokenizing teks...")
-                    progress_bar.progress(70)
-                    text_sequence = tokenizer.texts_to_sequences([processed_text])
-                    
+                    with trace.span('tokenize'):
+                        text_sequence = tokenizer.texts_to_sequences([processed_text])
+
                     # Cek apakah sequence berhasil dibuat
                     if not text_sequence[0]:
                         st.warning(f"⚠️ Tidak ada kata yang dikenali dalam teks untuk model {model_type}. Menggunakan analisis kata kunci saja.")
                         # Gunakan sequence kosong untuk menghindari error
                         text_sequence = [[0]]
-                    
+
                     # Padding sequence
-                    padded_sequence = pad_sequences(text_sequence, maxlen=100, padding='post', truncating='post')
-                    
+                    padded_sequence = pad_token_sequences(text_sequence)
+
                     # Prediksi menggunakan model
-                    status_text.text("Memprediksi sentimen...")
-                    progress_bar.progress(85)
-                    prediction = model.predict(padded_sequence)
-                    model_prediction = prediction[0][0]
-            
-            # Update progres
-            progress_bar.progress(95)
-            status_text.text("Menyiapkan hasil...")
-            
+                    with trace.span('predict'):
+                        if model_type == ENSEMBLE_MODE:
+                            # Semua model dijalankan paralel, skor akhir model = rata-rata
+                            ensemble = ensemble_predict(padded_sequence)
+                            model_prediction = ensemble['mean'][0]
+                        else:
+                            predict_started = time.perf_counter()
+                            model_prediction = predict_padded(model, padded_sequence)[0]
+                            shadow_input = (padded_sequence, time.perf_counter() - predict_started)
+
+                    # Semua varian tanpa satu token diprediksi dalam satu batch
+                    if EXPLAIN_ENABLED and tokens:
+                        with trace.span('explain', tokens=len(tokens)):
+                            if model_type == ENSEMBLE_MODE:
+                                attribution = token_attributions(lambda padded: ensemble_predict(padded)['mean'],
+                                                                 tokenizer, [tokens])[0]
+                            else:
+                                attribution = token_attributions(lambda padded: predict_padded(model, padded),
+                                                                 tokenizer, [tokens])[0]
+
             # Menentukan hasil analisis gabungan
             if model_prediction is not None:
                 # Gabungkan hasil model dan kata kunci dengan bobot
                 # Berikan bobot yang lebih besar untuk hasil analisis kata kunci
-                combined_score = 0.3 * model_prediction + 0.7 * keyword_results['keyword_score']
-                final_sentiment = "Positif" if combined_score >= 0.5 else "Negatif"
+                combined_score = combine_scores(model_prediction, keyword_results['keyword_score'], model_type)
+                final_sentiment = sentiment_label(combined_score, model_type)
                 final_score = combined_score
+            elif model_skipped:
+                # Skor model netral; label sama untuk skor model berapa pun
+                final_score = combine_scores(CASCADE_NEUTRAL_SCORE, keyword_results['keyword_score'], model_type)
+                final_sentiment = sentiment_label(final_score, model_type)
             else:
                 # Gunakan hasil analisis kata kunci saja
                 final_sentiment = keyword_results['keyword_sentiment']
                 final_score = keyword_results['keyword_score']
-            
+
             # Selesai
-            progress_bar.progress(100)
-            status_text.empty()
-            
-            # Tampilkan hasil prediksi
-            st.markdown("---")
-            st.markdown('<p class="subtitle-text">Hasil Analisis</p>', unsafe_allow_html=True)
-            
-            # Buat kolom untuk menampilkan hasil
-            col1, col2 = st.columns([1, 1])
-            
-            with col1:
-                # Tampilkan skor sentimen
-                if final_sentiment == "Positif":
-                    sentiment_color = "green"
-                    sentiment_emoji = "😀"
-                else:
-                    sentiment_color = "red"
-                    sentiment_emoji = "😔"
-                
-                st.markdown(f"<h1 style='text-align: center; color: {sentiment_color};'>{sentiment_emoji} {final_sentiment}</h1>", 
-                            unsafe_allow_html=True)
-                
-                # Tambahkan kartu informasi dengan styling
-                st.markdown(f"""
-                <div style="padding: 15px; border-radius: 10px; background-color: #f8f9fa; border-left: 5px solid {sentiment_color}; margin-bottom: 20px;color:black;">
-                    <h3 style="color: {sentiment_color};">Informasi Analisis</h3>
-                    <p><strong>Model:</strong> {model_type}</p>
-                    <p><strong>Skor Sentimen:</strong> {final_score:.2%}</p>
-                    <p><strong>Interpretasi:</strong> Teks ini mengekspresikan sentimen {final_sentiment.lower()} terhadap program makan bergizi gratis.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                # Tampilkan gauge chart untuk skor sentimen
-                gauge_chart = create_sentiment_gauge(final_score)
-                st.plotly_chart(gauge_chart, use_container_width=True)
-            
-            # Tambahkan visualisasi tambahan
-            st.markdown("---")
-            st.markdown('<p class="subtitle-text">Visualisasi Hasil</p>', unsafe_allow_html=True)
-            
-            # Tampilkan beberapa visualisasi dengan tabs
-            tabs = st.tabs(["📊 Perbandingan", "🥧 Distribusi", "☁️ Word Cloud"])
-            
-            with tabs[0]:
-                # Bar chart perbandingan skor
-                emotion_bars = create_emotion_bars(final_score)
-                st.plotly_chart(emotion_bars, use_container_width=True)
-            
-            with tabs[1]:
-                # Pie chart distribusi sentimen
-                sentiment_pie = create_sentiment_pie(final_score)
-                st.plotly_chart(sentiment_pie, use_container_width=True)
-            
-            with tabs[2]:
-                # WordCloud dari teks yang diproses
-                if model_available and 'tokens' in locals() and tokens:
-                    wordcloud_fig = create_wordcloud(tokens)
-                    if wordcloud_fig:
-                        st.pyplot(wordcloud_fig)
-                    else:
-                        st.info("Tidak cukup kata untuk membuat word cloud.")
-                else:
-                    # Fallback jika model tidak tersedia
-                    # Buat wordcloud dari input teks langsung
-                    words = input_text.lower().split()
-                    wordcloud_fig = create_wordcloud(words)
-                    if wordcloud_fig:
-                        st.pyplot(wordcloud_fig)
-                    else:
-                        st.info("Tidak cukup kata untuk membuat word cloud.")
-        
+            status.update(label=f"Analisis selesai dalam {(time.perf_counter() - trace.started) * 1000:.0f} ms",
+                          state="complete")
+
+            # Hasil disimpan di session state agar tetap tampil saat halaman di-rerun
+            result = {
+                'input_text': input_text,
+                'model_type': model_type,
+                'sentiment': final_sentiment,
+                'score': float(final_score),
+                'processed_text': processed_text,
+                'tokens': tokens if model_available else None,
+                'attribution': attribution,
+                'model_skipped': model_skipped,
+                'ensemble': {
+                    'Model': list(ensemble['scores']),
+                    'Skor Model': [float(scores[0]) for scores in ensemble['scores'].values()],
+                    'Latensi (ms)': [latency * 1000 for latency in ensemble['latency'].values()]
+                } if ensemble is not None else None
+            }
+            st.session_state['analysis_result'] = result
+            show_analysis_result(result, trace)
+
+            # Model bayangan menilai input yang sama di thread latar setelah hasil ditampilkan.
+            # Tidak pernah menunggu: jika antreannya penuh, input dibuang.
+            if shadow_input is not None and SHADOW_MODEL in MODEL_TYPES and SHADOW_MODEL != model_type \
+                    and not find_missing_model_files(SHADOW_MODEL):
+                padded_input, primary_seconds = shadow_input
+                get_shadow_scorer(SHADOW_MODEL).submit(padded_input, model_type, [model_prediction], primary_seconds,
+                                                       [keyword_results['keyword_score']])
+
         except Exception as e:
+            status.update(label="Analisis gagal", state="error")
             st.error(f"⚠️ Terjadi kesalahan: {e}")
             st.info("Jika masalah berlanjut, coba reboot aplikasi atau periksa console log untuk detail error.")
+        finally:
+            st.session_state['last_trace'] = trace.finish().as_dict()
+        return
+
+    # Rerun lain (misalnya mengaktifkan panel debug) menampilkan hasil terakhir tanpa analisis
+    # dan render grafik ulang, selama teks dan model yang dipilih masih sama
+    result = st.session_state.get('analysis_result')
+    if result is not None and result['input_text'] == input_text and result['model_type'] == model_type:
+        show_analysis_result(result)
+
+# Fungsi untuk halaman analisis batch dari file CSV
+def show_batch_page():
+    st.markdown('<p class="title-text">Analisis Sentimen Batch (CSV)</p>',
+                unsafe_allow_html=True)
+
+    model_type = st.session_state.get('model_type', 'BI-LSTM')
+    algo_color = get_algo_color(model_type)
+    st.markdown(f'<div style="color: black;" class="highlight-box"><span class="algo-badge {algo_color}">{model_type}</span> Model yang dipilih untuk analisis sentimen</div>',
+                unsafe_allow_html=True)
+
+    # Upload file ekspor X/Twitter dengan format seperti dataset/dataset_10k.csv
+    st.markdown('<p class="subtitle-text">Upload File</p>', unsafe_allow_html=True)
+    uploaded_file = st.file_uploader("Upload file CSV ekspor tweet (kolom seperti dataset_10k.csv):", type=['csv'])
+
+    if uploaded_file is not None:
+        try:
+            df = pd.read_csv(uploaded_file, dtype={col: str for col in BATCH_ID_COLUMNS})
+        except Exception as e:
+            st.error(f"⚠️ Gagal membaca file CSV: {e}")
+            return
+
+        text_columns = list(df.columns)
+        text_column = st.selectbox(
+            "Kolom teks yang dianalisis:",
+            text_columns,
+            index=text_columns.index('full_text') if 'full_text' in text_columns else 0
+        )
+        st.caption(f"{len(df):,} baris ditemukan pada file.")
+
+        col_button, _ = st.columns([1, 3])
+        with col_button:
+            analyze_button = st.button("🔍 Analisis Semua Baris", type="primary", use_container_width=True)
+
+        if analyze_button:
+            if find_missing_model_files(model_type):
+                st.warning("⚠️ File model atau tokenizer tidak ditemukan. Menggunakan analisis berdasarkan kata kunci saja.")
+
+            trace = Trace('analisis_batch', model=model_type, rows=len(df))
+            try:
+                with st.spinner(f"Menganalisis {len(df):,} tweet..."):
+                    results = analyze_dataframe(df, model_type, text_column, trace=trace,
+                                                cascade=st.session_state.get('cascade', CASCADE_ENABLED))
+                    st.session_state['batch_results'] = results
+                    st.session_state['batch_results_key'] = uuid.uuid4().hex
+                    st.session_state['batch_model_type'] = model_type
+                    # Frekuensi kata untuk word cloud dihitung sekali dari teks hasil preprocessing
+                    # (atau teks asli jika tanpa model), bukan setiap rerun. Baris yang dilewati mode
+                    # cascade tidak punya teks hasil preprocessing dan tidak diikutkan.
+                    if 'processed_text' in results.columns:
+                        words = results['processed_text'].dropna()
+                    else:
+                        words = results[text_column].str.lower().fillna('')
+                    st.session_state['batch_word_frequencies'] = WordFrequencies().update(words)
+            except Exception as e:
+                st.error(f"⚠️ Terjadi kesalahan: {e}")
+                return
+            finally:
+                st.session_state['last_trace'] = trace.finish().as_dict()
+
+    # Hasil disimpan di session state agar tidak hilang saat halaman di-rerun (misalnya saat download)
+    results = st.session_state.get('batch_results')
+    if results is None:
+        return
+
+    st.markdown("---")
+    st.markdown('<p class="subtitle-text">Hasil Analisis</p>', unsafe_allow_html=True)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Jumlah Tweet", f"{len(results):,}")
+    col2.metric("Positif", f"{(results['sentiment'] == 'Positif').mean():.1%}")
+    col3.metric("Negatif", f"{(results['sentiment'] == 'Negatif').mean():.1%}")
+    col4.metric("Rata-rata Skor", f"{results['combined_score'].mean():.2%}")
+
+    if PREDICTION_CACHE_ENABLED:
+        cache_stats = get_prediction_cache().stats()
+        st.caption(f"Cache prediksi: hit ratio {cache_stats['hit_ratio']:.1%} "
+                   f"({cache_stats['memory_hits'] + cache_stats['disk_hits'] + cache_stats['batch_duplicates']:,} hit, "
+                   f"{cache_stats['misses']:,} miss)")
+    if 'model_skipped' in results.columns and len(results):
+        st.caption(f"⚡ Mode cascade: model dilewati untuk {results['model_skipped'].sum():,} dari {len(results):,} tweet "
+                   f"({results['model_skipped'].mean():.1%}), label sudah ditentukan kata kunci.")
+    if 'cluster_id' in results.columns and len(results):
+        clusters = results['cluster_id'].nunique()
+        st.caption(f"Hampir-duplikat: {clusters:,} klaster dari {len(results):,} tweet, model dijalankan "
+                   f"untuk {clusters / len(results):.1%} teks (ambang Jaccard {NEAR_DUPLICATE_THRESHOLD}).")
+
+    st.dataframe(results, use_container_width=True, height=400)
+    st.download_button(
+        "⬇️ Download Hasil (CSV)",
+        data=results.to_csv(index=False).encode('utf-8'),
+        file_name=f"hasil_sentimen_{st.session_state.get('batch_model_type', model_type)}.csv",
+        mime='text/csv'
+    )
+    if st.button("💾 Simpan ke Result Store (Parquet)"):
+        try:
+            rows = write_store_results(results, st.session_state.get('batch_model_type', model_type))
+            st.success(f"{rows:,} baris disimpan ke '{RESULT_STORE_PATH}', dipartisi per tanggal.")
+        except Exception as e:
+            st.error(f"⚠️ Gagal menyimpan hasil: {e}")
+
+    st.markdown("---")
+    st.markdown('<p class="subtitle-text">Visualisasi Hasil</p>', unsafe_allow_html=True)
+
+    tabs = st.tabs(["🥧 Distribusi", "📊 Sebaran Skor", "📈 Tren Harian", "🔤 Kata Kunci", "☁️ Word Cloud"])
+    charts = create_batch_charts(results, st.session_state.get('batch_results_key'))
+
+    with tabs[0]:
+        st.plotly_chart(charts['pie'], use_container_width=True)
+
+    with tabs[1]:
+        st.plotly_chart(charts['histogram'], use_container_width=True)
+
+    with tabs[2]:
+        trend_chart = charts['trend']
+        if trend_chart:
+            st.plotly_chart(trend_chart, use_container_width=True)
+        else:
+            st.info("Kolom 'created_at' tidak tersedia atau tidak dapat dibaca.")
+
+    with tabs[3]:
+        keyword_chart = charts['keywords']
+        if keyword_chart:
+            st.plotly_chart(keyword_chart, use_container_width=True)
+        else:
+            st.info("Tidak ada kata kunci yang ditemukan.")
+
+    with tabs[4]:
+        frequencies = st.session_state.get('batch_word_frequencies')
+        wordcloud_image = create_frequency_wordcloud(frequencies.most_common(100)) if frequencies else None
+        if wordcloud_image is not None:
+            st.image(wordcloud_image, use_container_width=True)
+        else:
+            st.info("Tidak cukup kata untuk membuat word cloud.")
+        if frequencies is not None and 'model_skipped' in results.columns and frequencies.documents < len(results):
+            st.caption(f"Word cloud dibuat dari {frequencies.documents:,} tweet hasil preprocessing; "
+                       f"{len(results) - frequencies.documents:,} tweet yang dilewati mode cascade tidak diikutkan.")
+
+# Agregat stream dibaca ulang setiap STREAM_REFRESH_SECONDS tanpa menjalankan ulang seluruh
+# halaman. Hanya snapshot agregat yang dibaca, tidak pernah tweet mentah dari stream.
+@st.fragment(run_every=STREAM_REFRESH_SECONDS)
+def show_stream_aggregates(source, model_type):
+    scorer = running_streams().get((source, model_type))
+    if scorer is None:
+        st.caption("Stream tidak berjalan.")
+        return
+
+    resolution_labels = {'minute': "Menit", 'hour': "Jam"}
+    resolution = st.radio("Jendela agregat:", list(resolution_labels), horizontal=True, key='stream_resolution',
+                          format_func=lambda name: f"Per {resolution_labels[name].lower()}")
+    stats = scorer.stats()
+    snapshot = scorer.aggregates.snapshot(top=15)
+    window = snapshot['windows'][resolution]
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Tweet Dianalisis", f"{stats['scored']:,}")
+    col2.metric("Antrean", f"{stats['pending']:,}")
+    col3.metric("Positif (jendela)", f"{window['positive_share']:.1%}")
+    col4.metric("Tweet/detik", f"{stats['tweets_per_second']:,.1f}")
+    st.caption(f"{stats['batches']:,} micro-batch, rata-rata {stats['mean_batch_size']:.0f} tweet, batch terakhir "
+               f"{stats['last_batch_ms']:.0f} ms. Jendela: {len(window['buckets'])} bucket terakhir "
+               f"({window['volume']:,} tweet, {window['late']:,} tweet terlambat dilewati).")
+    if stats['last_error']:
+        st.warning(f"⚠️ {stats['errors']:,} kesalahan, terakhir: {stats['last_error']}")
+
+    charts = create_stream_charts(window, source, model_type, scorer.run_id, snapshot['version'],
+                                  resolution_labels[resolution])
+    if charts['trend'] is None:
+        st.info("Menunggu tweet pertama dari stream...")
+        return
+    st.plotly_chart(charts['trend'], use_container_width=True)
+    if charts['keywords'] is not None:
+        st.plotly_chart(charts['keywords'], use_container_width=True)
+
+def show_stream_page():
+    st.markdown('<p class="title-text">Analisis Sentimen Live</p>',
+                unsafe_allow_html=True)
+
+    model_type = st.session_state.get('model_type', 'BI-LSTM')
+    algo_color = get_algo_color(model_type)
+    st.markdown(f'<div style="color: black;" class="highlight-box"><span class="algo-badge {algo_color}">{model_type}</span> Model yang dipilih untuk analisis sentimen</div>',
+                unsafe_allow_html=True)
+    if model_type == ENSEMBLE_MODE:
+        st.info("Mode live memakai satu model. Pilih LSTM, BI-LSTM atau GRU di sidebar.")
+        return
+
+    # Tweet baru dianalisis di background per micro-batch; halaman ini hanya membaca agregatnya
+    st.markdown('<p class="subtitle-text">Sumber Stream</p>', unsafe_allow_html=True)
+    if 'stream_source' not in st.session_state:
+        st.session_state['stream_source'] = STREAM_SOURCE_DEFAULT
+    source = st.text_input("File JSONL/CSV yang terus bertambah atau URL X search API:", key='stream_source',
+                           help="Contoh: live.jsonl (python -m sentimen.streaming replay ...) atau "
+                                "http://127.0.0.1:8600 (python -m sentimen.streaming mock-api)").strip()
+    scorer = running_streams().get((source, model_type)) if source else None
+
+    col_start, col_stop, _ = st.columns([1, 1, 2])
+    with col_start:
+        start_button = st.button("▶️ Mulai", type="primary", use_container_width=True,
+                                 disabled=not source or scorer is not None)
+    with col_stop:
+        stop_button = st.button("⏹️ Hentikan", use_container_width=True, disabled=scorer is None)
+
+    if start_button:
+        if not source.startswith(('http://', 'https://')) and not os.path.exists(source):
+            st.warning(f"⚠️ File '{source}' belum ada. Stream menunggu sampai file dibuat.")
+        elif find_missing_model_files(model_type):
+            st.warning("⚠️ File model atau tokenizer tidak ditemukan. Menggunakan analisis berdasarkan kata kunci saja.")
+        score_fn = None
+        if INFERENCE_SERVER_URL:
+            score_fn = lambda texts: predict_remote(texts, model_type, INFERENCE_SERVER_URL)
+        scorer = get_stream(source, model_type, score_fn=score_fn)
+    if stop_button:
+        stop_stream(source, model_type)
+        st.rerun()
+
+    if scorer is None:
+        st.caption("Stream belum berjalan. Stream yang dimulai tetap berjalan dan dipakai bersama semua sesi.")
+        return
+
+    st.markdown("---")
+    show_stream_aggregates(source, model_type)
+
+# Fungsi panel debug: rincian tahap analisis terakhir dan statistik tahap proses ini
+def show_debug_panel():
+    last_trace = st.session_state.get('last_trace')
+    if last_trace is None:
+        st.caption("Belum ada analisis pada sesi ini.")
+        return
+
+    st.caption(f"{last_trace['trace']} · {last_trace.get('model', '-')} · total {last_trace['duration_ms']:.1f} ms")
+    st.dataframe(pd.DataFrame([{
+        'Tahap': STAGE_LABELS.get(span['stage'], span['stage']) + (f" ({span['chart']})" if 'chart' in span else ''),
+        'Durasi (ms)': round(span['duration_ms'], 1),
+        'Porsi': f"{span['duration_ms'] / last_trace['duration_ms']:.0%}" if last_trace['duration_ms'] else '-'
+    } for span in last_trace['spans']]), use_container_width=True, hide_index=True)
+
+    summary = STAGE_METRICS.summary()
+    if summary:
+        with st.expander("Statistik tahap (proses ini)"):
+            st.dataframe(pd.DataFrame(summary).round(1), use_container_width=True, hide_index=True)
+
+    if SHADOW_MODEL in MODEL_TYPES:
+        with st.expander(f"Shadow {SHADOW_MODEL} (proses ini)"):
+            stats = get_shadow_scorer(SHADOW_MODEL).stats()
+            st.caption(f"Dikirim {stats['submitted']:,} · dibuang {stats['dropped']:,} · gagal {stats['failed']:,} · "
+                       f"antrean {stats['pending']}/{stats['max_pending']}")
+            if stats['primary']:
+                st.dataframe(pd.DataFrame.from_dict(stats['primary'], orient='index').rename_axis('Model utama')
+                             .reset_index().round(3), use_container_width=True, hide_index=True)
 
 # Fungsi untuk halaman bantuan penggunaan
 def show_help_page():
@@ -568,6 +1158,7 @@ def show_help_page():
         ### Memilih Menu
         Gunakan menu di sidebar (panel kiri) untuk navigasi:
         - **Analisa Sentimen**: Halaman utama untuk menganalisis teks
+        - **Analisa Batch CSV**: Menganalisis seluruh baris file CSV ekspor tweet sekaligus
         - **Bantuan Penggunaan**: Panduan cara menggunakan aplikasi (halaman ini)
         - **Tentang Aplikasi**: Informasi tentang aplikasi dan model AI yang digunakan
         
@@ -576,6 +1167,12 @@ def show_help_page():
         2. Klik tombol "🔍 Analisis Sentimen" berwarna biru
         3. Tunggu hingga proses analisis selesai
         
+        ### Melakukan Analisis Batch CSV
+        1. Buka menu "📂 Analisa Batch CSV"
+        2. Upload file CSV dengan kolom seperti `dataset/dataset_10k.csv` (`full_text`, `id_str`, `created_at`, ...)
+        3. Pilih kolom teks lalu klik "🔍 Analisis Semua Baris"
+        4. Download tabel hasil per tweet dan lihat grafik agregatnya
+        
         ### Memahami Hasil Analisis
         Hasil analisis akan menampilkan:
         - Klasifikasi sentimen (Positif/Negatif)
@@ -612,7 +1209,11 @@ def show_help_page():
         """)
     
     with help_tabs[2]:
-        st.markdown("""
+        # Model yang dikalibrasi memakai bobot dan ambangnya sendiri
+        calibrated = ['{}: model {:.0%}, kata kunci {:.0%}, ambang {:.0%}'.format(name, *get_blend(name))
+                      for name in MODEL_TYPES if name in engine.CALIBRATION]
+        calibration_note = f" Hasil kalibrasi per model: {'; '.join(calibrated)}." if calibrated else ""
+        st.markdown(f"""
         ## Pertanyaan yang Sering Diajukan (FAQ)
         
         ### Umum
@@ -627,7 +1228,7 @@ def show_help_page():
         
         **Q: Bagaimana aplikasi menentukan skor sentimen final?**
         
-        A: Aplikasi menggabungkan hasil analisis dari model deep learning (30%) dan analisis kata kunci (70%).
+        A: Aplikasi menggabungkan hasil analisis dari model deep learning ({MODEL_WEIGHT:.0%}) dan analisis kata kunci ({KEYWORD_WEIGHT:.0%}). Teks dinilai positif jika skor gabungan minimal {SENTIMENT_THRESHOLD:.0%}.{calibration_note}
         
         ### Teknis
         
@@ -714,6 +1315,12 @@ def show_about_page():
 
 # Fungsi utama aplikasi
 def main():
+    # Preload dan warm-up semua model saat start (aktifkan dengan SENTIMEN_PRELOAD_MODELS=1)
+    if os.environ.get('SENTIMEN_PRELOAD_MODELS') == '1':
+        preload_all_models()
+    if METRICS_PORT:
+        start_metrics_endpoint(int(METRICS_PORT))
+
     # Sidebar dengan menu navigasi dan styling
     # Sidebar with improved styling and button-based navigation
 # Sidebar with improved styling and button-based navigation
@@ -744,7 +1351,19 @@ def main():
                     type="primary" if st.session_state['current_page'] == "Analisa Sentimen" else "secondary"):
             st.session_state['current_page'] = "Analisa Sentimen"
             st.rerun()
-        
+
+        if st.button("📂 Analisa Batch CSV", key="btn_batch",
+                    use_container_width=True,
+                    type="primary" if st.session_state['current_page'] == "Analisa Batch CSV" else "secondary"):
+            st.session_state['current_page'] = "Analisa Batch CSV"
+            st.rerun()
+
+        if st.button("📡 Live Streaming", key="btn_stream",
+                    use_container_width=True,
+                    type="primary" if st.session_state['current_page'] == "Live Streaming" else "secondary"):
+            st.session_state['current_page'] = "Live Streaming"
+            st.rerun()
+
         if st.button("❓ Bantuan Penggunaan", key="btn_bantuan",
                     use_container_width=True,
                     type="primary" if st.session_state['current_page'] == "Bantuan Penggunaan" else "secondary"):
@@ -763,10 +1382,11 @@ def main():
         st.markdown("### ⚙️ Pengaturan Algoritma")
 
         # Dropdown untuk memilih algoritma tanpa tanda centang
+        algo_options = MODEL_TYPES + [ENSEMBLE_MODE]
         model_type = st.selectbox(
             "Pilih algoritma AI yang akan digunakan:",
-            ["LSTM", "BI-LSTM", "GRU"],
-            index=["LSTM", "BI-LSTM", "GRU"].index(st.session_state.get('model_type', 'LSTM')),
+            algo_options,
+            index=algo_options.index(st.session_state.get('model_type', 'LSTM')),
             help="Pilih algoritma AI yang akan digunakan untuk analisis sentimen"
         )
 
@@ -774,13 +1394,15 @@ def main():
         algo_info = {
             "LSTM": "Model dasar untuk memahami ketergantungan dalam teks",
             "BI-LSTM": "Model bidirectional dengan akurasi yang lebih tinggi",
-            "GRU": "Model yang lebih ringan dan cepat"
+            "GRU": "Model yang lebih ringan dan cepat",
+            ENSEMBLE_MODE: "Rata-rata skor ketiga model yang dijalankan paralel"
         }
 
         algo_colors = {
             "LSTM": "#3498DB",
             "BI-LSTM": "#9B59B6",
-            "GRU": "#2ECC71"
+            "GRU": "#2ECC71",
+            ENSEMBLE_MODE: "#E67E22"
         }
 
         # Tampilkan informasi algoritma
@@ -796,6 +1418,15 @@ def main():
 
         
         st.markdown('<hr style="margin: 15px 0px;">', unsafe_allow_html=True)
+
+        # Mode cascade untuk analisis teks dan batch (default dari SENTIMEN_CASCADE=1)
+        st.toggle("⚡ Mode cascade", value=CASCADE_ENABLED, key='cascade',
+                  help="Jalankan model hanya jika skornya masih bisa mengubah label hasil kata kunci")
+
+        # Panel debug diisi setelah halaman dirender agar menampilkan analisis yang baru selesai
+        debug_panel = st.toggle("🐞 Panel debug", value=DEBUG_PANEL_DEFAULT,
+                                help="Tampilkan durasi setiap tahap analisis terakhir")
+        debug_area = st.container()
         
         # Footer with better styling
         st.markdown("""
@@ -811,10 +1442,18 @@ def main():
     # Render the appropriate page
     if selected_page == "Analisa Sentimen":
         show_analysis_page()
+    elif selected_page == "Analisa Batch CSV":
+        show_batch_page()
+    elif selected_page == "Live Streaming":
+        show_stream_page()
     elif selected_page == "Bantuan Penggunaan":
         show_help_page()
     elif selected_page == "Tentang Aplikasi":
         show_about_page()
 
+    if debug_panel:
+        with debug_area:
+            show_debug_panel()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,45 @@
+# Paket inti analisis sentimen Program Makan Bergizi Gratis.
+# Dapat dipakai tanpa Streamlit, misalnya dari CLI (python -m sentimen) atau job batch.
+from .engine import (
+    KEYWORD_WEIGHT,
+    MAX_SEQUENCE_LENGTH,
+    MODEL_PATHS,
+    MODEL_TYPES,
+    MODEL_WEIGHT,
+    NEGATIVE_WORDS,
+    POSITIVE_WORDS,
+    SENTIMENT_THRESHOLD,
+    TOKENIZER_PATH,
+    calculate_keyword_score,
+    check_sentiment_keywords,
+    check_sentiment_keywords_batch,
+    combine_scores,
+    get_tokenizer,
+    load_sentiment_model,
+    preprocess_text,
+    preprocess_texts,
+    score_texts,
+    sentiment_label,
+)
+
+__all__ = [
+    'KEYWORD_WEIGHT',
+    'MAX_SEQUENCE_LENGTH',
+    'MODEL_PATHS',
+    'MODEL_TYPES',
+    'MODEL_WEIGHT',
+    'NEGATIVE_WORDS',
+    'POSITIVE_WORDS',
+    'SENTIMENT_THRESHOLD',
+    'TOKENIZER_PATH',
+    'calculate_keyword_score',
+    'check_sentiment_keywords',
+    'check_sentiment_keywords_batch',
+    'combine_scores',
+    'get_tokenizer',
+    'load_sentiment_model',
+    'preprocess_text',
+    'preprocess_texts',
+    'score_texts',
+    'sentiment_label',
+]
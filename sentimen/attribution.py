@@ -0,0 +1,134 @@
+# Atribusi token berbasis occlusion untuk menjelaskan skor model.
+# Untuk setiap token hasil preprocessing dibuat satu varian sequence tanpa token tersebut (token
+# sesudahnya digeser ke kiri, sama seperti padding 'post'). Sequence asli dan semua varian, untuk
+# satu teks maupun banyak teks sekaligus, diprediksi dalam satu panggilan batch. Atribusi sebuah
+# token adalah skor sequence asli dikurangi skor tanpa token itu: positif berarti token mendorong
+# skor model ke arah sentimen positif. Token yang tidak dikenal tokenizer (atau berada di luar
+# MAX_SEQUENCE_LENGTH) tidak memengaruhi model dan tidak diberi atribusi.
+#
+#   python -m sentimen.attribution --limit 200 --model GRU   # biaya satu batch vs satu predict per token
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from .engine import (
+    DATASET_PATH,
+    MAX_SEQUENCE_LENGTH,
+    MODEL_TYPES,
+    get_tokenizer,
+    load_sentiment_model,
+    load_texts,
+    model_files_available,
+    pad_token_sequences,
+    predict_padded,
+    preprocess_texts,
+    texts_to_padded,
+)
+
+# Fungsi input occlusion untuk banyak teks. Setiap teks menghasilkan baris sequence asli diikuti
+# satu baris per token yang dikenali. Mengembalikan matriks input yang sudah di-padding dan, per
+# teks, baris sequence aslinya beserta indeks token yang dihapus pada baris-baris berikutnya.
+def occlusion_inputs(tokenizer, token_lists):
+    sequences = []
+    spans = []
+    for tokens in token_lists:
+        token_ids = tokenizer.texts_to_sequences(list(tokens)) if tokens else []
+        full_sequence = [token_id for ids in token_ids for token_id in ids]
+        start = len(sequences)
+        sequences.append(full_sequence)
+
+        occluded = []
+        position = 0
+        for index, ids in enumerate(token_ids):
+            if ids and position < MAX_SEQUENCE_LENGTH:
+                sequences.append(full_sequence[:position] + full_sequence[position + len(ids):])
+                occluded.append(index)
+            position += len(ids)
+        spans.append((start, occluded))
+    return pad_token_sequences(sequences), spans
+
+# Fungsi atribusi token untuk banyak teks. predict menerima matriks input dan mengembalikan skor
+# model per baris; dipanggil sekali untuk semua varian. Mengembalikan per teks skor model, token
+# dan atribusi per token (None untuk token yang tidak dikenali model).
+def token_attributions(predict, tokenizer, token_lists):
+    token_lists = [list(tokens) for tokens in token_lists]
+    padded, spans = occlusion_inputs(tokenizer, token_lists)
+    scores = np.asarray(predict(padded), dtype=float) if len(padded) else np.zeros(0)
+
+    results = []
+    for tokens, (start, occluded) in zip(token_lists, spans):
+        base_score = float(scores[start])
+        attributions = [None] * len(tokens)
+        for row, index in enumerate(occluded, start + 1):
+            attributions[index] = base_score - float(scores[row])
+        results.append({'score': base_score, 'tokens': tokens, 'attributions': attributions})
+    return results
+
+# Fungsi laporan biaya atribusi: satu prediksi batch per teks dibanding satu prediksi per varian,
+# serta kesesuaian skor sequence asli dengan prediksi biasa dan kesamaan atribusi kedua cara
+def attribution_report(model_type, texts, batch_size=1024):
+    model = load_sentiment_model(model_type)
+    tokenizer = get_tokenizer()
+    _, token_lists = preprocess_texts(texts)
+
+    def predict(padded):
+        return predict_padded(model, padded, batch_size)
+
+    # Pemanasan agar tracing fungsi prediksi Keras tidak ikut terukur
+    token_attributions(predict, tokenizer, token_lists[:1])
+
+    start = time.perf_counter()
+    batched = [token_attributions(predict, tokenizer, [tokens])[0] for tokens in token_lists]
+    batched_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    naive_difference = 0.0
+    for tokens, result in zip(token_lists, batched):
+        padded, (span,) = occlusion_inputs(tokenizer, [tokens])
+        scores = [float(predict(padded[row:row + 1])[0]) for row in range(len(padded))]
+        for row, index in enumerate(span[1], 1):
+            naive_difference = max(naive_difference, abs(scores[0] - scores[row] - result['attributions'][index]))
+    naive_seconds = time.perf_counter() - start
+
+    base_scores = predict_padded(model, texts_to_padded(tokenizer, [' '.join(tokens) for tokens in token_lists]),
+                                 batch_size)
+    explained = [sum(value is not None for value in result['attributions']) for result in batched]
+    return {
+        'model': model_type,
+        'texts': len(texts),
+        'tokens_mean': float(np.mean([len(tokens) for tokens in token_lists])) if texts else 0.0,
+        'explained_tokens_mean': float(np.mean(explained)) if texts else 0.0,
+        'batched_ms_per_text': batched_seconds * 1000 / max(len(texts), 1),
+        'naive_ms_per_text': naive_seconds * 1000 / max(len(texts), 1),
+        'speedup': naive_seconds / batched_seconds if batched_seconds else 0.0,
+        'max_abs_diff_naive': naive_difference,
+        'max_abs_diff_base_score': float(np.max(np.abs(base_scores - [result['score'] for result in batched])))
+        if texts else 0.0
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.attribution',
+        description="Ukur biaya atribusi token occlusion (satu batch per teks) dibanding satu prediksi per token."
+    )
+    parser.add_argument('--model', choices=MODEL_TYPES, default='BI-LSTM', help="Algoritma (default: BI-LSTM)")
+    parser.add_argument('--data', default=DATASET_PATH, help="File CSV teks uji")
+    parser.add_argument('--text-field', default='full_text', help="Kolom teks (default: full_text)")
+    parser.add_argument('--limit', type=int, default=200, help="Jumlah baris (default: 200)")
+    parser.add_argument('--max-diff', type=float, default=1e-4,
+                        help="Selisih skor maksimum terhadap prediksi biasa, exit code 1 jika di atasnya "
+                             "(default: 1e-4)")
+    args = parser.parse_args(argv)
+
+    if not model_files_available(args.model):
+        parser.error(f"File model {args.model} atau tokenizer tidak ditemukan.")
+    report = attribution_report(args.model, load_texts(args.data, args.text_field, args.limit))
+    print(json.dumps(report, indent=2))
+    if max(report['max_abs_diff_naive'], report['max_abs_diff_base_score']) > args.max_diff:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
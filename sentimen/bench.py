@@ -0,0 +1,329 @@
+# Benchmark end-to-end atas dataset/dataset_10k.csv.
+# Setiap tahap diukur terpisah:
+#   preprocess_text (regex, tokenisasi, stopwords, stemming Sastrawi)  - latensi per teks
+#   check_sentiment_keywords                                           - latensi per teks
+#   texts_to_sequences + padding                                       - latensi per batch
+#   model.predict untuk LSTM, BI-LSTM dan GRU                          - latensi per batch
+# Hasil berupa JSON (throughput, p50/p95/p99, memori puncak per tahap) yang dapat dibandingkan
+# antar commit. Jika file .h5 tidak ada, model pengganti dengan bentuk input/output yang sama
+# (bobot acak, seed tetap) dipakai sehingga hanya waktu komputasinya yang bermakna.
+#
+#   python -m sentimen.bench --output bench_$(git rev-parse --short HEAD).json
+#   python -m sentimen.bench --limit 2000 --batch-sizes 1,32,256 --compare bench_lama.json
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+from .engine import (
+    BASE_DIR,
+    DATASET_PATH,
+    MAX_SEQUENCE_LENGTH,
+    MODEL_PATHS,
+    MODEL_TYPES,
+    check_sentiment_keywords,
+    clean_text,
+    get_cached_stemmer,
+    get_stop_words,
+    get_tokenizer,
+    load_texts,
+    safe_word_tokenize,
+    texts_to_padded,
+)
+
+DEFAULT_BATCH_SIZES = [1, 32, 256, 1024]
+
+# Langkah di dalam preprocess_text
+PREPROCESS_STEPS = ['regex', 'tokenize', 'stopwords', 'stem']
+
+# Ukuran model pengganti (jumlah kata mengikuti num_words tokenizer)
+STAND_IN_EMBEDDING_DIM = 100
+STAND_IN_UNITS = 64
+
+# Fungsi ukuran RSS saat ini (MB); None jika /proc tidak tersedia
+def current_rss_mb():
+    try:
+        with open('/proc/self/statm') as handle:
+            return int(handle.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        return None
+
+# Fungsi RSS puncak proses sejak start (MB)
+def max_rss_mb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage / (1024 * 1024) if sys.platform == 'darwin' else usage / 1024
+
+# Pencatat RSS puncak selama satu tahap (thread sampling). Tanpa /proc, RSS puncak
+# proses (ru_maxrss) yang dilaporkan.
+class MemorySampler:
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.start_mb = None
+        self.peak_mb = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start_mb = self.peak_mb = current_rss_mb()
+        if self.start_mb is not None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+        else:
+            self.peak_mb = max_rss_mb()
+
+# Fungsi ringkasan latensi (detik per item) menjadi throughput dan persentil (ms)
+def summarize(latencies, items):
+    latencies = np.asarray(latencies, dtype=float)
+    total = float(latencies.sum())
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000 if len(latencies) else (0.0, 0.0, 0.0)
+    return {
+        'calls': int(len(latencies)),
+        'items': int(items),
+        'seconds': total,
+        'items_per_second': items / total if total else 0.0,
+        'mean_ms': float(latencies.mean() * 1000) if len(latencies) else 0.0,
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99)
+    }
+
+# Fungsi untuk mengukur fungsi per item; mengembalikan hasil dan waktu per panggilan
+def time_calls(function, items):
+    results = []
+    latencies = []
+    for item in items:
+        start = time.perf_counter()
+        results.append(function(item))
+        latencies.append(time.perf_counter() - start)
+    return results, latencies
+
+def _batches(values, batch_size):
+    return [values[start:start + batch_size] for start in range(0, len(values), batch_size)]
+
+# Fungsi untuk membuat model pengganti dengan bentuk input (n, 100) int32 dan output (n, 1)
+def build_stand_in_model(model_type, vocabulary_size, seed=0):
+    import keras
+    from keras import layers
+
+    keras.utils.set_random_seed(seed)
+    recurrent = {
+        'LSTM': lambda: layers.LSTM(STAND_IN_UNITS),
+        'BI-LSTM': lambda: layers.Bidirectional(layers.LSTM(STAND_IN_UNITS)),
+        'GRU': lambda: layers.GRU(STAND_IN_UNITS)
+    }[model_type]
+    model = keras.Sequential([
+        keras.Input(shape=(MAX_SEQUENCE_LENGTH,), dtype='int32'),
+        layers.Embedding(vocabulary_size, STAND_IN_EMBEDDING_DIM),
+        recurrent(),
+        layers.Dense(1, activation='sigmoid')
+    ])
+    return model
+
+# Fungsi untuk memuat model asli atau model pengganti jika file .h5 tidak ada
+def load_benchmark_model(model_type, vocabulary_size, stand_in=False):
+    if not stand_in and os.path.exists(MODEL_PATHS[model_type]):
+        from .lite import load_keras_model
+        return load_keras_model(model_type), False
+    return build_stand_in_model(model_type, vocabulary_size), True
+
+# Tahap preprocess_text: setiap teks diukur per langkah (stopwords dan stemmer sama seperti engine)
+def bench_preprocess(texts):
+    try:
+        stop_words = get_stop_words()
+    except Exception:
+        stop_words = set()
+    stemmer = get_cached_stemmer()
+
+    steps = {name: [] for name in PREPROCESS_STEPS}
+    totals = []
+    processed_texts = []
+    clock = time.perf_counter
+    for text in texts:
+        t0 = clock()
+        cleaned = clean_text(text)
+        t1 = clock()
+        tokens = safe_word_tokenize(cleaned)
+        t2 = clock()
+        tokens = [word for word in tokens if word not in stop_words]
+        t3 = clock()
+        tokens = [stemmer.stem(word) for word in tokens]
+        t4 = clock()
+        processed_texts.append(' '.join(tokens))
+        for name, seconds in zip(PREPROCESS_STEPS, (t1 - t0, t2 - t1, t3 - t2, t4 - t3)):
+            steps[name].append(seconds)
+        totals.append(t4 - t0)
+
+    report = summarize(totals, len(texts))
+    report['steps'] = {name: summarize(latencies, len(texts)) for name, latencies in steps.items()}
+    return processed_texts, report
+
+# Fungsi untuk menjalankan satu tahap dengan pencatatan memori
+def run_stage(function, *args):
+    with MemorySampler() as memory:
+        output, report = function(*args)
+    report['rss_start_mb'] = memory.start_mb
+    report['rss_peak_mb'] = memory.peak_mb
+    return output, report
+
+def bench_keywords(texts):
+    _, latencies = time_calls(check_sentiment_keywords, texts)
+    return None, summarize(latencies, len(texts))
+
+# Tahap tokenisasi + padding (texts_to_padded) per ukuran batch
+def bench_sequences(processed_texts, batch_sizes):
+    tokenizer = get_tokenizer()
+    report = {}
+    padded = None
+    for batch_size in batch_sizes:
+        latencies = []
+        outputs = []
+        for batch in _batches(processed_texts, batch_size):
+            start = time.perf_counter()
+            outputs.append(texts_to_padded(tokenizer, batch))
+            latencies.append(time.perf_counter() - start)
+        report[str(batch_size)] = summarize(latencies, len(processed_texts))
+        padded = np.concatenate(outputs) if outputs else np.zeros((0, MAX_SEQUENCE_LENGTH), dtype=np.int32)
+    return padded, report
+
+# Tahap model.predict per ukuran batch. Satu batch pemanasan (tracing graph) tidak diukur.
+def bench_model(model, padded, batch_sizes, max_batches=None):
+    report = {}
+    for batch_size in batch_sizes:
+        batches = _batches(padded, batch_size)[:max_batches]
+        if not batches:
+            continue
+        model.predict_on_batch(batches[0])
+        latencies = []
+        for batch in batches:
+            start = time.perf_counter()
+            model.predict_on_batch(batch)
+            latencies.append(time.perf_counter() - start)
+        report[str(batch_size)] = summarize(latencies, sum(len(batch) for batch in batches))
+    return None, report
+
+# Fungsi informasi lingkungan agar hasil antar commit/mesin dapat dibandingkan
+def environment_info():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=BASE_DIR, capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    versions = {'python': platform.python_version(), 'numpy': np.__version__}
+    for module in ['tensorflow', 'keras', 'pandas']:
+        try:
+            versions[module] = __import__(module).__version__
+        except ImportError:
+            versions[module] = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'versions': versions
+    }
+
+# Fungsi benchmark lengkap, mengembalikan laporan (dict yang dapat ditulis sebagai JSON)
+def run_benchmark(texts, model_types=None, batch_sizes=None, stand_in=False, max_batches=None, data_path=None):
+    batch_sizes = batch_sizes or DEFAULT_BATCH_SIZES
+    report = {
+        'environment': environment_info(),
+        'corpus': {'path': data_path, 'texts': len(texts)},
+        'batch_sizes': batch_sizes,
+        'stages': {}
+    }
+    stages = report['stages']
+
+    processed_texts, stages['preprocess_text'] = run_stage(bench_preprocess, texts)
+    _, stages['check_sentiment_keywords'] = run_stage(bench_keywords, texts)
+    padded, stages['texts_to_sequences_pad'] = run_stage(bench_sequences, processed_texts, batch_sizes)
+
+    vocabulary_size = get_tokenizer().num_words or len(get_tokenizer().word_index) + 1
+    for model_type in model_types or MODEL_TYPES:
+        model, is_stand_in = load_benchmark_model(model_type, vocabulary_size, stand_in)
+        _, stage = run_stage(bench_model, model, padded, batch_sizes, max_batches)
+        stage['stand_in_model'] = is_stand_in
+        stages[f'predict_{model_type}'] = stage
+
+    report['peak_rss_mb'] = max_rss_mb()
+    return report
+
+# Fungsi perbandingan throughput dengan laporan lain (rasio > 1 berarti lebih cepat)
+def compare_reports(current, baseline):
+    rows = []
+
+    def walk(name, now, before):
+        if 'items_per_second' in now and 'items_per_second' in before and before['items_per_second']:
+            rows.append((name, before['items_per_second'], now['items_per_second'],
+                         now['items_per_second'] / before['items_per_second']))
+        for key, value in now.items():
+            if isinstance(value, dict) and isinstance(before.get(key), dict):
+                walk(f'{name}.{key}' if name else key, value, before[key])
+
+    walk('', current['stages'], baseline.get('stages', {}))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.bench',
+        description="Benchmark tiap tahap pipeline analisis sentimen atas dataset_10k.csv."
+    )
+    parser.add_argument('--data', default=DATASET_PATH, help="File CSV korpus")
+    parser.add_argument('--text-field', default='full_text', help="Kolom teks (default: full_text)")
+    parser.add_argument('--limit', type=int, default=None, help="Jumlah baris maksimum")
+    parser.add_argument('--models', default=','.join(MODEL_TYPES),
+                        help="Algoritma yang diukur, dipisah koma (default: semua)")
+    parser.add_argument('--batch-sizes', default=','.join(map(str, DEFAULT_BATCH_SIZES)),
+                        help=f"Ukuran batch, dipisah koma (default: {','.join(map(str, DEFAULT_BATCH_SIZES))})")
+    parser.add_argument('--max-batches', type=int, default=None,
+                        help="Jumlah batch maksimum per ukuran batch untuk model.predict (default: semua)")
+    parser.add_argument('--stand-in', action='store_true',
+                        help="Selalu gunakan model pengganti walaupun file .h5 tersedia")
+    parser.add_argument('--output', default=None, help="File JSON hasil (default: stdout)")
+    parser.add_argument('--compare', default=None, help="File JSON benchmark sebelumnya untuk dibandingkan")
+    args = parser.parse_args(argv)
+
+    model_types = [name.strip() for name in args.models.split(',') if name.strip()]
+    unknown = [model_type for model_type in model_types if model_type not in MODEL_TYPES]
+    if unknown:
+        parser.error(f"Model type tidak dikenali: {', '.join(unknown)}")
+    batch_sizes = [int(size) for size in args.batch_sizes.split(',') if size.strip()]
+
+    texts = load_texts(args.data, args.text_field, args.limit)
+    report = run_benchmark(texts, model_types, batch_sizes, args.stand_in, args.max_batches,
+                           os.path.relpath(args.data, BASE_DIR))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            handle.write(output + '\n')
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as handle:
+            baseline = json.load(handle)
+        print(f"Perbandingan dengan {args.compare} (commit {baseline.get('environment', {}).get('commit')}):",
+              file=sys.stderr)
+        for name, before, now, ratio in compare_reports(report, baseline):
+            print(f"  {name:45s} {before:12,.0f} -> {now:12,.0f} item/detik  {ratio:5.2f}x", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+# Padding dinamis per bucket panjang untuk model Keras.
+# Setiap teks di-padding sampai MAX_SEQUENCE_LENGTH (padding 'post'), padahal sebagian besar
+# tweet hasil preprocessing jauh lebih pendek, sehingga layer LSTM/GRU lebih banyak melangkah
+# di atas token padding. BucketedModel mengelompokkan sequence per bucket panjang, memotong
+# padding sampai lebar bucket, memprediksi per bucket lalu mengembalikan skor sesuai urutan input.
+# Lebar bucket hanya bergantung pada panjang teks itu sendiri, sehingga skor sebuah teks tidak
+# dipengaruhi teks lain di batch yang sama.
+#
+# Model dilatih dengan padding tetap tanpa masking, jadi skor padding dinamis sedikit berbeda.
+# Laporan parity membandingkan kedua jalur untuk setiap model sebelum mode ini diaktifkan:
+#
+#   python -m sentimen.bucketing --limit 2000            # laporan parity fixed vs bucket/mask
+#   SENTIMEN_DYNAMIC_PADDING=bucket streamlit run aplikasi.py
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from .corpus import encoded_inputs, load_corpus
+from .engine import (
+    BUCKET_BOUNDARIES,
+    DATASET_PATH,
+    MAX_SEQUENCE_LENGTH,
+    MODEL_PATHS,
+    MODEL_TYPES,
+    SENTIMENT_THRESHOLD,
+    combine_scores,
+    get_blend,
+    predict_padded,
+)
+
+# Fungsi panjang setiap sequence (posisi token bukan nol terakhir + 1, padding 'post')
+def sequence_lengths(padded_sequences):
+    nonzero = np.asarray(padded_sequences) != 0
+    if nonzero.shape[1] == 0:
+        return np.zeros(len(nonzero), dtype=np.int64)
+    last = nonzero.shape[1] - np.argmax(nonzero[:, ::-1], axis=1)
+    return np.where(nonzero.any(axis=1), last, 0)
+
+# Fungsi lebar bucket untuk setiap panjang: batas bucket terkecil yang memuat seluruh token.
+# Sequence kosong tetap diberi lebar minimal satu token.
+def bucket_widths(lengths, boundaries=BUCKET_BOUNDARIES):
+    boundaries = np.asarray(sorted(boundaries))
+    return boundaries[np.searchsorted(boundaries, np.maximum(lengths, 1))]
+
+# Fungsi salinan model dengan Embedding mask_zero=True, sehingga layer rekuren melewati padding
+def masked_model(model):
+    import keras
+
+    found = []
+
+    def clone_layer(layer):
+        config = layer.get_config()
+        if isinstance(layer, keras.layers.Embedding):
+            config['mask_zero'] = True
+            found.append(layer.name)
+        return layer.__class__.from_config(config)
+
+    clone = keras.models.clone_model(model, clone_function=clone_layer)
+    if not found:
+        raise ValueError("Model tidak memiliki layer Embedding untuk masking.")
+    clone.set_weights(model.get_weights())
+    return clone
+
+# Model Keras dengan padding dinamis dan antarmuka predict/predict_on_batch yang sama.
+# Jumlah lebar input berbeda dibatasi oleh boundaries, sehingga fungsi prediksi Keras
+# hanya di-trace sekali per bucket.
+class BucketedModel:
+    def __init__(self, model, mask=False, boundaries=BUCKET_BOUNDARIES):
+        boundaries = tuple(sorted(boundaries))
+        if not boundaries or boundaries[0] < 1 or boundaries[-1] < MAX_SEQUENCE_LENGTH:
+            raise ValueError(f"Batas bucket harus positif dan mencakup panjang {MAX_SEQUENCE_LENGTH}.")
+        self.model = masked_model(model) if mask else model
+        self.mask = mask
+        self.boundaries = boundaries
+
+    def predict(self, padded_sequences, batch_size=1024, verbose=0):
+        padded_sequences = np.asarray(padded_sequences)
+        widths = np.minimum(bucket_widths(sequence_lengths(padded_sequences), self.boundaries),
+                            padded_sequences.shape[1])
+        outputs = None
+        for width in np.unique(widths):
+            rows = np.flatnonzero(widths == width)
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                scores = np.asarray(self.model.predict_on_batch(padded_sequences[batch, :width]))
+                if outputs is None:
+                    outputs = np.zeros((len(padded_sequences),) + scores.shape[1:], dtype=scores.dtype)
+                # Kembalikan skor ke posisi input semula
+                outputs[batch] = scores
+        if outputs is None:
+            return np.zeros((0, 1), dtype=np.float32)
+        return outputs
+
+    def predict_on_batch(self, padded_sequences):
+        return self.predict(padded_sequences, batch_size=max(len(padded_sequences), 1))
+
+def _timed(function, repeats):
+    timings = []
+    for _ in range(max(repeats, 1)):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    # Run pertama ikut menghitung tracing fungsi prediksi Keras; ambil waktu tercepat
+    return result, min(timings)
+
+# Fungsi untuk membandingkan skor padding tetap dengan padding dinamis pada teks yang sama.
+# Melaporkan selisih skor model, kesesuaian label (skor model saja dan skor gabungan) dan waktu.
+def parity_report(model_types=None, texts=None, modes=("bucket", "mask"), batch_size=1024,
+                  boundaries=BUCKET_BOUNDARIES, repeats=2, corpus=None):
+    from .lite import load_keras_model
+
+    padded, keyword_scores = encoded_inputs(texts, corpus)
+    lengths = sequence_lengths(padded)
+    widths = bucket_widths(lengths, boundaries)
+
+    report = {
+        'texts': len(padded),
+        'boundaries': list(boundaries),
+        'buckets': {str(width): int(np.sum(widths == width)) for width in sorted(set(boundaries))},
+        'length_p50': float(np.percentile(lengths, 50)) if len(lengths) else 0.0,
+        'length_p95': float(np.percentile(lengths, 95)) if len(lengths) else 0.0,
+        # Langkah rekuren yang dijalankan dibanding padding tetap
+        'step_ratio': float(widths.sum() / (len(widths) * MAX_SEQUENCE_LENGTH)) if len(widths) else 0.0,
+        'models': {}
+    }
+    for model_type in model_types or MODEL_TYPES:
+        if not os.path.exists(MODEL_PATHS[model_type]):
+            continue
+        model = load_keras_model(model_type)
+        fixed_scores, fixed_predict = _timed(lambda: predict_padded(model, padded, batch_size), repeats)
+        threshold = get_blend(model_type)[2]
+        fixed_labels = combine_scores(fixed_scores, keyword_scores, model_type) >= threshold
+
+        stats = {'fixed_predict_seconds': fixed_predict}
+        for mode in modes:
+            bucketed = BucketedModel(model, mask=mode == "mask", boundaries=boundaries)
+            scores, seconds = _timed(lambda: predict_padded(bucketed, padded, batch_size), repeats)
+            difference = np.abs(fixed_scores - scores)
+            labels = combine_scores(scores, keyword_scores, model_type) >= threshold
+            stats[mode] = {
+                'max_abs_diff': float(difference.max()) if len(difference) else 0.0,
+                'mean_abs_diff': float(difference.mean()) if len(difference) else 0.0,
+                'model_label_agreement': float(np.mean((fixed_scores >= SENTIMENT_THRESHOLD) ==
+                                                       (scores >= SENTIMENT_THRESHOLD))) if len(padded) else 1.0,
+                'label_agreement': float(np.mean(fixed_labels == labels)) if len(padded) else 1.0,
+                'predict_seconds': seconds,
+                'speedup': fixed_predict / seconds if seconds else 0.0
+            }
+        report['models'][model_type] = stats
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.bucketing',
+        description="Bandingkan skor dan waktu prediksi padding tetap dengan padding dinamis per bucket."
+    )
+    parser.add_argument('--models', default=','.join(MODEL_TYPES),
+                        help="Algoritma yang dibandingkan, dipisah koma (default: semua)")
+    parser.add_argument('--modes', default='bucket,mask',
+                        help="Mode padding dinamis yang dibandingkan, dipisah koma (default: bucket,mask)")
+    parser.add_argument('--boundaries', default=','.join(str(width) for width in BUCKET_BOUNDARIES),
+                        help="Batas lebar bucket, dipisah koma (default: %(default)s)")
+    parser.add_argument('--data', default=DATASET_PATH, help="File CSV teks uji")
+    parser.add_argument('--text-field', default='full_text', help="Kolom teks (default: full_text)")
+    parser.add_argument('--limit', type=int, default=None, help="Jumlah baris maksimum")
+    parser.add_argument('--batch-size', type=int, default=1024, help="Ukuran batch prediksi (default: 1024)")
+    parser.add_argument('--repeats', type=int, default=2,
+                        help="Jumlah pengulangan waktu prediksi, diambil yang tercepat (default: 2)")
+    parser.add_argument('--min-agreement', type=float, default=0.99,
+                        help="Kesesuaian label minimum, exit code 1 jika di bawahnya (default: 0.99)")
+    args = parser.parse_args(argv)
+
+    model_types = [name.strip() for name in args.models.split(',') if name.strip()]
+    unknown = [model_type for model_type in model_types if model_type not in MODEL_TYPES]
+    if unknown:
+        parser.error(f"Model type tidak dikenali: {', '.join(unknown)}")
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    if any(mode not in ("bucket", "mask") for mode in modes):
+        parser.error("Mode padding dinamis harus bucket atau mask.")
+    try:
+        boundaries = tuple(sorted({int(width) for width in args.boundaries.split(',') if width.strip()}))
+    except ValueError:
+        parser.error("Batas bucket harus berupa bilangan bulat.")
+    if not boundaries or boundaries[0] < 1 or boundaries[-1] < MAX_SEQUENCE_LENGTH:
+        parser.error(f"Batas bucket harus positif dan mencakup panjang {MAX_SEQUENCE_LENGTH}.")
+
+    report = parity_report(model_types, None, modes, args.batch_size, boundaries, args.repeats,
+                           corpus=load_corpus(args.data, args.text_field).head(args.limit))
+    print(json.dumps(report, indent=2))
+    if any(stats[mode]['label_agreement'] < args.min_agreement
+           for stats in report['models'].values() for mode in modes):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
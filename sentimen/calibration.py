@@ -0,0 +1,231 @@
+# Kalibrasi bobot gabungan model/kata kunci dan ambang sentimen pada korpus berlabel.
+# Skor model dan skor kata kunci diambil dari korpus ter-encode (sentimen.corpus): dihitung sekali
+# lalu di-cache, sehingga grid bobot x ambang dapat dievaluasi berulang kali tanpa preprocessing
+# atau prediksi ulang. Seluruh grid untuk satu model dihitung dengan operasi NumPy tervektorisasi
+# (skor gabungan semua bobot sekaligus, diurutkan, lalu jumlah prediksi positif per ambang).
+#
+# Kolom label berisi Positif/Negatif (juga positive/negative, pos/neg, 1/0); baris lain diabaikan.
+#
+#   python -m sentimen.calibration --data berlabel.csv --label-field label             # laporan per model
+#   python -m sentimen.calibration --data berlabel.csv --save                          # simpan calibration.json
+#   python -m sentimen.calibration --data berlabel.csv --save --select BI-LSTM         # hanya untuk BI-LSTM
+#
+# calibration.json berisi konfigurasi per model; engine memakai bobot dan ambang setiap model hanya
+# untuk model itu sendiri (model lain dan mode ensemble tetap memakai bobot bawaan).
+#   SENTIMEN_CALIBRATION="" streamlit run aplikasi.py                                  # abaikan hasil kalibrasi
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from .corpus import load_corpus
+from .engine import (
+    CALIBRATION_PATH,
+    DATASET_PATH,
+    MODEL_TYPES,
+    get_blend,
+    model_files_available,
+)
+
+# Jumlah titik grid bobot model dan ambang (0, 0.01, ..., 1)
+DEFAULT_GRID_SIZE = 101
+
+METRICS = ['accuracy', 'precision', 'recall', 'f1', 'macro_f1']
+
+POSITIVE_LABELS = {'positif', 'positive', 'pos', '1', '1.0', 'true'}
+NEGATIVE_LABELS = {'negatif', 'negative', 'neg', '0', '0.0', 'false'}
+
+# Fungsi untuk membaca kolom label: 1 (positif), 0 (negatif) atau -1 (tidak dikenali/kosong)
+def load_labels(path, label_field='label'):
+    import pandas as pd
+    values = pd.read_csv(path, usecols=[label_field], dtype=str, keep_default_na=False)[label_field]
+    values = values.str.strip().str.lower()
+    return np.where(values.isin(POSITIVE_LABELS), 1, np.where(values.isin(NEGATIVE_LABELS), 0, -1)).astype(np.int8)
+
+# Fungsi grid bobot model atau ambang 0..1. Dibulatkan agar nilai yang disimpan sama persis
+# dengan yang dievaluasi (misalnya 0.3 dan 1 - 0.3).
+def grid_values(size=DEFAULT_GRID_SIZE):
+    return np.round(np.linspace(0.0, 1.0, size), 10)
+
+# Fungsi metrik dari jumlah prediksi positif, true positive, jumlah positif sebenarnya dan jumlah teks
+def _metrics(predicted_positive, true_positive, positives, total):
+    false_negative = positives - true_positive
+    true_negative = total - predicted_positive - false_negative
+    negatives = total - positives
+    predicted_negative = total - predicted_positive
+
+    def ratio(numerator, denominator):
+        numerator, denominator = np.broadcast_arrays(np.asarray(numerator, dtype=float),
+                                                     np.asarray(denominator, dtype=float))
+        return np.divide(numerator, denominator, out=np.zeros(numerator.shape), where=denominator > 0)
+
+    f1 = ratio(2 * true_positive, predicted_positive + positives)
+    negative_f1 = ratio(2 * true_negative, predicted_negative + negatives)
+    return {
+        'accuracy': ratio(true_positive + true_negative, total),
+        'precision': ratio(true_positive, predicted_positive),
+        'recall': ratio(true_positive, positives),
+        'f1': f1,
+        'macro_f1': (f1 + negative_f1) / 2,
+    }
+
+# Fungsi evaluasi seluruh grid bobot model x ambang. Label positif jika
+# w * skor_model + (1 - w) * skor_kata_kunci >= ambang, sama dengan combine_scores/sentiment_label.
+# Skor gabungan semua bobot dihitung sekaligus (bobot x teks) lalu diurutkan per bobot; jumlah teks
+# dan true positive di atas setiap ambang dibaca dari posisi ambang (searchsorted) dan jumlah kumulatif.
+# Mengembalikan dict metrik berbentuk (bobot, ambang).
+def sweep(model_scores, keyword_scores, labels, weights=None, thresholds=None):
+    weights = grid_values() if weights is None else np.asarray(weights, dtype=float)
+    thresholds = grid_values() if thresholds is None else np.asarray(thresholds, dtype=float)
+    model_scores = np.asarray(model_scores, dtype=float)
+    keyword_scores = np.asarray(keyword_scores, dtype=float)
+    labels = np.asarray(labels, dtype=np.int64)
+
+    combined = weights[:, None] * model_scores[None, :] + \
+        np.round(1.0 - weights, 10)[:, None] * keyword_scores[None, :]
+    order = np.argsort(combined, axis=1, kind='stable')
+    combined = np.take_along_axis(combined, order, axis=1)
+    positives_before = np.zeros((len(weights), len(labels) + 1), dtype=np.int64)
+    np.cumsum(labels[order], axis=1, out=positives_before[:, 1:])
+
+    first_positive = np.stack([np.searchsorted(row, thresholds, side='left') for row in combined])
+    total = len(labels)
+    positives = int(labels.sum())
+    predicted_positive = total - first_positive
+    true_positive = positives - np.take_along_axis(positives_before, first_positive, axis=1)
+    return _metrics(predicted_positive, true_positive, positives, total)
+
+# Fungsi metrik untuk satu pasangan bobot dan ambang (dihitung langsung, tanpa grid)
+def evaluate(model_scores, keyword_scores, labels, model_weight, keyword_weight, threshold):
+    predicted = model_weight * np.asarray(model_scores, dtype=float) + \
+        keyword_weight * np.asarray(keyword_scores, dtype=float) >= threshold
+    labels = np.asarray(labels, dtype=bool)
+    metrics = _metrics(int(predicted.sum()), int((predicted & labels).sum()), int(labels.sum()), len(labels))
+    return {name: float(value) for name, value in metrics.items()}
+
+# Fungsi konfigurasi terbaik pada grid untuk satu metrik (seri: bobot model dan ambang terkecil)
+def best_configurations(metrics, weights, thresholds, metric='f1', top=1):
+    scores = metrics[metric].ravel()
+    ranked = np.lexsort((np.arange(len(scores)), -scores))[:top]
+    rows, cols = np.unravel_index(ranked, metrics[metric].shape)
+    return [dict({'model_weight': float(weights[row]), 'keyword_weight': float(np.round(1.0 - weights[row], 10)),
+                  'threshold': float(thresholds[col])},
+                 **{name: float(values[row, col]) for name, values in metrics.items()})
+            for row, col in zip(rows.tolist(), cols.tolist())]
+
+# Fungsi laporan kalibrasi per model pada korpus berlabel
+def calibration_report(data_path, label_field='label', text_field='full_text', model_types=None,
+                       grid_size=DEFAULT_GRID_SIZE, metric='f1', top=5):
+    corpus = load_corpus(data_path, text_field)
+    labels = load_labels(data_path, label_field)
+    if len(labels) != len(corpus):
+        raise ValueError(f"Jumlah label ({len(labels)}) tidak sama dengan jumlah baris korpus ({len(corpus)}).")
+    labeled = labels >= 0
+    labels = labels[labeled]
+    keyword_scores = np.asarray(corpus.keyword_scores)[labeled]
+    weights = thresholds = grid_values(grid_size)
+
+    report = {
+        'data': os.path.abspath(data_path),
+        'rows': len(corpus),
+        'labeled': int(labeled.sum()),
+        'positive_share': float(labels.mean()) if len(labels) else 0.0,
+        'grid': [len(weights), len(thresholds)],
+        'metric': metric,
+        'models': {}
+    }
+    for model_type in model_types or MODEL_TYPES:
+        if not model_files_available(model_type):
+            continue
+        start = time.perf_counter()
+        model_scores = np.asarray(corpus.model_scores(model_type), dtype=float)[labeled]
+        scoring_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        metrics = sweep(model_scores, keyword_scores, labels, weights, thresholds)
+        sweep_seconds = time.perf_counter() - start
+        model_weight, keyword_weight, threshold = get_blend(model_type)
+        report['models'][model_type] = {
+            'current': dict({'model_weight': model_weight, 'keyword_weight': keyword_weight, 'threshold': threshold},
+                            **evaluate(model_scores, keyword_scores, labels, model_weight, keyword_weight,
+                                       threshold)),
+            'best': best_configurations(metrics, weights, thresholds, metric, top),
+            'scoring_seconds': scoring_seconds,
+            'sweep_seconds': sweep_seconds
+        }
+    return report
+
+# Fungsi untuk menyimpan konfigurasi per model (dibaca engine saat start). configurations berisi
+# {model_type: konfigurasi}; konfigurasi model lain yang sudah ada di file tetap dipertahankan.
+def save_calibration(configurations, path=CALIBRATION_PATH, **details):
+    models = {}
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as handle:
+            existing = json.load(handle)
+        # Format lama: satu konfigurasi dengan model_type
+        models = existing['models'] if 'models' in existing else \
+            {existing['model_type']: existing} if 'model_type' in existing else {}
+    for model_type, configuration in configurations.items():
+        models[model_type] = dict(configuration, **details)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as handle:
+        json.dump({'models': models}, handle, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.calibration',
+        description="Cari bobot gabungan model/kata kunci dan ambang sentimen terbaik pada korpus berlabel."
+    )
+    parser.add_argument('--data', default=DATASET_PATH, help="File CSV berlabel")
+    parser.add_argument('--label-field', default='label', help="Kolom label (default: label)")
+    parser.add_argument('--text-field', default='full_text', help="Kolom teks (default: full_text)")
+    parser.add_argument('--models', default=','.join(MODEL_TYPES),
+                        help="Algoritma yang dikalibrasi, dipisah koma (default: semua)")
+    parser.add_argument('--grid', type=int, default=DEFAULT_GRID_SIZE,
+                        help="Jumlah titik grid bobot model dan ambang (default: %(default)s)")
+    parser.add_argument('--metric', choices=METRICS, default='f1', help="Metrik pemilihan (default: f1)")
+    parser.add_argument('--top', type=int, default=5, help="Jumlah konfigurasi terbaik per model (default: 5)")
+    parser.add_argument('--save', action='store_true',
+                        help="Simpan konfigurasi terbaik setiap model ke file kalibrasi yang dibaca aplikasi")
+    parser.add_argument('--select', choices=MODEL_TYPES, default=None,
+                        help="Hanya simpan konfigurasi model ini (default: semua model yang dikalibrasi)")
+    parser.add_argument('--output', default=CALIBRATION_PATH,
+                        help="Lokasi file kalibrasi (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    model_types = [name.strip() for name in args.models.split(',') if name.strip()]
+    unknown = [model_type for model_type in model_types if model_type not in MODEL_TYPES]
+    if unknown:
+        parser.error(f"Model type tidak dikenali: {', '.join(unknown)}")
+    if args.grid < 2:
+        parser.error("Ukuran grid minimal 2.")
+    try:
+        labels = load_labels(args.data, args.label_field)
+    except ValueError as e:
+        parser.error(f"Kolom label tidak dapat dibaca: {e}")
+    if not (labels >= 0).any():
+        parser.error(f"Tidak ada label Positif/Negatif pada kolom '{args.label_field}'.")
+
+    report = calibration_report(args.data, args.label_field, args.text_field, model_types, args.grid,
+                                args.metric, max(args.top, 1))
+    print(json.dumps(report, indent=2))
+    if not report['models']:
+        print("Tidak ada model yang tersedia untuk dikalibrasi.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.save:
+        selected = [args.select] if args.select else list(report['models'])
+        if args.select and args.select not in report['models']:
+            parser.error(f"Model {args.select} tidak tersedia.")
+        path = save_calibration({name: report['models'][name]['best'][0] for name in selected}, args.output,
+                                metric=args.metric, data=report['data'], labeled=report['labeled'],
+                                created_at=time.strftime('%Y-%m-%dT%H:%M:%S'))
+        print(f"Kalibrasi {', '.join(selected)} disimpan ke {path}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# CLI analisis sentimen tanpa Streamlit.
+# Membaca JSONL/CSV dari stdin dan menulis hasil skor ke stdout secara bertahap (per batch).
+#
+# Contoh:
+#   python -m sentimen --format csv --model GRU < dataset/dataset_10k.csv > hasil.csv
+#   echo '{"id_str": "1", "full_text": "programnya sangat membantu"}' | python -m sentimen
+import argparse
+import csv
+import itertools
+import contextlib
+import json
+import sys
+
+from .engine import MODEL_TYPES, model_files_available, score_texts
+
+# Kolom hasil yang ditulis untuk setiap baris
+OUTPUT_FIELDS = ['sentiment', 'combined_score', 'model_score', 'keyword_score',
+                 'positive_matches', 'negative_matches']
+
+# Fungsi untuk membaca record JSONL (objek JSON atau string teks biasa per baris)
+def read_jsonl(stream, text_field):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            record = {text_field: record}
+        yield record
+
+# Fungsi untuk membagi iterator record menjadi batch
+def iter_batches(records, batch_size):
+    records = iter(records)
+    while True:
+        batch = list(itertools.islice(records, batch_size))
+        if not batch:
+            return
+        yield batch
+
+# Fungsi untuk menggabungkan kolom yang dipertahankan dengan hasil skor
+def build_rows(batch, results, keep_fields):
+    for record, result in zip(batch, results):
+        row = {field: record.get(field) for field in keep_fields if field in record}
+        row.update({field: result[field] for field in OUTPUT_FIELDS})
+        for field in ('cluster_id', 'model_skipped'):
+            if field in result:
+                row[field] = result[field]
+        yield row
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen',
+        description="Analisis sentimen tweet dari stdin (JSONL/CSV) ke stdout."
+    )
+    parser.add_argument('--model', choices=MODEL_TYPES, default='BI-LSTM',
+                        help="Algoritma yang digunakan (default: BI-LSTM)")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl',
+                        help="Format input dan output (default: jsonl)")
+    parser.add_argument('--text-field', default='full_text',
+                        help="Nama kolom/field teks (default: full_text)")
+    parser.add_argument('--keep', default='id_str,created_at',
+                        help="Kolom input yang ikut ditulis ke output, dipisah koma (default: id_str,created_at)")
+    parser.add_argument('--batch-size', type=int, default=512,
+                        help="Jumlah baris per batch prediksi (default: 512)")
+    parser.add_argument('--keywords-only', action='store_true',
+                        help="Hanya gunakan analisis kata kunci (tanpa memuat TensorFlow)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Jumlah proses untuk preprocessing paralel (default: 1)")
+    parser.add_argument('--cache', action='store_true',
+                        help="Gunakan cache prediksi (memori + SQLite) untuk teks berulang")
+    parser.add_argument('--near-duplicates', type=float, nargs='?', const=0.8, default=None, metavar='THRESHOLD',
+                        help="Prediksi sekali per klaster hampir-duplikat (MinHash/LSH, Jaccard >= THRESHOLD, "
+                             "default 0.8) dan tulis kolom cluster_id")
+    parser.add_argument('--cascade', action='store_true',
+                        help="Jalankan model hanya jika skornya masih bisa mengubah label hasil kata kunci "
+                             "(default: aktif jika SENTIMEN_CASCADE=1)")
+    args = parser.parse_args(argv)
+    if args.near_duplicates is not None and args.cache:
+        parser.error("--near-duplicates tidak dapat dipakai bersama --cache.")
+    if args.near_duplicates is not None and not 0.0 < args.near_duplicates <= 1.0:
+        parser.error("THRESHOLD --near-duplicates harus di antara 0 dan 1.")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    keep_fields = [field.strip() for field in args.keep.split(',') if field.strip()]
+
+    if not args.keywords_only and not model_files_available(args.model):
+        print(f"Peringatan: file model {args.model} atau tokenizer tidak ditemukan. "
+              "Menggunakan analisis berdasarkan kata kunci saja.", file=sys.stderr)
+
+    stdin = open(sys.stdin.fileno(), 'r', encoding='utf-8', newline='', closefd=False)
+    stdout = open(sys.stdout.fileno(), 'w', encoding='utf-8', newline='', closefd=False)
+
+    if args.format == 'csv':
+        records = csv.DictReader(stdin)
+    else:
+        records = read_jsonl(stdin, args.text_field)
+
+    with contextlib.ExitStack() as stack:
+        preprocess = None
+        if args.workers > 1 and not args.keywords_only:
+            from .parallel import PreprocessPool
+            preprocess = stack.enter_context(PreprocessPool(args.workers)).preprocess_texts
+        cache = None
+        if args.cache and not args.keywords_only:
+            from .prediction_cache import get_prediction_cache
+            cache = get_prediction_cache()
+        near_duplicates = None
+        if args.near_duplicates is not None and not args.keywords_only:
+            from .near_duplicates import NearDuplicateIndex
+            near_duplicates = NearDuplicateIndex(args.near_duplicates)
+        totals = write_results(args, records, keep_fields, stdout, preprocess, cache, near_duplicates)
+        if totals['cascade']:
+            print(f"Cascade: model dilewati untuk {totals['model_skipped']:,} dari {totals['texts']:,} teks "
+                  f"({totals['model_skipped'] / totals['texts'] if totals['texts'] else 0.0:.1%})", file=sys.stderr)
+        if cache is not None:
+            print(f"Cache prediksi: {json.dumps(cache.stats())}", file=sys.stderr)
+        if near_duplicates is not None:
+            print(f"Hampir-duplikat: {json.dumps(near_duplicates.stats())}", file=sys.stderr)
+
+# Fungsi untuk menganalisis record per batch dan menulis hasilnya.
+# Indeks hampir-duplikat dipakai bersama oleh semua batch. Mengembalikan jumlah teks dan
+# jumlah teks yang tidak dikirim ke model pada mode cascade.
+def write_results(args, records, keep_fields, stdout, preprocess=None, cache=None, near_duplicates=None):
+    writer = None
+    totals = {'texts': 0, 'model_skipped': 0, 'cascade': False}
+    for batch in iter_batches(records, args.batch_size):
+        texts = [record.get(args.text_field) for record in batch]
+        results = score_texts(texts, args.model, batch_size=args.batch_size,
+                              use_model=not args.keywords_only, preprocess=preprocess, cache=cache,
+                              near_duplicates=near_duplicates, cascade=args.cascade or None)
+        totals['texts'] += len(results)
+        if results and 'model_skipped' in results[0]:
+            totals['cascade'] = True
+            totals['model_skipped'] += sum(result['model_skipped'] for result in results)
+
+        for row in build_rows(batch, results, keep_fields):
+            if args.format == 'csv':
+                row['positive_matches'] = ', '.join(row['positive_matches'])
+                row['negative_matches'] = ', '.join(row['negative_matches'])
+                if writer is None:
+                    writer = csv.DictWriter(stdout, fieldnames=list(row))
+                    writer.writeheader()
+                writer.writerow(row)
+            else:
+                stdout.write(json.dumps(row, ensure_ascii=False) + '\n')
+        stdout.flush()
+    return totals
+
+if __name__ == "__main__":
+    main()
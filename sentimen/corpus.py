@@ -0,0 +1,408 @@
+# Korpus ter-encode yang disimpan sebagai file .npy dan dibuka dengan memory map.
+# Eksperimen berulang atas dataset yang sama (parity padding/TFLite, perbandingan model, mencoba
+# bobot gabungan) tidak perlu lagi membersihkan, men-stem dan men-tokenisasi ulang setiap tweet:
+# hasilnya dibuat sekali lalu dibuka zero-copy (np.load mmap_mode='r') pada run berikutnya.
+#
+# Isi direktori cache/corpus/<dataset>-<kolom>-<hash path>/:
+#   sequences.npy       int32 (n, MAX_SEQUENCE_LENGTH)  input model yang sudah di-padding
+#   keyword_counts.npy  int32 (n, 2)                    jumlah kata kunci positif/negatif yang cocok
+#   keyword_scores.npy  float64 (n,)                    skor kata kunci
+#   row_ids.npy         int64 (n,)                      nomor baris data pada file CSV sumber
+#   scores-<model>-<fingerprint>.npy                    skor model (dibuat saat perintah score)
+#   manifest.json       hash file sumber dan tokenizer.pickle, fingerprint preprocessing dan leksikon
+#
+# Korpus dibuat ulang otomatis hanya jika file sumber, tokenizer.pickle, kode/stopwords/stemmer
+# preprocessing atau leksikon kata kunci berubah:
+#
+#   python -m sentimen.corpus build                     # buat (atau pakai ulang) korpus dataset_10k.csv
+#   python -m sentimen.corpus check                     # exit code 1 jika korpus belum ada/kedaluwarsa
+#   python -m sentimen.corpus score --models LSTM,GRU   # skor model dari korpus (di-cache per model)
+import argparse
+import hashlib
+import inspect
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+
+from .engine import (
+    BASE_DIR,
+    DATASET_PATH,
+    MAX_SEQUENCE_LENGTH,
+    MODEL_TYPES,
+    SENTIMENT_THRESHOLD,
+    TOKENIZER_PATH,
+    check_sentiment_keywords_batch,
+    clean_text,
+    combine_scores,
+    get_blend,
+    get_keyword_matcher,
+    get_stop_words,
+    get_tokenizer,
+    load_sentiment_model,
+    load_texts,
+    model_files_available,
+    predict_padded,
+    preprocess_texts,
+    robust_tokenizer,
+    texts_to_padded,
+    tokenize_and_stem,
+)
+from .vocab import _file_sha256
+
+logger = logging.getLogger(__name__)
+
+# Lokasi default korpus ter-encode
+CORPUS_DIR = os.path.join(BASE_DIR, 'cache', 'corpus')
+
+# Versi format file korpus (naikkan jika isi/format array berubah)
+CORPUS_FORMAT_VERSION = 1
+
+# Jumlah teks yang di-preprocess dan ditulis per langkah saat membangun korpus
+CORPUS_CHUNK_SIZE = 5000
+
+# Array korpus beserta tipe datanya
+CORPUS_ARRAYS = {
+    'sequences': np.int32,
+    'keyword_counts': np.int32,
+    'keyword_scores': np.float64,
+    'row_ids': np.int64,
+}
+
+MANIFEST_NAME = 'manifest.json'
+
+# Fungsi lokasi direktori korpus untuk satu file sumber dan kolom teks
+def corpus_path_for(data_path=DATASET_PATH, text_field='full_text', corpus_dir=CORPUS_DIR):
+    name = os.path.splitext(os.path.basename(data_path))[0]
+    path_hash = hashlib.sha1(os.path.abspath(data_path).encode('utf-8')).hexdigest()[:8]
+    return os.path.join(corpus_dir, f'{name}-{text_field}-{path_hash}')
+
+# Fungsi versi paket terpasang (kosong jika tidak ada)
+def _package_version(name):
+    from importlib import metadata
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return ''
+
+# Fungsi komponen preprocessing yang menentukan hasil token: kode normalisasi, tokenisasi dan
+# stemming, daftar stopwords, versi Sastrawi/NLTK, tokenizer yang dipakai (NLTK atau fallback
+# regex) dan panjang sequence
+def preprocessing_components():
+    from . import engine, normalizer, stemming
+
+    try:
+        stop_words = sorted(get_stop_words())
+    except:
+        stop_words = []
+    # Tokenizer NLTK baru diketahui tersedia atau tidak setelah dipakai sekali
+    robust_tokenizer('tes')
+
+    code = hashlib.sha256()
+    for module in (normalizer, stemming):
+        with open(module.__file__, 'rb') as handle:
+            code.update(handle.read())
+    for function in (clean_text, robust_tokenizer, tokenize_and_stem, preprocess_texts):
+        code.update(inspect.getsource(function).encode('utf-8'))
+
+    return {
+        'code': code.hexdigest()[:16],
+        'stop_words': hashlib.sha256('\n'.join(stop_words).encode('utf-8')).hexdigest()[:16],
+        'sastrawi': _package_version('Sastrawi'),
+        'nltk': _package_version('nltk'),
+        'nltk_tokenizer': engine._nltk_tokenizer_available,
+        'max_sequence_length': MAX_SEQUENCE_LENGTH,
+    }
+
+# Fungsi fingerprint preprocessing (hash dari preprocessing_components)
+def preprocessing_fingerprint(components=None):
+    components = preprocessing_components() if components is None else components
+    return hashlib.sha256(json.dumps(components, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+# Fungsi fingerprint leksikon kata kunci (kata, polaritas dan bobot)
+def lexicon_fingerprint():
+    matcher = get_keyword_matcher()
+    entries = [[term, bool(positive), float(weight)]
+               for term, positive, weight in zip(matcher.terms, matcher.is_positive, matcher.weights)]
+    return hashlib.sha256(json.dumps(entries).encode('utf-8')).hexdigest()[:16]
+
+# Fungsi fingerprint saat ini untuk dibandingkan dengan manifest korpus
+def current_fingerprints(data_path, text_field):
+    components = preprocessing_components()
+    return {
+        'format': CORPUS_FORMAT_VERSION,
+        'source_sha256': _file_sha256(data_path),
+        'text_field': text_field,
+        'tokenizer_sha256': _file_sha256(TOKENIZER_PATH),
+        'preprocessing': preprocessing_fingerprint(components),
+        'preprocessing_components': components,
+        'lexicon': lexicon_fingerprint(),
+    }
+
+# Fungsi untuk membaca manifest korpus (None jika belum ada atau rusak)
+def read_manifest(corpus_dir):
+    try:
+        with open(os.path.join(corpus_dir, MANIFEST_NAME), encoding='utf-8') as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+# Fungsi alasan korpus harus dibuat ulang (daftar kosong jika masih berlaku)
+def stale_reasons(manifest, fingerprints):
+    if manifest is None:
+        return ["korpus belum dibuat"]
+    reasons = []
+    labels = {
+        'format': "format korpus berubah",
+        'source_sha256': "file sumber berubah",
+        'text_field': "kolom teks berbeda",
+        'tokenizer_sha256': "tokenizer.pickle berubah",
+        'preprocessing': "preprocessing berubah",
+        'lexicon': "leksikon kata kunci berubah",
+    }
+    for key, label in labels.items():
+        if manifest.get(key) != fingerprints[key]:
+            reasons.append(label)
+    return reasons
+
+# Korpus ter-encode yang dibuka dengan memory map (read-only, zero-copy)
+class EncodedCorpus:
+    def __init__(self, path, manifest, arrays):
+        self.path = path
+        self.manifest = manifest
+        self.sequences = arrays['sequences']
+        self.keyword_counts = arrays['keyword_counts']
+        self.keyword_scores = arrays['keyword_scores']
+        self.row_ids = arrays['row_ids']
+
+    @classmethod
+    def open(cls, path):
+        manifest = read_manifest(path)
+        if manifest is None:
+            raise FileNotFoundError(f"Manifest korpus '{os.path.join(path, MANIFEST_NAME)}' tidak ditemukan.")
+        arrays = {}
+        for name in CORPUS_ARRAYS:
+            # File .npy tanpa data tidak dapat di-mmap; korpus kosong dibaca biasa
+            array_path = os.path.join(path, name + '.npy')
+            arrays[name] = np.load(array_path, mmap_mode='r' if manifest['rows'] else None)
+            if len(arrays[name]) != manifest['rows']:
+                raise ValueError(f"Array korpus '{array_path}' tidak sesuai manifest.")
+        return cls(path, manifest, arrays)
+
+    def __len__(self):
+        return len(self.row_ids)
+
+    # Korpus dengan baris pertama saja (view, tanpa menyalin data)
+    def head(self, limit=None):
+        if limit is None or limit >= len(self):
+            return self
+        arrays = {name: getattr(self, name)[:limit] for name in CORPUS_ARRAYS}
+        return EncodedCorpus(self.path, self.manifest, arrays)
+
+    # Skor model untuk setiap baris. Skor dihitung sekali untuk seluruh korpus lalu disimpan
+    # per fingerprint model (backend dan padding ikut menentukan), run berikutnya cukup memuatnya.
+    def model_scores(self, model_type, batch_size=1024):
+        from .prediction_cache import model_fingerprint
+
+        scores_path = os.path.join(self.path, f'scores-{model_type}-{model_fingerprint(model_type)}.npy')
+        if os.path.exists(scores_path):
+            scores = np.load(scores_path, mmap_mode='r' if self.manifest['rows'] else None)
+        else:
+            model = load_sentiment_model(model_type)
+            full = EncodedCorpus.open(self.path)
+            scores = np.asarray(predict_padded(model, full.sequences, batch_size), dtype=np.float32) \
+                if len(full) else np.zeros(0, dtype=np.float32)
+            tmp_path = f'{scores_path}.tmp-{os.getpid()}.npy'
+            np.save(tmp_path, scores)
+            os.replace(tmp_path, scores_path)
+        return scores[:len(self)]
+
+# Fungsi untuk membangun korpus dari kolom teks file CSV. File ditulis ke direktori sementara
+# lalu menggantikan korpus lama, sehingga pembaca tidak pernah melihat korpus setengah jadi.
+def build_corpus(data_path=DATASET_PATH, text_field='full_text', corpus_dir=None, workers=None,
+                 chunk_size=CORPUS_CHUNK_SIZE, fingerprints=None):
+    from numpy.lib.format import open_memmap
+
+    corpus_dir = corpus_dir or corpus_path_for(data_path, text_field)
+    start = time.perf_counter()
+    fingerprints = fingerprints or current_fingerprints(data_path, text_field)
+    texts = load_texts(data_path, text_field)
+    tokenizer = get_tokenizer()
+
+    tmp_dir = f'{corpus_dir}.tmp-{os.getpid()}'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    try:
+        rows = len(texts)
+        sequences = open_memmap(os.path.join(tmp_dir, 'sequences.npy'), mode='w+', dtype=np.int32,
+                                shape=(rows, MAX_SEQUENCE_LENGTH))
+        keyword_counts = open_memmap(os.path.join(tmp_dir, 'keyword_counts.npy'), mode='w+', dtype=np.int32,
+                                     shape=(rows, 2))
+        keyword_scores = open_memmap(os.path.join(tmp_dir, 'keyword_scores.npy'), mode='w+', dtype=np.float64,
+                                     shape=(rows,))
+        np.save(os.path.join(tmp_dir, 'row_ids.npy'), np.arange(rows, dtype=np.int64))
+
+        if workers and workers > 1:
+            from .parallel import PreprocessPool
+            pool = PreprocessPool(workers=workers, chunk_size=chunk_size)
+            processed_chunks = (processed for processed, _ in pool.iter_chunks(texts))
+        else:
+            pool = None
+            processed_chunks = (preprocess_texts(texts[offset:offset + chunk_size])[0]
+                                for offset in range(0, rows, chunk_size))
+
+        offset = 0
+        try:
+            for processed_texts in processed_chunks:
+                end = offset + len(processed_texts)
+                keywords = check_sentiment_keywords_batch(texts[offset:end])
+                sequences[offset:end] = texts_to_padded(tokenizer, processed_texts)
+                keyword_counts[offset:end, 0] = [len(matches) for matches in keywords['positive_matches']]
+                keyword_counts[offset:end, 1] = [len(matches) for matches in keywords['negative_matches']]
+                keyword_scores[offset:end] = keywords['keyword_score']
+                offset = end
+        finally:
+            if pool is not None:
+                pool.close()
+        for array in (sequences, keyword_counts, keyword_scores):
+            array.flush()
+        del sequences, keyword_counts, keyword_scores
+
+        manifest = dict(fingerprints, source=os.path.abspath(data_path), rows=rows,
+                        arrays={name: np.dtype(dtype).name for name, dtype in CORPUS_ARRAYS.items()},
+                        built_at=time.strftime('%Y-%m-%dT%H:%M:%S'),
+                        build_seconds=round(time.perf_counter() - start, 3))
+        with open(os.path.join(tmp_dir, MANIFEST_NAME), 'w', encoding='utf-8') as handle:
+            json.dump(manifest, handle, indent=2)
+
+        # Direktori tidak bisa di-replace jika tidak kosong: korpus lama dipindahkan dulu lalu dihapus
+        old_dir = f'{corpus_dir}.old-{os.getpid()}'
+        if os.path.exists(corpus_dir):
+            os.replace(corpus_dir, old_dir)
+        os.replace(tmp_dir, corpus_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return EncodedCorpus.open(corpus_dir)
+
+# Fungsi untuk membuka korpus file CSV, dibuat (ulang) dulu jika belum ada atau kedaluwarsa
+def load_corpus(data_path=DATASET_PATH, text_field='full_text', corpus_dir=None, workers=None, rebuild=False):
+    corpus_dir = corpus_dir or corpus_path_for(data_path, text_field)
+    fingerprints = current_fingerprints(data_path, text_field)
+    reasons = ["dibuat ulang atas permintaan"] if rebuild else stale_reasons(read_manifest(corpus_dir), fingerprints)
+    if reasons:
+        logger.info("Membangun korpus '%s': %s", corpus_dir, ', '.join(reasons))
+        return build_corpus(data_path, text_field, corpus_dir, workers, fingerprints=fingerprints)
+    try:
+        return EncodedCorpus.open(corpus_dir)
+    except (OSError, ValueError) as e:
+        logger.warning("Korpus '%s' tidak dapat dibuka, dibuat ulang: %s", corpus_dir, e)
+        return build_corpus(data_path, text_field, corpus_dir, workers, fingerprints=fingerprints)
+
+# Fungsi input model dan skor kata kunci untuk laporan eksperimen: dihitung langsung jika teks
+# diberikan, selain itu dibaca dari korpus (default: korpus dataset_10k.csv)
+def encoded_inputs(texts=None, corpus=None):
+    if texts is not None:
+        processed_texts, _ = preprocess_texts(texts)
+        keyword_scores = np.asarray(check_sentiment_keywords_batch(texts)['keyword_score'], dtype=float)
+        return texts_to_padded(get_tokenizer(), processed_texts), keyword_scores
+    corpus = load_corpus() if corpus is None else corpus
+    return corpus.sequences, corpus.keyword_scores
+
+# Fungsi untuk membandingkan isi korpus dengan hasil preprocessing langsung pada teks yang sama
+def check(corpus, data_path=DATASET_PATH, text_field='full_text', limit=2000):
+    corpus = corpus.head(limit)
+    texts = load_texts(data_path, text_field, len(corpus))
+    keywords = check_sentiment_keywords_batch(texts)
+    processed_texts, _ = preprocess_texts(texts)
+    return {
+        'rows': len(corpus),
+        'sequences_equal': bool(np.array_equal(corpus.sequences, texts_to_padded(get_tokenizer(), processed_texts))),
+        'keyword_counts_equal': bool(np.array_equal(
+            corpus.keyword_counts,
+            np.array([[len(positive), len(negative)] for positive, negative in
+                      zip(keywords['positive_matches'], keywords['negative_matches'])], dtype=np.int32).reshape(-1, 2)
+        )),
+        'keyword_scores_equal': bool(np.array_equal(corpus.keyword_scores, keywords['keyword_score'])),
+    }
+
+# Fungsi ringkasan skor model dari korpus: proporsi label positif (skor model saja dan gabungan)
+# serta kesesuaian label gabungan antar model
+def score_report(corpus, model_types, batch_size=1024):
+    report = {'rows': len(corpus), 'models': {}, 'label_agreement': {}}
+    labels = {}
+    for model_type in model_types:
+        if not model_files_available(model_type):
+            continue
+        start = time.perf_counter()
+        scores = np.asarray(corpus.model_scores(model_type, batch_size), dtype=float)
+        labels[model_type] = combine_scores(scores, corpus.keyword_scores, model_type) >= get_blend(model_type)[2]
+        report['models'][model_type] = {
+            'model_positive_share': float(np.mean(scores >= SENTIMENT_THRESHOLD)) if len(scores) else 0.0,
+            'positive_share': float(np.mean(labels[model_type])) if len(scores) else 0.0,
+            'seconds': time.perf_counter() - start,
+        }
+    names = list(labels)
+    for i, first in enumerate(names):
+        for second in names[i + 1:]:
+            report['label_agreement'][f'{first}/{second}'] = \
+                float(np.mean(labels[first] == labels[second])) if len(corpus) else 1.0
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.corpus',
+        description="Bangun dan pakai korpus ter-encode (sequence, kata kunci) yang dibuka dengan memory map."
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help="Bangun korpus jika belum ada atau kedaluwarsa")
+    build_parser.add_argument('--force', action='store_true', help="Bangun ulang walaupun korpus masih berlaku")
+    build_parser.add_argument('--workers', type=int, default=None,
+                              help="Jumlah proses preprocessing (default: satu proses)")
+    check_parser = subparsers.add_parser('check', help="Cek korpus masih berlaku dan sama dengan preprocessing langsung")
+    check_parser.add_argument('--limit', type=int, default=2000,
+                              help="Jumlah baris yang dibandingkan (default: 2000)")
+    score_parser = subparsers.add_parser('score', help="Skor model dari korpus (di-cache per fingerprint model)")
+    score_parser.add_argument('--models', default=','.join(MODEL_TYPES),
+                              help="Algoritma yang dipakai, dipisah koma (default: semua)")
+    score_parser.add_argument('--limit', type=int, default=None, help="Jumlah baris maksimum")
+    score_parser.add_argument('--batch-size', type=int, default=1024, help="Ukuran batch prediksi (default: 1024)")
+    for subparser in (build_parser, check_parser, score_parser):
+        subparser.add_argument('--data', default=DATASET_PATH, help="File CSV sumber")
+        subparser.add_argument('--text-field', default='full_text', help="Kolom teks (default: full_text)")
+    args = parser.parse_args(argv)
+
+    corpus_dir = corpus_path_for(args.data, args.text_field)
+    if args.command == 'check':
+        reasons = stale_reasons(read_manifest(corpus_dir), current_fingerprints(args.data, args.text_field))
+        report = {'corpus': corpus_dir, 'stale': reasons}
+        if not reasons:
+            report.update(check(EncodedCorpus.open(corpus_dir), args.data, args.text_field, args.limit))
+        print(json.dumps(report, indent=2))
+        if reasons or not all(report[key] for key in ('sequences_equal', 'keyword_counts_equal',
+                                                      'keyword_scores_equal')):
+            sys.exit(1)
+        return
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        corpus = load_corpus(args.data, args.text_field, workers=args.workers, rebuild=args.force)
+        print(json.dumps({'corpus': corpus.path, 'rows': len(corpus),
+                          'build_seconds': corpus.manifest['build_seconds'],
+                          'seconds': round(time.perf_counter() - start, 3)}, indent=2))
+        return
+
+    model_types = [name.strip() for name in args.models.split(',') if name.strip()]
+    unknown = [model_type for model_type in model_types if model_type not in MODEL_TYPES]
+    if unknown:
+        parser.error(f"Model type tidak dikenali: {', '.join(unknown)}")
+    corpus = load_corpus(args.data, args.text_field).head(args.limit)
+    print(json.dumps(score_report(corpus, model_types, args.batch_size), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,487 @@
+# Mesin analisis sentimen tanpa Streamlit.
+# Modul ini bisa diimpor oleh aplikasi web, CLI, maupun job batch. TensorFlow,
+# Sastrawi dan NLTK baru diimpor saat pertama kali dibutuhkan agar proses yang
+# hanya memakai analisis kata kunci tetap cepat dijalankan.
+import functools
+import json
+import logging
+import os
+import pickle
+import re
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Direktori root proyek (tempat folder model/ dan tokenizer.pickle berada)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Lokasi file model untuk setiap algoritma
+MODEL_TYPES = ["LSTM", "BI-LSTM", "GRU"]
+MODEL_PATHS = {
+    "LSTM": os.path.join(BASE_DIR, 'model', 'model_LSTM.h5'),
+    "BI-LSTM": os.path.join(BASE_DIR, 'model', 'model_BI_LSTM.h5'),
+    "GRU": os.path.join(BASE_DIR, 'model', 'model_GRU.h5')
+}
+TOKENIZER_PATH = os.path.join(BASE_DIR, 'tokenizer.pickle')
+
+# Dataset tweet bawaan (kolom full_text)
+DATASET_PATH = os.path.join(BASE_DIR, 'dataset', 'dataset_10k.csv')
+
+# Backend inferensi: "keras" (file .h5) atau "tflite" (hasil `python -m sentimen.lite convert`)
+MODEL_BACKENDS = ["keras", "tflite"]
+MODEL_BACKEND = os.environ.get('SENTIMEN_MODEL_BACKEND', 'keras').lower()
+LITE_MODEL_PATHS = {model_type: os.path.splitext(path)[0] + '.tflite' for model_type, path in MODEL_PATHS.items()}
+
+# Panjang sequence input model
+MAX_SEQUENCE_LENGTH = 100
+
+# Padding input model Keras: "fixed" (selalu MAX_SEQUENCE_LENGTH), "bucket" (dikelompokkan per
+# bucket panjang, di-padding sampai lebar bucket) atau "mask" (bucket + Embedding mask_zero).
+# Skor mode bucket/mask sedikit berbeda dari fixed; cek dengan `python -m sentimen.bucketing`.
+PADDING_MODES = ["fixed", "bucket", "mask"]
+PADDING_MODE = os.environ.get('SENTIMEN_DYNAMIC_PADDING', 'fixed').lower()
+BUCKET_BOUNDARIES = (8, 16, 32, 64, MAX_SEQUENCE_LENGTH)
+
+# Bobot gabungan bawaan hasil model dan kata kunci, serta ambang batas sentimen positif
+MODEL_WEIGHT = 0.3
+KEYWORD_WEIGHT = 0.7
+SENTIMENT_THRESHOLD = 0.5
+
+# Hasil kalibrasi bobot dan ambang per model pada korpus berlabel (`python -m sentimen.calibration
+# --save`). Model yang dikalibrasi memakai nilainya sendiri (lihat get_blend); model lain dan mode
+# ensemble tetap memakai bobot bawaan di atas. SENTIMEN_CALIBRATION="" menonaktifkan.
+CALIBRATION_PATH = os.environ.get('SENTIMEN_CALIBRATION', os.path.join(BASE_DIR, 'calibration.json'))
+
+# Fungsi untuk membaca bobot gabungan dan ambang hasil kalibrasi per model
+# ({model_type: {'model_weight', 'keyword_weight', 'threshold'}}, kosong jika tidak ada atau rusak)
+def load_calibration(path=CALIBRATION_PATH):
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding='utf-8') as handle:
+            calibration = json.load(handle)
+        # Format lama: satu konfigurasi dengan model_type, hanya berlaku untuk model itu
+        models = calibration['models'] if 'models' in calibration else {calibration['model_type']: calibration}
+        return {model_type: {key: float(values[key]) for key in ('model_weight', 'keyword_weight', 'threshold')}
+                for model_type, values in models.items() if model_type in MODEL_TYPES}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        logger.warning("File kalibrasi '%s' tidak dapat dibaca, memakai bobot bawaan: %s", path, e)
+        return {}
+
+CALIBRATION = load_calibration()
+
+# Fungsi bobot model, bobot kata kunci dan ambang untuk satu model: hasil kalibrasi model itu,
+# atau bobot bawaan untuk model yang tidak dikalibrasi, mode ensemble dan analisis kata kunci saja
+def get_blend(model_type=None):
+    calibration = CALIBRATION.get(model_type)
+    if calibration is None:
+        return MODEL_WEIGHT, KEYWORD_WEIGHT, SENTIMENT_THRESHOLD
+    return calibration['model_weight'], calibration['keyword_weight'], calibration['threshold']
+
+# Fungsi penanda bobot dan ambang satu model (untuk checkpoint ingest dan versi model di store)
+def blend_signature(model_type=None):
+    return ','.join(f'{value:g}' for value in get_blend(model_type))
+
+# Mode cascade: kata kunci dihitung dulu dan model hanya dijalankan jika masih bisa mengubah
+# label akhir (aktif jika SENTIMEN_CASCADE=1). Teks yang dilewati diberi skor model netral
+# CASCADE_NEUTRAL_SCORE untuk skor gabungan; labelnya sama untuk skor model berapa pun.
+CASCADE_ENABLED = os.environ.get('SENTIMEN_CASCADE', '') == '1'
+CASCADE_NEUTRAL_SCORE = 0.5
+
+# Daftar kata positif dan negatif
+POSITIVE_WORDS = [
+    "dukung", "kuat", "cerah", "meningkat", "sehat", "cerdas",
+    "penting", "damping", "senang", "terima kasih", "bisa",
+    "lahap", "baik", "mantap", "membantu"
+]
+
+NEGATIVE_WORDS = [
+    "gila", "najis", "mending", "jajan", "tentang", "tidak",
+    "ketimbang", "bukan", "menghina", "belum", "tega", "malah",
+    "sakit", "mubazir", "tolol", "korupsi", "bajingan", "kasian",
+    "persetan", "tai", "sialan", "kasihan", "anjing", "goblok",
+    "ironis", "konyol", "mampus", "bangsat","buruk"
+]
+
+# Fungsi untuk mengambil pencocok kata kunci bersama (leksikon bawaan atau dari file)
+@functools.lru_cache(maxsize=None)
+def get_keyword_matcher():
+    from .keywords import KeywordMatcher
+    positive_path = os.environ.get('SENTIMEN_POSITIVE_LEXICON')
+    negative_path = os.environ.get('SENTIMEN_NEGATIVE_LEXICON')
+    if positive_path and negative_path:
+        return KeywordMatcher.from_files(positive_path, negative_path)
+    return KeywordMatcher(POSITIVE_WORDS, NEGATIVE_WORDS)
+
+# Fungsi untuk memeriksa kata-kata kunci dalam teks
+def check_sentiment_keywords(text):
+    # Cek kata-kata positif dan negatif (dengan batas kata)
+    positive_matches, negative_matches, positive_weight, negative_weight = get_keyword_matcher().match(text)
+
+    # Tentukan sentimen berdasarkan bobot kata yang cocok (bobot default 1 = jumlah kata)
+    return {
+        'positive_count': len(positive_matches),
+        'negative_count': len(negative_matches),
+        'positive_matches': positive_matches,
+        'negative_matches': negative_matches,
+        'keyword_sentiment': keyword_sentiment_label(positive_weight, negative_weight),
+        'keyword_score': calculate_keyword_score(positive_weight, negative_weight)
+    }
+
+# Fungsi untuk menghitung skor berdasarkan jumlah kata positif dan negatif
+def calculate_keyword_score(positive_count, negative_count):
+    total = positive_count + negative_count
+    if total == 0:
+        return 0.5  # Netral jika tidak ada kata kunci yang cocok
+
+    # Konversi ke skor 0-1
+    return positive_count / total
+
+# Fungsi untuk menentukan label sentimen dari jumlah kata kunci
+def keyword_sentiment_label(positive_count, negative_count):
+    if positive_count > negative_count:
+        return 'Positif'
+    if negative_count > positive_count:
+        return 'Negatif'
+    return 'Netral'
+
+# Fungsi pengecekan kata kunci untuk banyak teks sekaligus
+def check_sentiment_keywords_batch(texts):
+    results = get_keyword_matcher().match_batch(texts)
+    positive_weight = results.pop('positive_weight')
+    negative_weight = results.pop('negative_weight')
+    total = positive_weight + negative_weight
+
+    # Skor 0-1, netral (0.5) jika tidak ada kata kunci yang cocok
+    results['keyword_sentiment'] = np.where(positive_weight > negative_weight, 'Positif',
+                                            np.where(negative_weight > positive_weight, 'Negatif', 'Netral'))
+    results['keyword_score'] = np.divide(positive_weight, total, out=np.full(len(total), 0.5), where=total > 0)
+    return results
+
+# Fungsi untuk membaca kolom teks dari dataset CSV
+def load_texts(path=DATASET_PATH, text_column='full_text', limit=None):
+    import pandas as pd
+    data = pd.read_csv(path, usecols=[text_column], nrows=limit)
+    return data[text_column].fillna('').astype(object).map(str).tolist()
+
+# Fungsi untuk mengimpor NLTK sekali, mendaftarkan folder nltk_data dan mengecek resource
+@functools.lru_cache(maxsize=None)
+def _nltk():
+    from .nltk_setup import configure_nltk_data_path, ensure_nltk_resources
+    nltk = configure_nltk_data_path()
+    ensure_nltk_resources()
+    return nltk
+
+# Bernilai False setelah word_tokenize gagal karena resource NLTK tidak ada, agar setiap teks
+# berikutnya langsung memakai fallback tanpa mencoba (dan gagal) mencari resource lagi
+_nltk_tokenizer_available = True
+
+# Fallback tokenizer yang lebih robust
+def robust_tokenizer(text):
+    global _nltk_tokenizer_available
+    try:
+        # Coba gunakan word_tokenize standar
+        if not _nltk_tokenizer_available:
+            raise LookupError("Resource tokenizer NLTK tidak tersedia")
+        from nltk.tokenize import word_tokenize
+        _nltk()
+        return word_tokenize(text)
+    except Exception as e:
+        if isinstance(e, LookupError):
+            _nltk_tokenizer_available = False
+        try:
+            # Fallback 1: Split sederhana dengan regex
+            return re.findall(r"\w+", text.lower())
+        except:
+            # Fallback 2: Split paling dasar
+            return text.lower().split()
+
+# Gunakan tokenizer yang aman
+safe_word_tokenize = robust_tokenizer
+
+# Fungsi untuk membersihkan teks (lowercase, URL, username, hashtag, tanda baca, angka)
+def clean_text(text):
+    from .normalizer import normalize_text
+    return normalize_text(text)
+
+# Fungsi untuk memuat daftar stopwords
+def get_stop_words():
+    nltk = _nltk()
+    from nltk.corpus import stopwords
+    return set(stopwords.words('indonesian')) if 'stopwords' in nltk.data.path else set()
+
+# Fungsi untuk mengambil stemmer Sastrawi bersama (satu per proses, dengan cache kata dasar)
+def get_cached_stemmer():
+    from .stemming import get_stem_cache
+    return get_stem_cache()
+
+# Fungsi tokenisasi, hapus stopwords dan stemming untuk teks yang sudah dibersihkan
+def tokenize_and_stem(text, stop_words=None, stemmer=None):
+    # Tokenisasi dengan fallback
+    tokens = safe_word_tokenize(text)
+
+    try:
+        # Hapus stopwords (dengan fallback jika stopwords tidak tersedia)
+        if stop_words is None:
+            stop_words = get_stop_words()
+        tokens = [word for word in tokens if word not in stop_words]
+    except:
+        tokens = tokens  # Jika stopwords gagal, gunakan tokens asli
+
+    # Stemming dengan Sastrawi
+    try:
+        if stemmer is None:
+            stemmer = get_cached_stemmer()
+        tokens = [stemmer.stem(word) for word in tokens]
+    except:
+        tokens = tokens  # Jika stemming gagal, gunakan tokens asli
+
+    return tokens
+
+# Fungsi preprocessing teks
+def preprocess_text(text):
+    try:
+        tokens = tokenize_and_stem(clean_text(text))
+
+        # Gabungkan kembali
+        processed_text = ' '.join(tokens)
+        return processed_text, tokens
+
+    except Exception as e:
+        logger.error("Error dalam preprocessing teks: %s", e)
+        return text.lower(), text.lower().split()  # Fallback paling dasar
+
+# Stemmer pengganti jika Sastrawi tidak tersedia (kata dikembalikan apa adanya)
+class _NoStemmer:
+    @staticmethod
+    def stem(word):
+        return word
+
+# Fungsi preprocessing untuk banyak teks sekaligus
+def preprocess_texts(texts):
+    # Stopwords dan stemmer cukup disiapkan sekali untuk satu batch
+    try:
+        stop_words = get_stop_words()
+    except:
+        stop_words = set()
+    try:
+        stemmer = get_cached_stemmer()
+    except:
+        stemmer = _NoStemmer()
+
+    from .normalizer import normalize_texts
+    processed_texts = []
+    token_lists = []
+    for text in normalize_texts(texts):
+        tokens = tokenize_and_stem(text, stop_words, stemmer)
+        processed_texts.append(' '.join(tokens))
+        token_lists.append(tokens)
+
+    return processed_texts, token_lists
+
+# Fungsi untuk mengambil lokasi file model sesuai backend yang dipakai
+def get_model_path(model_type, backend=None):
+    backend = backend or MODEL_BACKEND
+    if backend not in MODEL_BACKENDS:
+        raise ValueError(f"Backend model {backend} tidak dikenali.")
+    return (LITE_MODEL_PATHS if backend == "tflite" else MODEL_PATHS)[model_type]
+
+# Fungsi untuk mengecek apakah file model dan tokenizer tersedia
+def model_files_available(model_type):
+    return os.path.exists(get_model_path(model_type)) and os.path.exists(TOKENIZER_PATH)
+
+# Fungsi penanda mode padding yang mengubah skor model (kosong untuk padding tetap).
+# Model .tflite berbentuk input statis sehingga selalu memakai padding tetap.
+def padding_signature(backend=None):
+    if (backend or MODEL_BACKEND) == "tflite" or PADDING_MODE == "fixed":
+        return ''
+    return f"{PADDING_MODE}:{','.join(str(width) for width in BUCKET_BOUNDARIES)}"
+
+# Fungsi untuk memuat model (di-cache per proses).
+# Backend tflite mengembalikan LiteModel dan padding dinamis mengembalikan BucketedModel,
+# keduanya dengan antarmuka predict/predict_on_batch yang sama.
+@functools.lru_cache(maxsize=None)
+def load_sentiment_model(model_type="BI-LSTM", backend=None):
+    if model_type not in MODEL_PATHS:
+        raise ValueError(f"Model type {model_type} tidak dikenali.")
+    if PADDING_MODE not in PADDING_MODES:
+        raise ValueError(f"Mode padding {PADDING_MODE} tidak dikenali.")
+    model_path = get_model_path(model_type, backend)
+    if model_path.endswith('.tflite'):
+        from .lite import LiteModel
+        return LiteModel(model_path)
+    from keras.models import load_model
+    model = load_model(model_path)
+    if PADDING_MODE != "fixed":
+        from .bucketing import BucketedModel
+        return BucketedModel(model, mask=PADDING_MODE == "mask")
+    return model
+
+# Fungsi untuk memuat tokenizer (di-cache per proses). Yang dipakai adalah vocabulary ringkas
+# tokenizer.vocab (lihat sentimen.vocab, dibuat ulang otomatis jika tokenizer.pickle berubah)
+# yang dimuat tanpa TensorFlow; Tokenizer Keras dari pickle hanya dipakai jika konversi gagal.
+@functools.lru_cache(maxsize=None)
+def get_tokenizer(path=TOKENIZER_PATH):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File tokenizer '{path}' tidak ditemukan.")
+    from .vocab import load_vocabulary
+    try:
+        return load_vocabulary(path)
+    except ValueError as e:
+        logger.warning("Vocabulary ringkas tidak dapat dibuat, memakai tokenizer.pickle: %s", e)
+    with open(path, 'rb') as handle:
+        return pickle.load(handle)
+
+# Fungsi padding sequence token menjadi matriks input model.
+# Sama dengan pad_sequences Keras (padding dan truncating 'post', nilai 0, int32)
+# tetapi tanpa mengimpor TensorFlow.
+def pad_token_sequences(sequences):
+    padded = np.zeros((len(sequences), MAX_SEQUENCE_LENGTH), dtype=np.int32)
+    for i, sequence in enumerate(sequences):
+        sequence = sequence[:MAX_SEQUENCE_LENGTH]
+        padded[i, :len(sequence)] = sequence
+    return padded
+
+# Fungsi tokenisasi dan padding teks hasil preprocessing menjadi input model
+def texts_to_padded(tokenizer, processed_texts):
+    if hasattr(tokenizer, 'encode_padded'):
+        return tokenizer.encode_padded(list(processed_texts))
+    return pad_token_sequences(tokenizer.texts_to_sequences(list(processed_texts)))
+
+# Fungsi prediksi model untuk matriks sequence yang sudah di-padding.
+# Input kecil (satu batch) memakai predict_on_batch yang jauh lebih ringan dari model.predict.
+def predict_padded(model, padded_sequences, batch_size=1024):
+    if len(padded_sequences) <= batch_size:
+        return np.asarray(model.predict_on_batch(padded_sequences))[:, 0]
+    predictions = model.predict(padded_sequences, batch_size=batch_size, verbose=0)
+    return predictions[:, 0]
+
+# Fungsi untuk menggabungkan skor model dan skor kata kunci (bobot sesuai model_type)
+def combine_scores(model_score, keyword_score, model_type=None):
+    # Bobot yang lebih besar untuk hasil analisis kata kunci
+    model_weight, keyword_weight, _ = get_blend(model_type)
+    return model_weight * model_score + keyword_weight * keyword_score
+
+# Fungsi untuk menentukan label sentimen dari skor gabungan (ambang sesuai model_type)
+def sentiment_label(combined_score, model_type=None):
+    return "Positif" if combined_score >= get_blend(model_type)[2] else "Negatif"
+
+# Fungsi mode cascade: True untuk teks yang labelnya masih bergantung pada skor model.
+# Skor model berada di 0-1, sehingga skor gabungan berada di antara combine_scores(0, k) dan
+# combine_scores(1, k). Jika kedua batas berada di sisi ambang yang sama, model dilewati.
+def cascade_needs_model(keyword_scores, model_type=None):
+    keyword_scores = np.asarray(keyword_scores, dtype=float)
+    threshold = get_blend(model_type)[2]
+    return (combine_scores(0.0, keyword_scores, model_type) < threshold) & \
+        (combine_scores(1.0, keyword_scores, model_type) >= threshold)
+
+# Fungsi untuk mengembalikan hasil prediksi subset teks (needs_model) ke panjang semula.
+# Teks yang dilewati mendapat processed_text None, skor model NaN dan cluster_id -1.
+def expand_cascade(needs_model, processed_texts, model_scores, cluster_ids=None):
+    rows = np.flatnonzero(needs_model)
+    full_processed = [None] * len(needs_model)
+    for row, processed_text in zip(rows.tolist(), processed_texts):
+        full_processed[row] = processed_text
+    full_scores = np.full(len(needs_model), np.nan)
+    full_scores[rows] = model_scores
+    if cluster_ids is not None:
+        full_ids = np.full(len(needs_model), -1, dtype=np.int64)
+        full_ids[rows] = cluster_ids
+        cluster_ids = full_ids
+    return full_processed, full_scores, cluster_ids
+
+# Fungsi untuk menyusun hasil per teks dari skor kata kunci dan skor model (opsional).
+# cluster_ids (id klaster hampir-duplikat per teks) ikut ditulis jika diberikan.
+# model_skipped (mode cascade) menandai teks yang tidak dikirim ke model.
+def build_results(keyword_results, processed_texts=None, model_scores=None, model_type=None, cluster_ids=None,
+                  model_skipped=None):
+    results = []
+    for i in range(len(keyword_results['keyword_score'])):
+        keyword_score = float(keyword_results['keyword_score'][i])
+        if model_skipped is not None and model_skipped[i]:
+            # Label sudah ditentukan kata kunci
+            model_score = None
+            combined_score = combine_scores(CASCADE_NEUTRAL_SCORE, keyword_score, model_type)
+            sentiment = sentiment_label(combined_score, model_type)
+        elif model_scores is not None:
+            model_score = float(model_scores[i])
+            combined_score = combine_scores(model_score, keyword_score, model_type)
+            sentiment = sentiment_label(combined_score, model_type)
+        else:
+            # Gunakan hasil analisis kata kunci saja
+            model_score = None
+            combined_score = keyword_score
+            sentiment = str(keyword_results['keyword_sentiment'][i])
+
+        results.append({
+            'sentiment': sentiment,
+            'combined_score': combined_score,
+            'model_score': model_score,
+            'keyword_score': keyword_score,
+            'keyword_sentiment': str(keyword_results['keyword_sentiment'][i]),
+            'positive_matches': keyword_results['positive_matches'][i],
+            'negative_matches': keyword_results['negative_matches'][i],
+            'processed_text': processed_texts[i] if processed_texts is not None else None,
+            'model_type': model_type if model_scores is not None and model_score is not None else None
+        })
+        if cluster_ids is not None:
+            results[-1]['cluster_id'] = int(cluster_ids[i])
+        if model_skipped is not None:
+            results[-1]['model_skipped'] = bool(model_skipped[i])
+    return results
+
+# Fungsi untuk menganalisis banyak teks sekaligus.
+# preprocess dapat diganti, misalnya dengan PreprocessPool.preprocess_texts untuk job besar.
+# Dengan cache (PredictionCache), teks yang pernah diprediksi tidak di-preprocess ulang.
+# Dengan near_duplicates (NearDuplicateIndex), model hanya dijalankan untuk representatif
+# klaster hampir-duplikat dan hasil berisi cluster_id.
+# Dengan cascade (default CASCADE_ENABLED), teks yang labelnya sudah pasti dari kata kunci
+# tidak di-preprocess dan tidak diprediksi; hasil berisi model_skipped.
+def score_texts(texts, model_type="BI-LSTM", batch_size=1024, use_model=True, preprocess=None, cache=None,
+                near_duplicates=None, cascade=None):
+    if cache is not None and near_duplicates is not None:
+        raise ValueError("Cache prediksi dan deteksi hampir-duplikat tidak dapat dipakai bersamaan.")
+    texts = ['' if text is None else str(text) for text in texts]
+    keyword_results = check_sentiment_keywords_batch(texts)
+
+    if use_model and texts and model_files_available(model_type):
+        cascade = CASCADE_ENABLED if cascade is None else cascade
+        needs_model = cascade_needs_model(keyword_results['keyword_score'], model_type) if cascade else None
+        selected = texts if needs_model is None else [text for text, needed in zip(texts, needs_model) if needed]
+        processed_texts, model_scores, cluster_ids = _predict_texts(
+            selected, model_type, batch_size, preprocess, cache, near_duplicates
+        )
+        if needs_model is None:
+            return build_results(keyword_results, processed_texts, model_scores, model_type, cluster_ids)
+        processed_texts, model_scores, cluster_ids = expand_cascade(
+            needs_model, processed_texts, model_scores, cluster_ids
+        )
+        return build_results(keyword_results, processed_texts, model_scores, model_type, cluster_ids,
+                             model_skipped=~needs_model)
+
+    return build_results(keyword_results)
+
+# Fungsi preprocessing dan prediksi model untuk score_texts.
+# Mengembalikan teks hasil preprocessing, skor model dan cluster_id (None tanpa near_duplicates).
+def _predict_texts(texts, model_type, batch_size, preprocess=None, cache=None, near_duplicates=None):
+    if not texts:
+        return [], np.zeros(0), np.zeros(0, dtype=np.int64) if near_duplicates is not None else None
+    if cache is not None:
+        from .prediction_cache import predict_with_cache
+        processed_texts, model_scores = predict_with_cache(
+            texts, model_type, cache, batch_size=batch_size, preprocess=preprocess
+        )
+        return processed_texts, model_scores, None
+
+    model = load_sentiment_model(model_type)
+    tokenizer = get_tokenizer()
+    processed_texts, _ = (preprocess or preprocess_texts)(texts)
+    if near_duplicates is not None:
+        model_scores, cluster_ids = near_duplicates.predict(
+            processed_texts, lambda representatives: predict_padded(
+                model, texts_to_padded(tokenizer, representatives), batch_size)
+        )
+        return processed_texts, model_scores, cluster_ids
+    model_scores = predict_padded(model, texts_to_padded(tokenizer, processed_texts), batch_size)
+    return processed_texts, model_scores, None
@@ -0,0 +1,66 @@
+# Preload model dan mode ensemble (LSTM, BI-LSTM, GRU).
+# Semua model dapat dimuat dan dipanaskan (warm-up) saat start agar tidak ada jeda
+# beberapa detik pada permintaan pertama setelah pengguna mengganti model. Mode ensemble
+# menjalankan ketiga model secara paralel (satu thread per model) pada batch yang sama.
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .engine import (
+    MAX_SEQUENCE_LENGTH,
+    MODEL_TYPES,
+    get_model_path,
+    get_tokenizer,
+    load_sentiment_model,
+    model_files_available,
+    predict_padded,
+)
+
+# Fungsi untuk memanaskan model dengan batch dummy (membangun graph prediksi lebih awal).
+# Dipanaskan untuk satu teks (analisis tunggal) dan batch penuh (analisis batch);
+# model dengan padding dinamis (BucketedModel) dipanaskan untuk setiap lebar bucket.
+def warm_up_model(model, batch_sizes=(1, 32)):
+    for batch_size in batch_sizes:
+        for length in getattr(model, 'boundaries', (1,)):
+            dummy_batch = np.zeros((batch_size, MAX_SEQUENCE_LENGTH), dtype=np.int32)
+            dummy_batch[:, :length] = 1
+            predict_padded(model, dummy_batch, batch_size)
+
+# Fungsi untuk memuat (dan memanaskan) semua model yang filenya tersedia.
+# Mengembalikan waktu muat per model dalam detik.
+def preload_models(model_types=None, warm_up=True):
+    timings = {}
+    for model_type in model_types or MODEL_TYPES:
+        if not model_files_available(model_type):
+            continue
+        start = time.perf_counter()
+        model = load_sentiment_model(model_type)
+        if warm_up:
+            warm_up_model(model)
+        timings[model_type] = time.perf_counter() - start
+    get_tokenizer()
+    return timings
+
+# Fungsi prediksi ensemble: semua model dijalankan paralel pada matriks input yang sama.
+# Mengembalikan skor per model, skor rata-rata dan latensi per model (detik).
+def ensemble_predict(padded_sequences, model_types=None, batch_size=1024):
+    model_types = [model_type for model_type in (model_types or MODEL_TYPES) if model_files_available(model_type)]
+    if not model_types:
+        raise FileNotFoundError(f"Tidak ada file model yang tersedia: {', '.join(get_model_path(name) for name in MODEL_TYPES)}")
+
+    def run(model_type):
+        model = load_sentiment_model(model_type)
+        start = time.perf_counter()
+        scores = predict_padded(model, padded_sequences, batch_size)
+        return model_type, scores, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=len(model_types)) as executor:
+        outputs = list(executor.map(run, model_types))
+
+    scores = {model_type: model_scores for model_type, model_scores, _ in outputs}
+    return {
+        'scores': scores,
+        'mean': np.mean(list(scores.values()), axis=0),
+        'latency': {model_type: latency for model_type, _, latency in outputs}
+    }
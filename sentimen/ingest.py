@@ -0,0 +1,393 @@
+# Ingest streaming untuk file ekspor tweet berukuran besar (skema sama dengan dataset_10k.csv).
+# File dibaca per chunk (pandas chunksize) hanya untuk kolom yang dipilih, lalu dialirkan
+# melalui tiga tahap yang berjalan bersamaan dengan antrean terbatas:
+#   baca chunk -> kata kunci + preprocessing + padding -> prediksi model + tulis hasil
+# Memori puncak ditentukan oleh ukuran chunk, bukan ukuran file. Setelah setiap chunk ditulis,
+# checkpoint disimpan sehingga run yang terputus dapat dilanjutkan dengan --resume.
+#
+#   python -m sentimen.ingest ekspor_2025_01.csv --output hasil_2025_01.csv --model GRU
+#   python -m sentimen.ingest ekspor_2025_01.csv --output hasil_2025_01.csv --model GRU --resume
+#   python -m sentimen.ingest ekspor_2025_01.csv --store results --model GRU   # result store Parquet
+import argparse
+import csv
+import hashlib
+import json
+import os
+import queue
+import resource
+import sys
+import threading
+import time
+
+import numpy as np
+
+from .cli import build_rows
+from .engine import (
+    CASCADE_ENABLED,
+    MODEL_TYPES,
+    build_results,
+    cascade_needs_model,
+    check_sentiment_keywords_batch,
+    expand_cascade,
+    get_blend,
+    get_tokenizer,
+    load_sentiment_model,
+    model_files_available,
+    predict_padded,
+    preprocess_texts,
+    texts_to_padded,
+)
+
+# Kolom yang dibaca dari file ekspor (kolom yang tidak ada di file diabaikan)
+DEFAULT_COLUMNS = ['id_str', 'full_text', 'created_at', 'lang']
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Jumlah chunk maksimum yang menunggu di antara dua tahap
+PIPELINE_DEPTH = 2
+
+_END = object()
+
+# Fungsi untuk membaca file CSV per chunk (semua kolom sebagai teks, id tidak diubah menjadi angka)
+def iter_csv_chunks(path, columns=None, chunk_size=DEFAULT_CHUNK_SIZE, skip_chunks=0):
+    import pandas as pd
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [column for column in (columns or DEFAULT_COLUMNS) if column in header]
+    reader = pd.read_csv(path, usecols=usecols, dtype=str, keep_default_na=False, chunksize=chunk_size)
+    with reader:
+        for i, chunk in enumerate(reader):
+            if i >= skip_chunks:
+                yield chunk[usecols]
+
+# Fungsi untuk menjalankan iterator di thread terpisah dengan antrean terbatas (backpressure).
+# Exception dari thread dilempar ulang di thread pemanggil.
+def prefetch(iterator, depth=PIPELINE_DEPTH):
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def run():
+        try:
+            for item in iterator:
+                while not stop.is_set():
+                    try:
+                        items.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+                if stop.is_set():
+                    return
+            items.put(_END)
+        except BaseException as e:
+            items.put(e)
+
+    thread = threading.Thread(target=run, name='sentimen-ingest-stage', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+# Fungsi untuk mengukur memori puncak proses (MB)
+def peak_rss_mb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss dalam KB di Linux dan byte di macOS
+    return usage / (1024 * 1024) if sys.platform == 'darwin' else usage / 1024
+
+# Checkpoint run: jumlah chunk selesai dan ukuran file output setelah chunk terakhir ditulis
+class Checkpoint:
+    def __init__(self, path, settings):
+        self.path = path
+        self.settings = settings
+        self.chunks_done = 0
+        self.rows_done = 0
+        self.output_bytes = 0
+
+    # Identitas file input dan pengaturan yang harus sama agar run dapat dilanjutkan
+    @staticmethod
+    def describe(input_path, **options):
+        stat = os.stat(input_path)
+        return dict(options, input=os.path.abspath(input_path), input_size=stat.st_size,
+                    input_mtime_ns=stat.st_mtime_ns)
+
+    def load(self):
+        with open(self.path, encoding='utf-8') as handle:
+            state = json.load(handle)
+        if state['settings'] != self.settings:
+            raise ValueError(f"Checkpoint '{self.path}' dibuat untuk file input atau pengaturan yang berbeda.")
+        self.chunks_done = state['chunks_done']
+        self.rows_done = state['rows_done']
+        self.output_bytes = state['output_bytes']
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump({
+                'settings': self.settings,
+                'chunks_done': self.chunks_done,
+                'rows_done': self.rows_done,
+                'output_bytes': self.output_bytes
+            }, handle, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+# Penulis hasil CSV/JSONL yang dapat melanjutkan file yang sudah ada
+class ResultWriter:
+    def __init__(self, path, output_format, resume_bytes=0):
+        self.output_format = output_format
+        self.handle = open(path, 'r+' if resume_bytes else 'w', encoding='utf-8', newline='')
+        if resume_bytes:
+            # Buang baris yang ditulis setelah checkpoint terakhir (chunk yang belum selesai)
+            self.handle.truncate(resume_bytes)
+            self.handle.seek(resume_bytes)
+        self.header_written = bool(resume_bytes)
+        self.writer = None
+
+    def write(self, rows):
+        for row in rows:
+            if self.output_format == 'csv':
+                row['positive_matches'] = ', '.join(row['positive_matches'])
+                row['negative_matches'] = ', '.join(row['negative_matches'])
+                if self.writer is None:
+                    self.writer = csv.DictWriter(self.handle, fieldnames=list(row))
+                    if not self.header_written:
+                        self.writer.writeheader()
+                self.writer.writerow(row)
+            else:
+                self.handle.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self.handle.flush()
+        return self.handle.tell()
+
+    def close(self):
+        self.handle.close()
+
+# Tahap kedua: kata kunci, preprocessing dan padding untuk satu chunk.
+# Dengan near_duplicates, teks dikelompokkan ke klaster hampir-duplikat dan hanya
+# representatif klaster baru yang di-padding. Dengan cascade, hanya teks yang labelnya
+# masih bergantung pada model yang di-preprocess.
+def prepare_chunk(chunk, text_field, model_type, use_model, cache=None, preprocess=None, near_duplicates=None,
+                  cascade=False):
+    texts = chunk[text_field].tolist()
+    prepared = {'chunk': chunk, 'keywords': check_sentiment_keywords_batch(texts)}
+    if use_model and cascade:
+        needs_model = cascade_needs_model(prepared['keywords']['keyword_score'], model_type)
+        prepared['needs_model'] = needs_model
+        texts = [text for text, needed in zip(texts, needs_model) if needed]
+    if use_model:
+        if cache is not None:
+            from .prediction_cache import prepare_with_cache
+            prepared['cache'] = prepare_with_cache(texts, model_type, cache, preprocess)
+        else:
+            processed_texts, _ = (preprocess or preprocess_texts)(texts)
+            prepared['processed_texts'] = processed_texts
+            if near_duplicates is not None:
+                cluster_ids, new_clusters = near_duplicates.assign(processed_texts)
+                prepared['cluster_ids'] = cluster_ids
+                prepared['new_clusters'] = [cluster_id for cluster_id, _ in new_clusters]
+                processed_texts = [text for _, text in new_clusters]
+            prepared['padded'] = texts_to_padded(get_tokenizer(), processed_texts)
+    return prepared
+
+# Tahap ketiga: prediksi model untuk chunk yang sudah disiapkan, menghasilkan hasil per baris.
+# Chunk diprediksi berurutan, sehingga skor klaster dari chunk sebelumnya sudah tersedia.
+def predict_chunk(prepared, model_type, use_model, batch_size, cache=None, near_duplicates=None):
+    if not use_model:
+        return build_results(prepared['keywords'])
+
+    model = load_sentiment_model(model_type)
+    cluster_ids = None
+    if cache is not None:
+        from .prediction_cache import complete_with_cache
+        cached = prepared['cache']
+        scores = predict_padded(model, cached['padded'], batch_size) if cached['padded'] is not None else None
+        processed_texts, model_scores = complete_with_cache(cached, scores, cache)
+    elif near_duplicates is not None:
+        processed_texts = prepared['processed_texts']
+        if prepared['new_clusters']:
+            near_duplicates.set_scores(prepared['new_clusters'], predict_padded(model, prepared['padded'], batch_size))
+        cluster_ids = prepared['cluster_ids']
+        model_scores = near_duplicates.scores(cluster_ids)
+    else:
+        processed_texts = prepared['processed_texts']
+        model_scores = predict_padded(model, prepared['padded'], batch_size) if len(processed_texts) else np.zeros(0)
+
+    if 'needs_model' in prepared:
+        needs_model = prepared['needs_model']
+        processed_texts, model_scores, cluster_ids = expand_cascade(needs_model, processed_texts, model_scores,
+                                                                    cluster_ids)
+        return build_results(prepared['keywords'], processed_texts, model_scores, model_type, cluster_ids,
+                             model_skipped=~needs_model)
+    return build_results(prepared['keywords'], processed_texts, model_scores, model_type, cluster_ids)
+
+# Fungsi utama ingest streaming. Mengembalikan statistik run.
+# Hasil ditulis ke output_path (CSV/JSONL), ke result store Parquet (store_path), atau keduanya.
+# Indeks hampir-duplikat tidak disimpan di checkpoint: run yang dilanjutkan memulai klaster
+# baru, sehingga cluster_id hanya konsisten di dalam satu run.
+def run_ingest(input_path, output_path=None, model_type='BI-LSTM', output_format='csv', columns=None,
+               text_field='full_text', chunk_size=DEFAULT_CHUNK_SIZE, batch_size=1024, use_model=True,
+               resume=False, checkpoint_path=None, cache=None, preprocess=None, progress=None, store_path=None,
+               near_duplicates=None, cascade=False):
+    if output_path is None and store_path is None:
+        raise ValueError("output_path atau store_path harus diisi.")
+    if cache is not None and near_duplicates is not None:
+        raise ValueError("Cache prediksi dan deteksi hampir-duplikat tidak dapat dipakai bersamaan.")
+    columns = list(columns or DEFAULT_COLUMNS)
+    if text_field not in columns:
+        columns.append(text_field)
+    use_model = use_model and model_files_available(model_type)
+
+    settings = Checkpoint.describe(
+        input_path, output=os.path.abspath(output_path) if output_path else None,
+        store=os.path.abspath(store_path) if store_path else None, output_format=output_format,
+        columns=columns, text_field=text_field, chunk_size=chunk_size, model_type=model_type if use_model else None,
+        near_duplicates=near_duplicates.threshold if near_duplicates is not None and use_model else None,
+        cascade=bool(cascade and use_model), blend=list(get_blend(model_type if use_model else None))
+    )
+    # Nama file Parquet per chunk tetap untuk run yang sama, sehingga chunk yang ditulis ulang
+    # saat resume menimpa file lama dan tidak menggandakan baris
+    run_id = hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    if checkpoint_path is None:
+        checkpoint_path = output_path + '.checkpoint.json' if output_path else \
+            os.path.join(store_path, f'.ingest-{run_id}.checkpoint.json')
+    checkpoint = Checkpoint(checkpoint_path, settings)
+    if resume and os.path.exists(checkpoint.path):
+        checkpoint.load()
+
+    if store_path:
+        import pandas as pd
+        from .store import write_results as write_store
+        os.makedirs(store_path, exist_ok=True)
+    writer = ResultWriter(output_path, output_format, checkpoint.output_bytes) if output_path else None
+    start = time.perf_counter()
+    rows_this_run = model_skipped = 0
+    try:
+        chunks = prefetch(iter_csv_chunks(input_path, columns, chunk_size, checkpoint.chunks_done))
+        prepared_chunks = prefetch(
+            prepare_chunk(chunk, text_field, model_type, use_model, cache, preprocess, near_duplicates, cascade)
+            for chunk in chunks
+        )
+        for prepared in prepared_chunks:
+            results = predict_chunk(prepared, model_type, use_model, batch_size, cache, near_duplicates)
+            records = prepared['chunk'].to_dict('records')
+            keep_fields = [column for column in prepared['chunk'].columns if column != text_field]
+            rows = list(build_rows(records, results, keep_fields))
+            if store_path:
+                write_store(pd.DataFrame(rows), model_type if use_model else None, store_path,
+                            basename=f'ingest-{run_id}-{checkpoint.chunks_done:06d}')
+            if writer:
+                checkpoint.output_bytes = writer.write(rows)
+            checkpoint.chunks_done += 1
+            checkpoint.rows_done += len(records)
+            rows_this_run += len(records)
+            model_skipped += int(np.count_nonzero(~prepared['needs_model'])) if 'needs_model' in prepared else 0
+            checkpoint.save()
+
+            if progress:
+                elapsed = time.perf_counter() - start
+                progress(f"{checkpoint.rows_done:,} baris selesai, {rows_this_run / elapsed:,.0f} baris/detik, "
+                         f"memori puncak {peak_rss_mb():,.0f} MB")
+    finally:
+        if writer:
+            writer.close()
+
+    checkpoint.remove()
+    elapsed = time.perf_counter() - start
+    return {
+        'rows': checkpoint.rows_done,
+        'rows_this_run': rows_this_run,
+        'chunks': checkpoint.chunks_done,
+        'seconds': elapsed,
+        'rows_per_second': rows_this_run / elapsed if elapsed else 0.0,
+        'peak_rss_mb': peak_rss_mb(),
+        'model_used': use_model,
+        'model_skipped_fraction': model_skipped / rows_this_run if cascade and use_model and rows_this_run else None
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.ingest',
+        description="Analisis sentimen file ekspor tweet berukuran besar secara streaming per chunk."
+    )
+    parser.add_argument('input', help="File CSV input")
+    parser.add_argument('--output', default=None, help="File hasil (CSV/JSONL)")
+    parser.add_argument('--store', default=None,
+                        help="Direktori result store Parquet (dipartisi per hari created_at)")
+    parser.add_argument('--format', choices=['csv', 'jsonl'], default='csv', help="Format output (default: csv)")
+    parser.add_argument('--model', choices=MODEL_TYPES, default='BI-LSTM',
+                        help="Algoritma yang digunakan (default: BI-LSTM)")
+    parser.add_argument('--columns', default=','.join(DEFAULT_COLUMNS),
+                        help=f"Kolom yang dibaca, dipisah koma (default: {','.join(DEFAULT_COLUMNS)})")
+    parser.add_argument('--text-field', default='full_text', help="Kolom teks (default: full_text)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Jumlah baris per chunk (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--batch-size', type=int, default=1024,
+                        help="Ukuran batch prediksi model (default: 1024)")
+    parser.add_argument('--keywords-only', action='store_true',
+                        help="Hanya gunakan analisis kata kunci (tanpa memuat TensorFlow)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Jumlah proses untuk preprocessing paralel (default: 1)")
+    parser.add_argument('--cache', action='store_true',
+                        help="Gunakan cache prediksi (memori + SQLite) untuk teks berulang")
+    parser.add_argument('--near-duplicates', type=float, nargs='?', const=0.8, default=None, metavar='THRESHOLD',
+                        help="Prediksi sekali per klaster hampir-duplikat (MinHash/LSH, Jaccard >= THRESHOLD, "
+                             "default 0.8) dan tulis kolom cluster_id")
+    parser.add_argument('--cascade', action='store_true',
+                        help="Jalankan model hanya jika skornya masih bisa mengubah label hasil kata kunci "
+                             "(default: aktif jika SENTIMEN_CASCADE=1)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Lanjutkan run yang terputus dari checkpoint")
+    parser.add_argument('--checkpoint', default=None,
+                        help="Lokasi file checkpoint (default: <output>.checkpoint.json atau di direktori --store)")
+    args = parser.parse_args(argv)
+    if not args.output and not args.store:
+        parser.error("isi --output dan/atau --store")
+    if args.near_duplicates is not None and args.cache:
+        parser.error("--near-duplicates tidak dapat dipakai bersama --cache.")
+    if args.near_duplicates is not None and not 0.0 < args.near_duplicates <= 1.0:
+        parser.error("THRESHOLD --near-duplicates harus di antara 0 dan 1.")
+
+    if not args.keywords_only and not model_files_available(args.model):
+        print(f"Peringatan: file model {args.model} atau tokenizer tidak ditemukan. "
+              "Menggunakan analisis berdasarkan kata kunci saja.", file=sys.stderr)
+
+    cache = pool = near_duplicates = None
+    if args.cache and not args.keywords_only:
+        from .prediction_cache import get_prediction_cache
+        cache = get_prediction_cache()
+    if args.near_duplicates is not None and not args.keywords_only:
+        from .near_duplicates import NearDuplicateIndex
+        near_duplicates = NearDuplicateIndex(args.near_duplicates)
+    if args.workers > 1 and not args.keywords_only:
+        from .parallel import PreprocessPool
+        pool = PreprocessPool(args.workers)
+
+    try:
+        stats = run_ingest(
+            args.input, args.output, args.model, args.format,
+            columns=[column.strip() for column in args.columns.split(',') if column.strip()],
+            text_field=args.text_field, chunk_size=args.chunk_size, batch_size=args.batch_size,
+            use_model=not args.keywords_only, resume=args.resume, checkpoint_path=args.checkpoint,
+            cache=cache, preprocess=pool.preprocess_texts if pool else None,
+            progress=lambda message: print(message, file=sys.stderr), store_path=args.store,
+            near_duplicates=near_duplicates, cascade=args.cascade or CASCADE_ENABLED
+        )
+    finally:
+        if pool:
+            pool.close()
+
+    if cache is not None:
+        stats['prediction_cache'] = cache.stats()
+    if near_duplicates is not None:
+        stats['near_duplicates'] = near_duplicates.stats()
+    print(json.dumps(stats, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# Pencocokan kata kunci sentimen dengan regex terkompilasi berbentuk trie.
+# Semua kata kunci positif dan negatif digabung menjadi satu pola (trie) sehingga setiap teks
+# cukup dipindai sekali, berapa pun ukuran leksikonnya. Pencocokan memakai batas kata
+# ("tai" tidak cocok di dalam "pantai", "bisa" tidak cocok di dalam "bisanya").
+#
+# Leksikon berbobot dapat dimuat dari file teks/CSV dengan format "kata,bobot" per baris
+# (bobot opsional, default 1). Baris kosong dan baris yang diawali '#' diabaikan.
+import csv
+import os
+import re
+
+import numpy as np
+
+# Pemisah antar teks pada mode batch: bukan huruf/angka dan bukan spasi,
+# sehingga batas kata tetap berlaku dan frasa tidak tersambung antar teks
+_BATCH_SEPARATOR = '\x00'
+
+# Fungsi untuk membuat pola regex dari trie kata kunci
+def _trie_pattern(terms):
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return _node_pattern(trie)
+
+def _node_pattern(node):
+    branches = []
+    for char in sorted(key for key in node if key):
+        # Spasi pada frasa (misalnya "terima kasih") cocok dengan satu atau lebih whitespace
+        char_pattern = r'\s+' if char == ' ' else re.escape(char)
+        branches.append(char_pattern + _node_pattern(node[char]))
+
+    if not branches:
+        return ''
+    if len(branches) == 1 and '' not in node:
+        return branches[0]
+    pattern = '(?:' + '|'.join(branches) + ')'
+    return pattern + '?' if '' in node else pattern
+
+# Fungsi untuk menyamakan penulisan kata kunci (huruf kecil, spasi tunggal)
+def _normalize_term(term):
+    return ' '.join(str(term).lower().split())
+
+# Fungsi untuk memuat leksikon berbobot dari file ("kata,bobot" per baris)
+def load_lexicon(path):
+    lexicon = {}
+    delimiter = '\t' if os.path.splitext(path)[1].lower() in ('.tsv', '.tab') else ','
+    with open(path, encoding='utf-8', newline='') as handle:
+        for row in csv.reader(handle, delimiter=delimiter):
+            if not row or not row[0].strip() or row[0].lstrip().startswith('#'):
+                continue
+            term = _normalize_term(row[0])
+            try:
+                weight = float(row[1]) if len(row) > 1 and row[1].strip() else 1.0
+            except ValueError:
+                # Baris header, misalnya "kata,bobot"
+                continue
+            lexicon[term] = weight
+    return lexicon
+
+# Pencocok kata kunci positif/negatif berbobot
+class KeywordMatcher:
+    def __init__(self, positive_words, negative_words):
+        self.positive = self._as_weights(positive_words)
+        self.negative = self._as_weights(negative_words)
+
+        conflicts = set(self.positive) & set(self.negative)
+        if conflicts:
+            raise ValueError(f"Kata kunci berada di leksikon positif dan negatif: {', '.join(sorted(conflicts))}")
+
+        # Urutan kata kunci dipertahankan agar daftar hasil cocok sesuai urutan leksikon
+        self.terms = list(self.positive) + list(self.negative)
+        self.term_index = {term: i for i, term in enumerate(self.terms)}
+        self.is_positive = np.array([term in self.positive for term in self.terms], dtype=bool)
+        self.weights = np.array([self.positive.get(term, self.negative.get(term)) for term in self.terms], dtype=float)
+
+        # Urutan panjang terlebih dahulu tidak diperlukan karena trie selalu mencoba kata terpanjang
+        self.pattern = re.compile(r'(?<!\w)' + _trie_pattern(self.terms) + r'(?!\w)') if self.terms else None
+
+    @staticmethod
+    def _as_weights(words):
+        if isinstance(words, dict):
+            return {_normalize_term(term): float(weight) for term, weight in words.items()}
+        return {_normalize_term(term): 1.0 for term in words}
+
+    @classmethod
+    def from_files(cls, positive_path, negative_path):
+        return cls(load_lexicon(positive_path), load_lexicon(negative_path))
+
+    # Fungsi untuk mencari indeks kata kunci yang muncul pada teks (huruf kecil)
+    def _find_terms(self, text_lower):
+        if self.pattern is None:
+            return set()
+        return {self.term_index[' '.join(match.group().split())] for match in self.pattern.finditer(text_lower)}
+
+    # Fungsi untuk menyusun hasil dari himpunan indeks kata kunci yang cocok
+    def _build_result(self, matched):
+        matched = sorted(matched)
+        positive_matches = [self.terms[i] for i in matched if self.is_positive[i]]
+        negative_matches = [self.terms[i] for i in matched if not self.is_positive[i]]
+        positive_weight = float(sum(self.weights[i] for i in matched if self.is_positive[i]))
+        negative_weight = float(sum(self.weights[i] for i in matched if not self.is_positive[i]))
+        return positive_matches, negative_matches, positive_weight, negative_weight
+
+    # Cocokkan satu teks
+    def match(self, text):
+        return self._build_result(self._find_terms(text.lower()))
+
+    # Cocokkan banyak teks sekaligus: semua teks digabung dan dipindai dengan satu regex.
+    # Kata kunci yang cocok dikumpulkan per teks (bukan matriks teks x kata kunci), sehingga
+    # biaya dan memori sebanding dengan jumlah kecocokan, bukan ukuran leksikon.
+    def match_batch(self, texts):
+        texts = [str(text).lower().replace(_BATCH_SEPARATOR, ' ') for text in texts]
+        matched = [set() for _ in texts]
+
+        if self.pattern is not None and texts:
+            joined = _BATCH_SEPARATOR.join(texts)
+            lengths = np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=len(texts))
+            starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+            match_starts = []
+            match_terms = []
+            for match in self.pattern.finditer(joined):
+                match_starts.append(match.start())
+                match_terms.append(self.term_index[' '.join(match.group().split())])
+
+            if match_starts:
+                rows = np.searchsorted(starts, match_starts, side='right') - 1
+                for row, term in zip(rows.tolist(), match_terms):
+                    matched[row].add(term)
+
+        results = [self._build_result(terms) for terms in matched]
+        return {
+            'positive_count': np.fromiter((len(result[0]) for result in results), dtype=np.int64, count=len(results)),
+            'negative_count': np.fromiter((len(result[1]) for result in results), dtype=np.int64, count=len(results)),
+            'positive_matches': [result[0] for result in results],
+            'negative_matches': [result[1] for result in results],
+            'positive_weight': np.fromiter((result[2] for result in results), dtype=float, count=len(results)),
+            'negative_weight': np.fromiter((result[3] for result in results), dtype=float, count=len(results))
+        }
@@ -0,0 +1,222 @@
+# Ekspor model Keras (.h5) ke TensorFlow Lite untuk start cepat dan memori kecil.
+# Model .tflite dijalankan dengan interpreter ringan (ai-edge-litert / tflite-runtime) tanpa
+# harus memuat TensorFlow penuh. Bobot dapat dikuantisasi ke float16 atau int8 (dynamic range).
+#
+#   python -m sentimen.lite convert --quantize float16   # model/model_*.h5 -> model/model_*.tflite
+#   python -m sentimen.lite parity --limit 2000          # bandingkan skor .h5 dan .tflite
+#
+# Aplikasi memakai model .tflite jika SENTIMEN_MODEL_BACKEND=tflite.
+import argparse
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from .corpus import encoded_inputs, load_corpus
+from .engine import (
+    DATASET_PATH,
+    MAX_SEQUENCE_LENGTH,
+    MODEL_PATHS,
+    MODEL_TYPES,
+    LITE_MODEL_PATHS,
+    SENTIMENT_THRESHOLD,
+    combine_scores,
+    get_blend,
+    predict_padded,
+)
+
+logger = logging.getLogger(__name__)
+
+# Ukuran batch tetap model .tflite. LSTM/GRU Keras hanya bisa dikonversi ke operasi bawaan
+# TFLite jika bentuk input statis, sehingga input dipecah per batch ini dan baris terakhir diisi nol.
+LITE_BATCH_SIZE = 32
+
+QUANTIZATION_TYPES = ["none", "float16", "int8"]
+
+# Fungsi untuk memilih interpreter TFLite yang paling ringan yang terpasang (sekali per proses)
+@functools.lru_cache(maxsize=None)
+def _interpreter_class():
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    # Fallback ini memuat TensorFlow penuh sehingga penghematan memori dan waktu start hilang
+    logger.warning("ai-edge-litert/tflite-runtime tidak terpasang, model .tflite dijalankan dengan "
+                   "TensorFlow penuh (tf.lite). Pasang ai-edge-litert: pip install ai-edge-litert")
+    import tensorflow as tf
+    return tf.lite.Interpreter
+
+# Model .tflite dengan antarmuka predict/predict_on_batch seperti model Keras
+class LiteModel:
+    def __init__(self, path, num_threads=None):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File model '{path}' tidak ditemukan.")
+        self.path = path
+        self.interpreter = _interpreter_class()(model_path=path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        input_details = self.interpreter.get_input_details()[0]
+        self.input_index = input_details['index']
+        self.input_dtype = input_details['dtype']
+        self.batch_size, self.sequence_length = (int(dim) for dim in input_details['shape'])
+        self.output_index = self.interpreter.get_output_details()[0]['index']
+        # Interpreter TFLite tidak thread-safe
+        self._lock = threading.Lock()
+
+    def predict_on_batch(self, padded_sequences):
+        padded_sequences = np.asarray(padded_sequences, dtype=self.input_dtype)
+        if padded_sequences.ndim != 2 or padded_sequences.shape[1] != self.sequence_length:
+            raise ValueError(f"Input harus berbentuk (n, {self.sequence_length}), "
+                             f"bukan {padded_sequences.shape}.")
+
+        outputs = []
+        chunk = np.zeros((self.batch_size, self.sequence_length), dtype=self.input_dtype)
+        with self._lock:
+            for start in range(0, len(padded_sequences), self.batch_size):
+                rows = padded_sequences[start:start + self.batch_size]
+                chunk[:len(rows)] = rows
+                chunk[len(rows):] = 0
+                self.interpreter.set_tensor(self.input_index, chunk)
+                self.interpreter.invoke()
+                outputs.append(self.interpreter.get_tensor(self.output_index)[:len(rows)].copy())
+        if not outputs:
+            return np.zeros((0, 1), dtype=np.float32)
+        return np.concatenate(outputs)
+
+    def predict(self, padded_sequences, batch_size=None, verbose=0):
+        return self.predict_on_batch(padded_sequences)
+
+# Fungsi untuk memuat model Keras .h5 langsung (tanpa melihat SENTIMEN_MODEL_BACKEND)
+def load_keras_model(model_type):
+    from keras.models import load_model
+    return load_model(MODEL_PATHS[model_type])
+
+# Fungsi konversi satu model .h5 ke .tflite.
+# Graph dibekukan (variabel menjadi konstanta) pada ukuran batch tetap agar loop LSTM/GRU
+# dapat diturunkan ke operasi bawaan TFLite tanpa Select TF ops.
+def convert_model(model_type, quantize="none", batch_size=LITE_BATCH_SIZE, output_path=None):
+    if quantize not in QUANTIZATION_TYPES:
+        raise ValueError(f"Kuantisasi {quantize} tidak dikenali.")
+    import tensorflow as tf
+    from tensorflow.python.framework.convert_to_constants import convert_variables_to_constants_v2
+
+    model = load_keras_model(model_type)
+    function = tf.function(lambda inputs: model(inputs, training=False))
+    concrete_function = convert_variables_to_constants_v2(function.get_concrete_function(
+        tf.TensorSpec([batch_size, MAX_SEQUENCE_LENGTH], tf.int32)
+    ))
+
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([concrete_function])
+    if quantize != "none":
+        # int8: kuantisasi bobot dynamic range; float16: bobot disimpan sebagai float16
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantize == "float16":
+        converter.target_spec.supported_types = [tf.float16]
+    model_bytes = converter.convert()
+
+    output_path = output_path or LITE_MODEL_PATHS[model_type]
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as handle:
+        handle.write(model_bytes)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+# Fungsi untuk membandingkan skor model .h5 dan .tflite pada teks yang sama.
+# Melaporkan selisih skor model dan kesesuaian label (skor model saja dan skor gabungan).
+def parity_report(model_types=None, texts=None, batch_size=1024, corpus=None):
+    padded, keyword_scores = encoded_inputs(texts, corpus)
+
+    report = {'texts': len(padded), 'models': {}}
+    for model_type in model_types or MODEL_TYPES:
+        if not (os.path.exists(MODEL_PATHS[model_type]) and os.path.exists(LITE_MODEL_PATHS[model_type])):
+            continue
+
+        start = time.perf_counter()
+        keras_model = load_keras_model(model_type)
+        keras_load = time.perf_counter() - start
+        start = time.perf_counter()
+        keras_scores = predict_padded(keras_model, padded, batch_size)
+        keras_predict = time.perf_counter() - start
+
+        start = time.perf_counter()
+        lite_model = LiteModel(LITE_MODEL_PATHS[model_type])
+        lite_load = time.perf_counter() - start
+        start = time.perf_counter()
+        lite_scores = predict_padded(lite_model, padded, batch_size)
+        lite_predict = time.perf_counter() - start
+
+        difference = np.abs(keras_scores - lite_scores)
+        threshold = get_blend(model_type)[2]
+        keras_labels = combine_scores(keras_scores, keyword_scores, model_type) >= threshold
+        lite_labels = combine_scores(lite_scores, keyword_scores, model_type) >= threshold
+        report['models'][model_type] = {
+            'h5_bytes': os.path.getsize(MODEL_PATHS[model_type]),
+            'tflite_bytes': os.path.getsize(LITE_MODEL_PATHS[model_type]),
+            'max_abs_diff': float(difference.max()) if len(difference) else 0.0,
+            'mean_abs_diff': float(difference.mean()) if len(difference) else 0.0,
+            'model_label_agreement': float(np.mean((keras_scores >= SENTIMENT_THRESHOLD) ==
+                                                   (lite_scores >= SENTIMENT_THRESHOLD))) if len(padded) else 1.0,
+            'label_agreement': float(np.mean(keras_labels == lite_labels)) if len(padded) else 1.0,
+            'h5_load_seconds': keras_load,
+            'tflite_load_seconds': lite_load,
+            'h5_predict_seconds': keras_predict,
+            'tflite_predict_seconds': lite_predict
+        }
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.lite',
+        description="Konversi model .h5 ke TensorFlow Lite dan cek kesesuaian skornya."
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    convert_parser = subparsers.add_parser('convert', help="Konversi model .h5 ke .tflite")
+    convert_parser.add_argument('--models', default=','.join(MODEL_TYPES),
+                                help="Algoritma yang dikonversi, dipisah koma (default: semua)")
+    convert_parser.add_argument('--quantize', choices=QUANTIZATION_TYPES, default='none',
+                                help="Kuantisasi bobot (default: none)")
+    convert_parser.add_argument('--batch-size', type=int, default=LITE_BATCH_SIZE,
+                                help=f"Ukuran batch tetap model .tflite (default: {LITE_BATCH_SIZE})")
+
+    parity_parser = subparsers.add_parser('parity', help="Bandingkan skor model .h5 dan .tflite")
+    parity_parser.add_argument('--models', default=','.join(MODEL_TYPES),
+                               help="Algoritma yang dibandingkan, dipisah koma (default: semua)")
+    parity_parser.add_argument('--data', default=DATASET_PATH, help="File CSV teks uji")
+    parity_parser.add_argument('--text-field', default='full_text', help="Kolom teks (default: full_text)")
+    parity_parser.add_argument('--limit', type=int, default=None, help="Jumlah baris maksimum")
+    parity_parser.add_argument('--min-agreement', type=float, default=0.99,
+                               help="Kesesuaian label minimum, exit code 1 jika di bawahnya (default: 0.99)")
+    args = parser.parse_args(argv)
+
+    model_types = [name.strip() for name in args.models.split(',') if name.strip()]
+    unknown = [model_type for model_type in model_types if model_type not in MODEL_TYPES]
+    if unknown:
+        parser.error(f"Model type tidak dikenali: {', '.join(unknown)}")
+
+    if args.command == 'convert':
+        for model_type in model_types:
+            if not os.path.exists(MODEL_PATHS[model_type]):
+                print(f"{model_type}: file '{MODEL_PATHS[model_type]}' tidak ditemukan", file=sys.stderr)
+                continue
+            path = convert_model(model_type, args.quantize, args.batch_size)
+            print(f"{model_type}: {path} ({os.path.getsize(path)} byte)")
+        return
+
+    report = parity_report(model_types, corpus=load_corpus(args.data, args.text_field).head(args.limit))
+    print(json.dumps(report, indent=2))
+    if any(stats['label_agreement'] < args.min_agreement for stats in report['models'].values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
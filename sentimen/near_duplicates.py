@@ -0,0 +1,343 @@
+# Deteksi hampir-duplikat (MinHash/LSH) sebelum inferensi model.
+# Selain retweet persis, ekspor tweet berisi banyak salinan pesan yang sama dengan sedikit
+# suntingan. Username, hashtag dan URL sudah dihapus oleh preprocessing, sehingga salinan yang
+# hanya berbeda di bagian itu menjadi teks hasil preprocessing yang identik; salinan dengan
+# suntingan kata dikelompokkan dengan MinHash/LSH di atas shingle kata.
+#
+# Setiap klaster diwakili teks pertamanya (representatif). Teks baru masuk ke klaster yang ada
+# jika kemiripan Jaccard shingle-nya dengan representatif >= threshold (diverifikasi persis,
+# LSH hanya menyaring kandidat); jika tidak, teks menjadi representatif klaster baru. Model hanya
+# dijalankan untuk representatif, lalu skornya dipakai seluruh anggota klaster. Indeks disimpan
+# antar batch, sehingga salinan di batch berikutnya tidak diprediksi ulang. Ukuran indeks dibatasi
+# (MAX_INDEXED_CLUSTERS, MAX_EXACT_TEXTS) agar memori ingest panjang tetap konstan.
+#
+#   python -m sentimen --format csv --near-duplicates < dataset/dataset_10k.csv > hasil.csv
+#   python -m sentimen.near_duplicates --model GRU   # laporan klaster dan selisih skor anggota
+import argparse
+import json
+import sys
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from .engine import (
+    DATASET_PATH,
+    MODEL_TYPES,
+    check_sentiment_keywords_batch,
+    combine_scores,
+    get_blend,
+    get_tokenizer,
+    load_sentiment_model,
+    load_texts,
+    model_files_available,
+    predict_padded,
+    preprocess_texts,
+    texts_to_padded,
+)
+
+# Kemiripan Jaccard minimum antara teks dan representatif klasternya
+DEFAULT_THRESHOLD = 0.8
+
+# Jumlah fungsi hash MinHash. Pembagian ke band LSH dipilih dari threshold (lihat lsh_bands).
+NUM_PERM = 64
+
+# Panjang shingle (jumlah kata berurutan)
+SHINGLE_SIZE = 2
+
+# Jumlah klaster maksimum yang disimpan di indeks (representatif, bucket LSH dan skor), membatasi
+# memori untuk ingest panjang. Setelah penuh, teks baru yang tidak cocok tetap menjadi klaster
+# sendiri dan diprediksi, tetapi tidak disimpan: skornya dilepas setelah dibaca lewat scores()
+# dan salinannya di batch berikutnya menjadi klaster baru lagi.
+MAX_INDEXED_CLUSTERS = 500000
+
+# Jumlah teks hasil preprocessing maksimum yang disimpan untuk pencocokan persis. Setelah penuh,
+# teks baru tetap dicocokkan lewat LSH ke klaster yang tersimpan, hanya tanpa jalan pintas dict.
+MAX_EXACT_TEXTS = 1000000
+
+# Jumlah hash kata maksimum yang di-cache; cache dikosongkan jika melebihi batas ini
+MAX_WORD_HASHES = 1000000
+
+_SEED = 20250309
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+# Fungsi pembagian LSH (band, baris per band) dengan jumlah peluang false positive (Jaccard di
+# bawah threshold menjadi kandidat) dan false negative (di atas threshold terlewat) terkecil.
+# Kandidat palsu hanya menambah verifikasi Jaccard; teks yang terlewat menjadi klaster sendiri.
+def lsh_bands(threshold, num_perm=NUM_PERM):
+    similarity = np.linspace(0.0, 1.0, 201)
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        candidate = 1.0 - (1.0 - similarity ** rows) ** bands
+        # Rata-rata pada grid seragam [0, 1] = integral peluang
+        false_positive = np.mean(np.where(similarity < threshold, candidate, 0.0))
+        false_negative = np.mean(np.where(similarity >= threshold, 1.0 - candidate, 0.0))
+        if best is None or false_positive + false_negative < best[0]:
+            best = (false_positive + false_negative, bands, rows)
+    return best[1], best[2]
+
+# Indeks hampir-duplikat dengan klaster bernomor urut (0, 1, 2, ...) dan skor model per klaster.
+# Shingle (shingle_size kata berurutan; teks yang lebih pendek diwakili seluruh katanya) disimpan
+# sebagai hash 64-bit: hash setiap kata dihitung sekali (crc32) lalu digabung dengan numpy.
+class NearDuplicateIndex:
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE,
+                 max_indexed=MAX_INDEXED_CLUSTERS, max_exact=MAX_EXACT_TEXTS):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("Threshold harus di antara 0 dan 1.")
+        self.threshold = threshold
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        num_perm = self.bands * self.rows
+        self.shingle_size = shingle_size
+        self.max_indexed = max_indexed
+        self.max_exact = max_exact
+
+        # Hash multiply-shift: (a * x + b) mod 2^64 >> 32, a ganjil
+        rng = np.random.default_rng(_SEED)
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        # Pengali untuk menggabungkan hash kata menjadi hash shingle, dan nilai MinHash satu band
+        # menjadi satu kunci
+        self._word_mix = np.uint64(rng.integers(1, 2 ** 63, dtype=np.uint64) * 2 + 1)
+        self._band_mix = rng.integers(1, 2 ** 63, size=self.rows, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+        self._word_hashes = {}
+        self._exact = {}
+        self._buckets = [{} for _ in range(self.bands)]
+        # Representatif dan skor klaster tersimpan (id < max_indexed, indeks list = id klaster);
+        # skor klaster di atas batas disimpan sementara sampai dibaca
+        self._leaders = []
+        self._scores = []
+        self._overflow_scores = {}
+        self.clusters = 0
+        self.texts = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.clusters
+
+    # Hash shingle semua teks sebagai satu array, beserta jumlah shingle per teks
+    def _shingle_hashes(self, texts):
+        if len(self._word_hashes) > MAX_WORD_HASHES:
+            self._word_hashes.clear()
+        word_hashes = self._word_hashes
+        words = [text.split() for text in texts]
+        lengths = np.fromiter((len(items) for items in words), dtype=np.int64, count=len(words))
+        flat = np.fromiter((word_hashes[word] if word in word_hashes else
+                            word_hashes.setdefault(word, zlib.crc32(word.encode('utf-8')) + 1)
+                            for items in words for word in items), dtype=np.uint64, count=int(lengths.sum()))
+        if not len(flat):
+            flat = np.zeros(1, dtype=np.uint64)
+
+        size = self.shingle_size
+        counts = np.maximum(lengths - size + 1, 1)
+        total = int(counts.sum())
+        # Posisi kata pertama dan jumlah kata setiap shingle
+        positions = np.repeat(np.cumsum(lengths) - lengths, counts) + \
+            np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        widths = np.repeat(np.minimum(lengths, size), counts)
+        hashes = np.zeros(total, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for offset in range(size):
+                word = flat[np.minimum(positions + offset, len(flat) - 1)]
+                hashes = np.where(offset < widths, hashes * self._word_mix + word, hashes)
+        return hashes, counts
+
+    # Kunci LSH (bands per teks) dari hash shingle, dihitung sekaligus dengan numpy
+    def _band_keys(self, hashes, counts):
+        starts = np.cumsum(counts) - counts
+        # Lipat hash 64-bit menjadi 32-bit sebelum hash multiply-shift
+        folded = (hashes ^ (hashes >> np.uint64(32))) & np.uint64(0xFFFFFFFF)
+        signatures = np.empty((len(counts), len(self._a)), dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for start in range(0, len(self._a), 16):
+                values = (self._a[start:start + 16, None] * folded[None, :] + self._b[start:start + 16, None]) \
+                    >> np.uint64(32)
+                signatures[:, start:start + 16] = np.minimum.reduceat(values, starts, axis=1).T
+            keys = (signatures.reshape(len(counts), self.bands, self.rows) * self._band_mix).sum(axis=2)
+        return keys.tolist(), starts
+
+    # Fungsi untuk memasukkan teks hasil preprocessing ke klaster. Mengembalikan id klaster
+    # per teks dan daftar (id klaster, teks) representatif klaster baru.
+    def assign(self, processed_texts):
+        with self._lock:
+            cluster_ids = np.empty(len(processed_texts), dtype=np.int64)
+            pending = [text for text in dict.fromkeys(processed_texts) if text not in self._exact]
+            # Klaster teks pada panggilan ini (juga teks yang tidak lagi muat di self._exact)
+            assigned = {}
+            new_clusters = []
+            if pending:
+                hashes, counts = self._shingle_hashes(pending)
+                band_keys, starts = self._band_keys(hashes, counts)
+                for text, keys, start, count in zip(pending, band_keys, starts.tolist(), counts.tolist()):
+                    items = frozenset(hashes[start:start + count].tolist())
+                    candidates = set()
+                    for bucket, key in zip(self._buckets, keys):
+                        candidates.update(bucket.get(key, ()))
+                    best, best_similarity = None, self.threshold
+                    for candidate in sorted(candidates):
+                        leader = self._leaders[candidate]
+                        # Jaccard tidak mungkin melebihi rasio ukuran kedua set
+                        if min(len(items), len(leader)) < self.threshold * max(len(items), len(leader)):
+                            continue
+                        similarity = jaccard(items, leader)
+                        if similarity >= best_similarity and (best is None or similarity > best_similarity):
+                            best, best_similarity = candidate, similarity
+
+                    if best is None:
+                        best = self.clusters
+                        self.clusters += 1
+                        new_clusters.append((best, text))
+                        if best < self.max_indexed:
+                            self._leaders.append(items)
+                            self._scores.append(np.nan)
+                            for bucket, key in zip(self._buckets, keys):
+                                bucket.setdefault(key, []).append(best)
+                        else:
+                            self._overflow_scores[best] = np.nan
+                    assigned[text] = best
+                    if best < self.max_indexed and len(self._exact) < self.max_exact:
+                        self._exact[text] = best
+
+            for i, text in enumerate(processed_texts):
+                cluster_ids[i] = assigned[text] if text in assigned else self._exact[text]
+            self.texts += len(processed_texts)
+        return cluster_ids, new_clusters
+
+    # Simpan skor model representatif klaster baru
+    def set_scores(self, cluster_ids, scores):
+        with self._lock:
+            for cluster_id, score in zip(cluster_ids, np.asarray(scores, dtype=float)):
+                if cluster_id < len(self._scores):
+                    self._scores[cluster_id] = score
+                elif cluster_id in self._overflow_scores:
+                    self._overflow_scores[cluster_id] = score
+
+    # Skor model per id klaster. Skor klaster di atas batas indeks dilepas setelah dibaca.
+    def scores(self, cluster_ids):
+        cluster_ids = np.asarray(cluster_ids, dtype=np.int64)
+        with self._lock:
+            stored = cluster_ids < len(self._scores)
+            scores = np.full(len(cluster_ids), np.nan)
+            scores[stored] = np.asarray(self._scores, dtype=float)[cluster_ids[stored]]
+            for i in np.flatnonzero(~stored).tolist():
+                scores[i] = self._overflow_scores.get(int(cluster_ids[i]), np.nan)
+            for cluster_id, score in zip(cluster_ids[~stored].tolist(), scores[~stored].tolist()):
+                if not np.isnan(score):
+                    self._overflow_scores.pop(cluster_id, None)
+            return scores
+
+    # Fungsi prediksi: hanya representatif klaster baru yang diprediksi (predict_fn menerima
+    # list teks hasil preprocessing). Mengembalikan skor model dan id klaster per teks.
+    def predict(self, processed_texts, predict_fn):
+        cluster_ids, new_clusters = self.assign(processed_texts)
+        if new_clusters:
+            self.set_scores([cluster_id for cluster_id, _ in new_clusters],
+                            predict_fn([text for _, text in new_clusters]))
+        return self.scores(cluster_ids), cluster_ids
+
+    def stats(self):
+        return {
+            'texts': self.texts,
+            'clusters': self.clusters,
+            'indexed_clusters': len(self._leaders),
+            'exact_texts': len(self._exact),
+            'predicted_fraction': self.clusters / self.texts if self.texts else 0.0,
+            'threshold': self.threshold
+        }
+
+# Fungsi prediksi model per representatif untuk satu model
+def model_predict_fn(model_type, batch_size=1024):
+    def predict(processed_texts):
+        return predict_padded(load_sentiment_model(model_type), texts_to_padded(get_tokenizer(), processed_texts),
+                              batch_size)
+    return predict
+
+# Fungsi laporan: jumlah klaster, pengurangan kerja model, klaster terbesar dan (dengan model)
+# selisih skor anggota terhadap skor yang dihitung sendiri-sendiri.
+def cluster_report(texts, threshold=DEFAULT_THRESHOLD, model_type=None, batch_size=1024, top=5, repeats=2):
+    processed_texts, _ = preprocess_texts(texts)
+    index = NearDuplicateIndex(threshold)
+    start = time.perf_counter()
+    cluster_ids, _ = index.assign(processed_texts)
+    cluster_seconds = time.perf_counter() - start
+
+    sizes = np.bincount(cluster_ids, minlength=len(index)) if len(cluster_ids) else np.zeros(0, dtype=np.int64)
+    report = {
+        'texts': len(texts),
+        'unique_processed_texts': len(set(processed_texts)),
+        'clusters': len(index),
+        'predicted_fraction': len(index) / len(texts) if texts else 0.0,
+        'threshold': threshold,
+        'cluster_seconds': cluster_seconds,
+        'largest_clusters': [{
+            'cluster_id': int(cluster_id),
+            'size': int(sizes[cluster_id]),
+            'examples': list(dict.fromkeys(text for text, member in zip(processed_texts, cluster_ids)
+                                           if member == cluster_id))[:3]
+        } for cluster_id in np.argsort(-sizes, kind='stable')[:top]]
+    }
+
+    if model_type is not None and model_files_available(model_type):
+        predict = model_predict_fn(model_type, batch_size)
+        # Run pertama ikut menghitung pemuatan model dan tracing fungsi prediksi Keras untuk
+        # ukuran batch terakhir; ambil waktu tercepat dari beberapa pengulangan
+        individual_seconds = clustered_seconds = float('inf')
+        for _ in range(max(repeats, 1)):
+            start = time.perf_counter()
+            individual = predict(processed_texts)
+            individual_seconds = min(individual_seconds, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            clustered, _ = NearDuplicateIndex(threshold).predict(processed_texts, predict)
+            clustered_seconds = min(clustered_seconds, time.perf_counter() - start)
+
+        keyword_scores = np.asarray(check_sentiment_keywords_batch(texts)['keyword_score'], dtype=float)
+        difference = np.abs(individual - clustered)
+        threshold = get_blend(model_type)[2]
+        agreement = (combine_scores(individual, keyword_scores, model_type) >= threshold) == \
+            (combine_scores(clustered, keyword_scores, model_type) >= threshold)
+        report['model'] = {
+            'model_type': model_type,
+            'max_abs_diff': float(difference.max()) if len(difference) else 0.0,
+            'mean_abs_diff': float(difference.mean()) if len(difference) else 0.0,
+            'label_agreement': float(agreement.mean()) if len(agreement) else 1.0,
+            'individual_predict_seconds': individual_seconds,
+            'clustered_predict_seconds': clustered_seconds
+        }
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.near_duplicates',
+        description="Laporan klaster hampir-duplikat (MinHash/LSH) pada file tweet."
+    )
+    parser.add_argument('--data', default=DATASET_PATH, help="File CSV teks")
+    parser.add_argument('--text-field', default='full_text', help="Kolom teks (default: full_text)")
+    parser.add_argument('--limit', type=int, default=None, help="Jumlah baris maksimum")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Kemiripan Jaccard minimum (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--model', choices=MODEL_TYPES, default=None,
+                        help="Bandingkan skor per klaster dengan skor per teks untuk algoritma ini")
+    parser.add_argument('--top', type=int, default=5, help="Jumlah klaster terbesar yang ditampilkan")
+    parser.add_argument('--repeats', type=int, default=2,
+                        help="Jumlah pengulangan waktu prediksi, diambil yang tercepat (default: 2)")
+    parser.add_argument('--min-agreement', type=float, default=0.99,
+                        help="Kesesuaian label minimum dengan --model, exit code 1 jika di bawahnya (default: 0.99)")
+    args = parser.parse_args(argv)
+    if not 0.0 < args.threshold <= 1.0:
+        parser.error("--threshold harus di antara 0 dan 1.")
+
+    report = cluster_report(load_texts(args.data, args.text_field, args.limit), args.threshold,
+                            args.model, top=args.top, repeats=args.repeats)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if 'model' in report and report['model']['label_agreement'] < args.min_agreement:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Penyediaan resource NLTK.
+# Pengecekan resource dilakukan sekali per proses dan hanya membaca disk (tanpa jaringan).
+# Download dilakukan sebagai langkah setup terpisah, bukan saat aplikasi melayani request:
+#
+#   python -m sentimen.nltk_setup           # download resource yang belum ada
+#   python -m sentimen.nltk_setup --check   # hanya cek, exit code 1 jika ada yang kurang
+import argparse
+import functools
+import logging
+import os
+import sys
+
+logger = logging.getLogger(__name__)
+
+# Folder nltk_data milik proyek (tempat resource hasil download disimpan)
+NLTK_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nltk_data')
+
+# Resource yang dibutuhkan beserta lokasinya di dalam folder nltk_data
+REQUIRED_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+    'omw-1.4': 'corpora/omw-1.4'
+}
+
+# Fungsi untuk mendaftarkan folder nltk_data proyek ke NLTK (hanya sekali per proses)
+@functools.lru_cache(maxsize=None)
+def configure_nltk_data_path():
+    import nltk
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.append(NLTK_DATA_DIR)
+    return nltk
+
+# Fungsi untuk mencari resource yang belum tersedia di disk (tanpa akses jaringan)
+def find_missing_resources(resources=None):
+    nltk = configure_nltk_data_path()
+    missing = []
+    for resource in resources or REQUIRED_RESOURCES:
+        try:
+            nltk.data.find(REQUIRED_RESOURCES[resource])
+        except LookupError:
+            missing.append(resource)
+    return missing
+
+# Fungsi pengecekan resource sekali per proses, hasilnya di-cache
+@functools.lru_cache(maxsize=None)
+def ensure_nltk_resources():
+    missing = tuple(find_missing_resources())
+    if missing:
+        logger.warning("Resource NLTK belum tersedia: %s. Jalankan 'python -m sentimen.nltk_setup' "
+                       "untuk mengunduhnya.", ', '.join(missing))
+    return missing
+
+# Fungsi untuk mengunduh resource yang belum ada (langkah setup, membutuhkan jaringan)
+def download_resources(resources=None, quiet=False):
+    nltk = configure_nltk_data_path()
+    os.makedirs(NLTK_DATA_DIR, exist_ok=True)
+
+    failed = []
+    for resource in find_missing_resources(resources):
+        try:
+            if not nltk.download(resource, download_dir=NLTK_DATA_DIR, quiet=quiet, raise_on_error=True):
+                failed.append(resource)
+        except Exception as e:
+            logger.error("Gagal mengunduh resource NLTK '%s': %s", resource, e)
+            failed.append(resource)
+
+    ensure_nltk_resources.cache_clear()
+    return failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.nltk_setup',
+        description=f"Cek dan unduh resource NLTK ke {NLTK_DATA_DIR}."
+    )
+    parser.add_argument('--check', action='store_true',
+                        help="Hanya cek resource di disk tanpa mengunduh")
+    parser.add_argument('--quiet', action='store_true', help="Sembunyikan progres download")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        missing = find_missing_resources()
+        for resource in REQUIRED_RESOURCES:
+            print(f"{resource}: {'TIDAK ADA' if resource in missing else 'ok'}")
+        sys.exit(1 if missing else 0)
+
+    failed = download_resources(quiet=args.quiet)
+    if failed:
+        print(f"Gagal mengunduh: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+    print("Semua resource NLTK tersedia.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# Normalisasi teks (lowercase, URL, username, hashtag, tanda baca, angka) tanpa rangkaian re.sub.
+# Rangkaian lima re.sub lama diganti dengan:
+#   1. regex terkompilasi untuk URL dan untuk username/hashtag, masing-masing hanya dijalankan
+#      jika teks memuat "http" atau "@"/"#" (sebagian besar tweet tidak memuatnya);
+#   2. str.translate dengan tabel penghapusan tanda baca dan angka. Tabel diisi per karakter
+#      saat pertama kali ditemui sehingga berlaku untuk semua karakter unicode.
+# Hasilnya identik dengan rangkaian lama (lihat --check dan tests/test_normalizer.py).
+#
+#   python -m sentimen.normalizer --check   # bandingkan dengan rangkaian lama pada dataset
+#   python -m sentimen.normalizer --bench   # ukur percepatannya
+import argparse
+import re
+import sys
+import time
+
+_URL_PATTERN = re.compile(r'http\S+')
+# Username dan hashtag sekaligus: menghapus "@..." tidak pernah membentuk hashtag baru (dan
+# sebaliknya) karena \w+ selalu berhenti di karakter non-kata
+_MENTION_PATTERN = re.compile(r'[@#]\w+')
+
+_KEEP_CHAR = re.compile(r'[\w\s]')
+_DIGIT_CHAR = re.compile(r'\d')
+
+# Tabel str.translate: tanda baca ([^\w\s]) dan angka (\d) dihapus, karakter lain tetap
+class _RemovalTable(dict):
+    def __missing__(self, code):
+        char = chr(code)
+        value = char if _KEEP_CHAR.match(char) and not _DIGIT_CHAR.match(char) else None
+        self[code] = value
+        return value
+
+_REMOVAL_TABLE = _RemovalTable()
+
+# Fungsi normalisasi satu teks
+def normalize_text(text):
+    text = text.lower()
+    if 'http' in text:
+        text = _URL_PATTERN.sub('', text)
+    if '@' in text or '#' in text:
+        text = _MENTION_PATTERN.sub('', text)
+    return text.translate(_REMOVAL_TABLE)
+
+# Fungsi normalisasi banyak teks.
+# Teks tidak digabung: str.translate jauh lebih cepat untuk teks ASCII, dan satu emoji saja
+# membuat seluruh teks gabungan menjadi non-ASCII.
+def normalize_texts(texts):
+    return [normalize_text(str(text)) for text in texts]
+
+# Implementasi lama (rangkaian re.sub), dipakai sebagai acuan pengecekan
+def reference_clean_text(text):
+    text = text.lower()
+    text = re.sub(r'http\S+', '', text)
+    text = re.sub(r'@\w+', '', text)
+    text = re.sub(r'#\w+', '', text)
+    text = re.sub(r'[^\w\s]', '', text)
+    text = re.sub(r'\d+', '', text)
+    return text
+
+# Contoh kasus tepi untuk pengecekan (URL menempel pada username/hashtag, unicode, dll.)
+EDGE_CASES = [
+    '', 'HTTP://X.CO/A', '@userhttps://t.co/x', '#tag@user', '@@a', '#http://x',
+    'abc@httpx', '@a_b1 #C2d', 'harga 2.000,00', 'İstanbul', 'é', '٣ angka arab',
+    'baris\nbaru\ttab', 'http', 'xhttp:abc', '😀 emoji', 'a\u00a0b', '½ ²'
+]
+
+# Fungsi untuk membandingkan normalisasi baru dengan rangkaian lama
+def check(texts):
+    texts = list(texts) + EDGE_CASES
+    expected = [reference_clean_text(text) for text in texts]
+    single = [normalize_text(text) for text in texts]
+    batch = normalize_texts(texts)
+    mismatches = [text for text, value, one, many in zip(texts, expected, single, batch) if one != value or many != value]
+    return len(texts), mismatches
+
+# Fungsi microbenchmark: waktu terbaik dari beberapa ulangan untuk setiap implementasi
+def bench(texts, repeat=5):
+    implementations = {
+        'reference': lambda: [reference_clean_text(text) for text in texts],
+        'normalize_text': lambda: [normalize_text(text) for text in texts],
+        'normalize_texts': lambda: normalize_texts(texts)
+    }
+    results = {}
+    for name, function in implementations.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+        results[name] = min(timings)
+    return results
+
+def main(argv=None):
+    from .engine import DATASET_PATH, load_texts
+
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.normalizer',
+        description="Cek kesamaan dan ukur kecepatan normalisasi teks."
+    )
+    parser.add_argument('--data', default=DATASET_PATH, help="File CSV teks uji")
+    parser.add_argument('--text-field', default='full_text', help="Kolom teks (default: full_text)")
+    parser.add_argument('--check', action='store_true',
+                        help="Bandingkan hasil dengan rangkaian re.sub lama, exit code 1 jika berbeda")
+    parser.add_argument('--bench', action='store_true', help="Jalankan microbenchmark")
+    parser.add_argument('--repeat', type=int, default=5, help="Jumlah ulangan benchmark (default: 5)")
+    args = parser.parse_args(argv)
+
+    texts = load_texts(args.data, args.text_field)
+    if args.check or not args.bench:
+        total, mismatches = check(texts)
+        print(f"{total - len(mismatches)}/{total} teks identik")
+        for text in mismatches[:10]:
+            print(f"  berbeda: {text!r}")
+        if mismatches:
+            sys.exit(1)
+
+    if args.bench:
+        results = bench(texts, args.repeat)
+        for name, seconds in results.items():
+            print(f"{name:16s} {seconds * 1000:8.1f} ms  {results['reference'] / seconds:5.2f}x")
+
+if __name__ == "__main__":
+    main()
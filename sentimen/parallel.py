@@ -0,0 +1,230 @@
+# Preprocessing paralel dengan process pool untuk job besar (misalnya arsip tweet).
+# Pembersihan teks, tokenisasi, stopwords dan stemming Sastrawi terikat GIL, sehingga
+# dijalankan di beberapa proses. Setiap worker menyiapkan stopwords dan stemmer (beserta
+# cache kata dasarnya) sekali saat start. Input dikirim per chunk, urutan hasil sama dengan
+# urutan input, dan jumlah chunk yang sedang diproses dibatasi (backpressure) sehingga
+# memori tetap kecil walaupun input berupa iterator yang sangat panjang.
+#
+#   python -m sentimen.parallel --workers 4 --output hasil_preprocessing.csv
+import argparse
+import collections
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .engine import (
+    DATASET_PATH,
+    _NoStemmer,
+    get_cached_stemmer,
+    get_stop_words,
+    preprocess_texts,
+    safe_word_tokenize,
+)
+from .normalizer import normalize_texts
+
+# Tahapan preprocessing yang diukur waktunya
+STAGES = ['clean', 'tokenize', 'stopwords', 'stem']
+
+DEFAULT_CHUNK_SIZE = 256
+
+# Stopwords dan stemmer milik proses worker (diisi oleh _init_worker)
+_worker_stop_words = None
+_worker_stemmer = None
+
+# Fungsi inisialisasi worker: stopwords dan stemmer disiapkan sekali per proses
+def _init_worker():
+    global _worker_stop_words, _worker_stemmer
+    try:
+        _worker_stop_words = get_stop_words()
+    except:
+        _worker_stop_words = set()
+    try:
+        _worker_stemmer = get_cached_stemmer()
+    except:
+        _worker_stemmer = _NoStemmer()
+
+# Fungsi preprocessing satu chunk per tahap, hasilnya sama dengan engine.preprocess_texts.
+# Mengembalikan teks hasil preprocessing, token per teks dan waktu (detik) per tahap.
+def preprocess_chunk(texts, stop_words=None, stemmer=None):
+    if stop_words is None or stemmer is None:
+        if _worker_stemmer is None:
+            _init_worker()
+        stop_words = _worker_stop_words if stop_words is None else stop_words
+        stemmer = _worker_stemmer if stemmer is None else stemmer
+
+    timings = {}
+    start = time.perf_counter()
+    cleaned = normalize_texts(texts)
+    timings['clean'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    token_lists = [safe_word_tokenize(text) for text in cleaned]
+    timings['tokenize'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    token_lists = [[word for word in tokens if word not in stop_words] for tokens in token_lists]
+    timings['stopwords'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stemmed = []
+    for tokens in token_lists:
+        try:
+            stemmed.append([stemmer.stem(word) for word in tokens])
+        except:
+            stemmed.append(tokens)  # Jika stemming gagal, gunakan tokens asli
+    timings['stem'] = time.perf_counter() - start
+
+    return [' '.join(tokens) for tokens in stemmed], stemmed, timings
+
+# Statistik throughput per tahap. Waktu tahap dijumlahkan dari semua worker (detik CPU),
+# sedangkan wall time adalah waktu sejak pipeline dimulai.
+class PipelineStats:
+    def __init__(self):
+        self.texts = 0
+        self.chunks = 0
+        self.stage_seconds = dict.fromkeys(STAGES, 0.0)
+        self.wait_seconds = 0.0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def add_chunk(self, size, timings):
+        self.texts += size
+        self.chunks += 1
+        for stage, seconds in timings.items():
+            self.stage_seconds[stage] += seconds
+
+    def as_dict(self):
+        wall = (self.finished or time.perf_counter()) - self.started
+        return {
+            'texts': self.texts,
+            'chunks': self.chunks,
+            'wall_seconds': wall,
+            'texts_per_second': self.texts / wall if wall else 0.0,
+            # Waktu menunggu hasil worker di proses utama (tinggi = worker menjadi bottleneck)
+            'wait_seconds': self.wait_seconds,
+            'stages': {
+                stage: {
+                    'seconds': seconds,
+                    'texts_per_second': self.texts / seconds if seconds else 0.0
+                }
+                for stage, seconds in self.stage_seconds.items()
+            }
+        }
+
+# Pool proses preprocessing yang dapat dipakai untuk banyak batch berturut-turut.
+# Dengan workers=1 preprocessing dijalankan di proses ini (tanpa overhead antar proses).
+class PreprocessPool:
+    def __init__(self, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, max_in_flight=None, start_method='spawn'):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        # Batas chunk yang sedang dikerjakan atau menunggu diambil hasilnya
+        self.max_in_flight = max_in_flight or 2 * self.workers
+        self.stats = PipelineStats()
+        self._executor = None
+        if self.workers > 1:
+            # 'spawn' agar worker tidak mewarisi state TensorFlow/Streamlit dari proses utama
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(start_method),
+                initializer=_init_worker
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self.stats.finished = time.perf_counter()
+
+    # Preprocessing iterator teks, menghasilkan (teks hasil, token) per chunk sesuai urutan input
+    def iter_chunks(self, texts):
+        chunks = iter(lambda it=iter(texts): list(itertools.islice(it, self.chunk_size)), [])
+
+        if self._executor is None:
+            for chunk in chunks:
+                processed_texts, token_lists, timings = preprocess_chunk(chunk)
+                self.stats.add_chunk(len(chunk), timings)
+                yield processed_texts, token_lists
+            return
+
+        pending = collections.deque()
+        for chunk in chunks:
+            if len(pending) >= self.max_in_flight:
+                yield self._collect(pending.popleft())
+            pending.append((len(chunk), self._executor.submit(preprocess_chunk, chunk)))
+        while pending:
+            yield self._collect(pending.popleft())
+
+    def _collect(self, item):
+        size, future = item
+        start = time.perf_counter()
+        processed_texts, token_lists, timings = future.result()
+        self.stats.wait_seconds += time.perf_counter() - start
+        self.stats.add_chunk(size, timings)
+        return processed_texts, token_lists
+
+    # Preprocessing daftar teks, antarmukanya sama dengan engine.preprocess_texts
+    def preprocess_texts(self, texts):
+        processed_texts = []
+        token_lists = []
+        for chunk_texts, chunk_tokens in self.iter_chunks(texts):
+            processed_texts.extend(chunk_texts)
+            token_lists.extend(chunk_tokens)
+        return processed_texts, token_lists
+
+# Fungsi preprocessing paralel sekali jalan
+def preprocess_texts_parallel(texts, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    if workers == 1:
+        return preprocess_texts(texts)
+    with PreprocessPool(workers, chunk_size) as pool:
+        return pool.preprocess_texts(texts)
+
+# Fungsi untuk membaca kolom teks dari CSV secara bertahap
+def _read_csv_texts(path, text_field):
+    with open(path, encoding='utf-8', newline='') as handle:
+        for record in csv.DictReader(handle):
+            yield record.get(text_field) or ''
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.parallel',
+        description="Preprocessing teks CSV secara paralel dengan beberapa proses."
+    )
+    parser.add_argument('--input', default=DATASET_PATH, help="File CSV input")
+    parser.add_argument('--text-field', default='full_text', help="Kolom teks (default: full_text)")
+    parser.add_argument('--output', default=None,
+                        help="File CSV hasil (kolom processed_text); jika kosong hanya statistik yang ditulis")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses (default: jumlah core)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Jumlah teks per chunk (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                        help="Jumlah chunk maksimum yang sedang diproses (default: 2 x workers)")
+    args = parser.parse_args(argv)
+
+    output = open(args.output, 'w', encoding='utf-8', newline='') if args.output else None
+    writer = csv.writer(output) if output else None
+    if writer:
+        writer.writerow(['processed_text'])
+
+    with PreprocessPool(args.workers, args.chunk_size, args.max_in_flight) as pool:
+        for processed_texts, _ in pool.iter_chunks(_read_csv_texts(args.input, args.text_field)):
+            if writer:
+                writer.writerows([text] for text in processed_texts)
+    if output:
+        output.close()
+
+    report = pool.stats.as_dict()
+    report['workers'] = pool.workers
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+# Cache prediksi berbasis isi teks untuk retweet, kampanye copy-paste dan teks berulang.
+# Kunci cache = hash(teks ternormalisasi) + algoritma + fingerprint file model dan tokenizer,
+# sehingga teks yang sama cukup di-preprocess dan diprediksi sekali. Cache terdiri dari dua
+# tingkat: LRU di memori dan SQLite di disk (dipakai bersama antar proses dan antar run).
+# Jika file .h5/.tflite atau tokenizer.pickle berubah selama proses berjalan, fingerprint
+# berubah, entri lama dihapus dan model dimuat ulang. Entri dengan fingerprint lain yang sudah
+# ada di disk saat start (run lama, atau proses lain dengan backend/padding berbeda yang memakai
+# database yang sama) tidak pernah terbaca karena kuncinya berbeda, dan dibuang oleh batas
+# ukuran/umur cache.
+#
+#   python -m sentimen --cache < tweets.jsonl        # CLI dengan cache prediksi
+#   python -m sentimen.prediction_cache             # statistik cache di disk
+#   python -m sentimen.prediction_cache --clear     # kosongkan cache
+import argparse
+import collections
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from .engine import (
+    BASE_DIR,
+    TOKENIZER_PATH,
+    get_model_path,
+    get_tokenizer,
+    load_sentiment_model,
+    padding_signature,
+    predict_padded,
+    preprocess_texts,
+    texts_to_padded,
+)
+from .normalizer import normalize_texts
+
+# Lokasi default database cache prediksi
+PREDICTION_CACHE_PATH = os.path.join(BASE_DIR, 'cache', 'predictions.sqlite')
+
+# Batas ukuran cache (jumlah entri) di memori dan di disk, serta umur maksimum entri (detik, 0 = tanpa batas)
+PREDICTION_CACHE_MEMORY_SIZE = int(os.environ.get('SENTIMEN_PREDICTION_CACHE_MEMORY', 100000))
+PREDICTION_CACHE_DISK_SIZE = int(os.environ.get('SENTIMEN_PREDICTION_CACHE_DISK', 1000000))
+PREDICTION_CACHE_MAX_AGE = float(os.environ.get('SENTIMEN_PREDICTION_CACHE_MAX_AGE', 0))
+
+# Fingerprint file yang sudah dihitung, per (path, ukuran, mtime)
+_file_digests = {}
+_file_digests_lock = threading.Lock()
+
+# Fungsi hash isi file (dihitung ulang hanya jika ukuran atau waktu modifikasi berubah)
+def _file_digest(path):
+    stat = os.stat(path)
+    signature = (path, stat.st_size, stat.st_mtime_ns)
+    with _file_digests_lock:
+        if signature in _file_digests:
+            return _file_digests[signature]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(block)
+    with _file_digests_lock:
+        _file_digests[signature] = digest.hexdigest()
+    return _file_digests[signature]
+
+# Fungsi fingerprint model: hash file model (sesuai backend) dan tokenizer, ditambah mode
+# padding dinamis jika aktif (skornya berbeda dari padding tetap)
+def model_fingerprint(model_type):
+    combined = _file_digest(get_model_path(model_type)) + _file_digest(TOKENIZER_PATH) + padding_signature()
+    return hashlib.sha256(combined.encode('ascii')).hexdigest()[:16]
+
+# Fungsi kunci cache untuk satu teks ternormalisasi
+def cache_key(normalized_text, model_type, fingerprint):
+    data = f'{model_type}\0{fingerprint}\0{normalized_text}'.encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+# Cache prediksi dua tingkat (memori + SQLite).
+# Nilai yang disimpan: teks hasil preprocessing dan skor model.
+class PredictionCache:
+    def __init__(self, path=PREDICTION_CACHE_PATH, memory_size=PREDICTION_CACHE_MEMORY_SIZE,
+                 disk_size=PREDICTION_CACHE_DISK_SIZE, max_age=PREDICTION_CACHE_MAX_AGE):
+        self.path = path
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self.max_age = max_age
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        # Teks kembar dalam satu batch yang cukup dihitung sekali
+        self.batch_duplicates = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._memory = collections.OrderedDict()
+        self._fingerprints = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.execute('''CREATE TABLE IF NOT EXISTS predictions (
+                key TEXT PRIMARY KEY,
+                model_type TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                processed_text TEXT NOT NULL,
+                model_score REAL NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            )''')
+            self._db.execute('CREATE INDEX IF NOT EXISTS predictions_last_used ON predictions (last_used)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS predictions_model ON predictions (model_type, fingerprint)')
+        # Perkiraan jumlah entri di disk (bisa lebih besar dari sebenarnya karena INSERT OR REPLACE);
+        # jumlah sebenarnya baru dihitung saat perkiraan melewati batas
+        self._disk_count = self.disk_entries()
+
+    # Daftarkan fungsi yang dipanggil saat file model/tokenizer berubah, callback(model_type)
+    def on_invalidate(self, callback):
+        self._listeners.append(callback)
+
+    # Fungsi untuk mengambil fingerprint model terkini. Jika berbeda dengan fingerprint yang
+    # sebelumnya dipakai proses ini, entri fingerprint lama dihapus dan model/tokenizer yang sudah
+    # dimuat di proses ini dibuang.
+    def fingerprint(self, model_type):
+        fingerprint = model_fingerprint(model_type)
+        with self._lock:
+            previous = self._fingerprints.get(model_type)
+            self._fingerprints[model_type] = fingerprint
+        if previous is not None and previous != fingerprint:
+            self.invalidations += 1
+            self._delete_stale(model_type, previous)
+            load_sentiment_model.cache_clear()
+            get_tokenizer.cache_clear()
+            for callback in self._listeners:
+                callback(model_type)
+        return fingerprint
+
+    # Hapus entri satu fingerprint lama (hanya fingerprint yang dipakai proses ini, sehingga entri
+    # proses lain dengan backend/padding berbeda pada database yang sama tetap ada)
+    def _delete_stale(self, model_type, stale_fingerprint):
+        with self._lock:
+            for key in [key for key, value in self._memory.items()
+                        if value[2] == model_type and value[3] == stale_fingerprint]:
+                del self._memory[key]
+            if self._db is not None:
+                self._db.execute('DELETE FROM predictions WHERE model_type = ? AND fingerprint = ?',
+                                 (model_type, stale_fingerprint))
+
+    # Ambil banyak entri sekaligus: {kunci: (teks hasil preprocessing, skor model)}
+    def get_many(self, keys):
+        found = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                value = self._memory.get(key)
+                if value is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = value[:2]
+                else:
+                    missing.append(key)
+            self.memory_hits += len(found)
+
+            if missing and self._db is not None:
+                now = time.time()
+                rows = []
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    rows += self._db.execute(
+                        'SELECT key, processed_text, model_score, model_type, fingerprint, created FROM predictions '
+                        f'WHERE key IN ({",".join("?" * len(chunk))})', chunk
+                    ).fetchall()
+                disk_found = {}
+                for key, processed_text, model_score, model_type, fingerprint, created in rows:
+                    if self.max_age and now - created > self.max_age:
+                        continue
+                    disk_found[key] = (processed_text, model_score)
+                    self._store_memory(key, (processed_text, model_score, model_type, fingerprint))
+                if disk_found:
+                    self._db.executemany('UPDATE predictions SET last_used = ? WHERE key = ?',
+                                         [(now, key) for key in disk_found])
+                self.disk_hits += len(disk_found)
+                found.update(disk_found)
+
+            self.misses += len(keys) - len(found)
+        return found
+
+    # Simpan banyak entri: items berisi (kunci, teks hasil preprocessing, skor model)
+    def put_many(self, items, model_type, fingerprint):
+        now = time.time()
+        with self._lock:
+            for key, processed_text, model_score in items:
+                self._store_memory(key, (processed_text, float(model_score), model_type, fingerprint))
+            if self._db is not None and items:
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    [(key, model_type, fingerprint, processed_text, float(model_score), now, now)
+                     for key, processed_text, model_score in items]
+                )
+                self._disk_count += len(items)
+                self._evict_disk()
+
+    def _store_memory(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    # Buang entri yang paling lama tidak dipakai jika melebihi batas; dibuang hingga 90% dari
+    # batas agar penghapusan tidak terjadi pada setiap penyimpanan
+    def _evict_disk(self):
+        if self._disk_count <= self.disk_size:
+            return
+        if self.max_age:
+            self._db.execute('DELETE FROM predictions WHERE created < ?', (time.time() - self.max_age,))
+        count = self._db.execute('SELECT COUNT(*) FROM predictions').fetchone()[0]
+        if count > self.disk_size:
+            excess = count - int(self.disk_size * 0.9)
+            self._db.execute('DELETE FROM predictions WHERE key IN '
+                             '(SELECT key FROM predictions ORDER BY last_used LIMIT ?)', (excess,))
+            self.evictions += excess
+            count -= excess
+        self._disk_count = count
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM predictions')
+                self._disk_count = 0
+
+    def disk_entries(self):
+        if self._db is None:
+            return 0
+        return self._db.execute('SELECT COUNT(*) FROM predictions').fetchone()[0]
+
+    def stats(self):
+        hits = self.memory_hits + self.disk_hits + self.batch_duplicates
+        lookups = hits + self.misses
+        return {
+            'memory_entries': len(self._memory),
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'batch_duplicates': self.batch_duplicates,
+            'misses': self.misses,
+            'hit_ratio': hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations
+        }
+
+    # Baris-baris metrik format Prometheus
+    def prometheus_lines(self):
+        stats = self.stats()
+        return [
+            '# TYPE sentimen_prediction_cache_hits_total counter',
+            f'sentimen_prediction_cache_hits_total{{tier="memory"}} {stats["memory_hits"]}',
+            f'sentimen_prediction_cache_hits_total{{tier="disk"}} {stats["disk_hits"]}',
+            f'sentimen_prediction_cache_hits_total{{tier="batch"}} {stats["batch_duplicates"]}',
+            '# TYPE sentimen_prediction_cache_misses_total counter',
+            f'sentimen_prediction_cache_misses_total {stats["misses"]}',
+            '# TYPE sentimen_prediction_cache_hit_ratio gauge',
+            f'sentimen_prediction_cache_hit_ratio {stats["hit_ratio"]}',
+            '# TYPE sentimen_prediction_cache_evictions_total counter',
+            f'sentimen_prediction_cache_evictions_total {stats["evictions"]}'
+        ]
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+# Fungsi untuk mengambil cache prediksi bersama (satu per proses)
+@functools.lru_cache(maxsize=None)
+def get_prediction_cache():
+    return PredictionCache(os.environ.get('SENTIMEN_PREDICTION_CACHE_PATH', PREDICTION_CACHE_PATH))
+
+# Fungsi tahap pertama prediksi dengan cache: cari teks di cache, lalu preprocessing dan
+# padding hanya untuk teks unik yang belum ada. Matriks input berada di kunci 'padded'
+# (None jika semua teks sudah ada di cache).
+def prepare_with_cache(texts, model_type, cache, preprocess=None):
+    texts = ['' if text is None else str(text) for text in texts]
+    fingerprint = cache.fingerprint(model_type)
+    keys = [cache_key(text, model_type, fingerprint) for text in normalize_texts(texts)]
+    unique_keys = list(dict.fromkeys(keys))
+    cache.batch_duplicates += len(keys) - len(unique_keys)
+    found = cache.get_many(unique_keys)
+
+    # Teks unik yang belum ada di cache
+    pending = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in pending:
+            pending[key] = text
+
+    processed_texts = padded = None
+    if pending:
+        processed_texts, _ = (preprocess or preprocess_texts)(list(pending.values()))
+        padded = texts_to_padded(get_tokenizer(), processed_texts)
+    return {
+        'model_type': model_type,
+        'fingerprint': fingerprint,
+        'keys': keys,
+        'found': found,
+        'pending_keys': list(pending),
+        'processed_texts': processed_texts,
+        'padded': padded
+    }
+
+# Fungsi tahap kedua: simpan skor model untuk teks yang belum ada di cache dan susun hasil
+# sesuai urutan input. Mengembalikan teks hasil preprocessing dan skor model per teks.
+def complete_with_cache(prepared, scores, cache):
+    found = prepared['found']
+    if prepared['pending_keys']:
+        items = list(zip(prepared['pending_keys'], prepared['processed_texts'], np.asarray(scores, dtype=float)))
+        cache.put_many(items, prepared['model_type'], prepared['fingerprint'])
+        found.update((key, (processed_text, score)) for key, processed_text, score in items)
+    keys = prepared['keys']
+    return [found[key][0] for key in keys], np.array([found[key][1] for key in keys], dtype=float)
+
+# Fungsi prediksi dengan cache: hanya teks yang belum ada di cache yang di-preprocess dan
+# diprediksi, dan teks yang sama dalam satu batch hanya dihitung sekali.
+# predict_fn menerima matriks input dan mengembalikan skor; default memakai model dari engine.
+# Mengembalikan teks hasil preprocessing dan skor model untuk setiap teks input.
+def predict_with_cache(texts, model_type, cache, predict_fn=None, batch_size=1024, preprocess=None):
+    prepared = prepare_with_cache(texts, model_type, cache, preprocess)
+    scores = None
+    if prepared['padded'] is not None:
+        if predict_fn is None:
+            scores = predict_padded(load_sentiment_model(model_type), prepared['padded'], batch_size)
+        else:
+            scores = predict_fn(prepared['padded'])
+    return complete_with_cache(prepared, scores, cache)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.prediction_cache',
+        description="Kelola cache prediksi di disk."
+    )
+    parser.add_argument('--path', default=PREDICTION_CACHE_PATH, help="Lokasi database cache")
+    parser.add_argument('--clear', action='store_true', help="Hapus semua entri")
+    args = parser.parse_args(argv)
+
+    cache = PredictionCache(args.path)
+    if args.clear:
+        cache.clear()
+    rows = cache._db.execute(
+        'SELECT model_type, fingerprint, COUNT(*) FROM predictions GROUP BY model_type, fingerprint'
+    ).fetchall()
+    print(json.dumps({
+        'path': args.path,
+        'entries': cache.disk_entries(),
+        'models': [{'model_type': model_type, 'fingerprint': fingerprint, 'entries': count}
+                   for model_type, fingerprint, count in rows]
+    }, indent=2))
+    cache.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+# Server inferensi lokal dengan micro-batching.
+# Permintaan yang datang bersamaan digabung menjadi satu batch dinamis sebelum model.predict,
+# sehingga banyak sesi Streamlit atau klien API berbagi satu instance model per algoritma.
+#
+#   python -m sentimen.server --port 8500 --max-batch-size 64 --max-wait-ms 5
+#
+# Endpoint:
+#   POST /predict  {"texts": ["..."], "model": "GRU"}  -> {"results": [...]}
+#   GET  /metrics  metrik format Prometheus (latensi p50/p99, histogram ukuran batch, durasi per tahap)
+#   GET  /health
+import argparse
+import json
+import logging
+import queue
+import threading
+import time
+import urllib.request
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from .engine import (
+    MODEL_TYPES,
+    build_results,
+    check_sentiment_keywords_batch,
+    get_tokenizer,
+    load_sentiment_model,
+    model_files_available,
+    preprocess_texts,
+    texts_to_padded,
+)
+from .prediction_cache import get_prediction_cache, predict_with_cache
+from .shadow import get_shadow_scorer
+from .tracing import LATENCY_BUCKETS, STAGE_METRICS, Histogram, Trace
+
+logger = logging.getLogger(__name__)
+
+# Batas bucket histogram ukuran batch (bucket latensi: tracing.LATENCY_BUCKETS)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+# Penanda di antrean MicroBatcher agar thread-nya berhenti
+_STOP = object()
+
+# Error saat mengirim input ke MicroBatcher yang sudah dihentikan
+class BatcherStopped(RuntimeError):
+    pass
+
+# Penggabung permintaan menjadi batch dinamis.
+# predict_fn menerima matriks input (batch x fitur) dan mengembalikan skor per baris.
+class MicroBatcher:
+    def __init__(self, predict_fn, max_batch_size=64, max_wait_ms=5.0, name='model'):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self._queue = queue.Queue()
+        self._stopped = False
+        self._submit_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f'microbatcher-{name}', daemon=True)
+        self._thread.start()
+
+    # Kirim satu baris input, hasilnya diambil dari Future
+    def submit(self, row):
+        future = Future()
+        with self._submit_lock:
+            if self._stopped:
+                raise BatcherStopped(f"MicroBatcher {self.name} sudah dihentikan.")
+            self._queue.put((row, future, time.perf_counter()))
+        return future
+
+    # Hentikan thread batcher. Input yang sudah dikirim tetap diprediksi lebih dulu.
+    def stop(self, timeout=None):
+        with self._submit_lock:
+            if not self._stopped:
+                self._stopped = True
+                self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    # Kirim banyak baris dan tunggu semua hasilnya
+    def predict(self, rows, timeout=None):
+        futures = [self.submit(row) for row in rows]
+        return np.array([future.result(timeout) for future in futures])
+
+    # Ambil satu batch; mengembalikan (batch, True jika penanda berhenti sudah diterima)
+    def _collect_batch(self):
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._collect_batch()
+            if not batch:
+                continue
+            rows, futures, started = zip(*batch)
+            try:
+                scores = self.predict_fn(np.stack(rows))
+            except Exception as e:
+                logger.exception("Prediksi batch %s gagal", self.name)
+                for future in futures:
+                    future.set_exception(e)
+                continue
+
+            finished = time.perf_counter()
+            self.batch_sizes.observe(len(batch))
+            for future, score, start in zip(futures, scores, started):
+                self.latency.observe(finished - start)
+                future.set_result(float(score))
+
+    def stats(self):
+        return {
+            'requests': self.latency.count,
+            'batches': self.batch_sizes.count,
+            'mean_batch_size': self.batch_sizes.total / self.batch_sizes.count if self.batch_sizes.count else 0.0,
+            'latency_p50_ms': self.latency.percentile(50) * 1000,
+            'latency_p99_ms': self.latency.percentile(99) * 1000
+        }
+
+# Layanan analisis sentimen: satu MicroBatcher (dan satu model) per algoritma
+# Dengan cache (PredictionCache), teks yang pernah diprediksi tidak dikirim ke model lagi.
+# Dengan shadow (ShadowScorer), input yang sama juga dinilai model bayangan di thread latar.
+class SentimentService:
+    def __init__(self, max_batch_size=64, max_wait_ms=5.0, cache=None, shadow=None):
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.cache = cache
+        self.shadow = shadow
+        self._batchers = {}
+        # _lock hanya menjaga dict; pemuatan model memakai kunci per algoritma agar model yang
+        # sedang dimuat tidak menahan /metrics maupun permintaan untuk model yang sudah siap
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        if cache is not None:
+            # File model berubah: batcher lama memegang model lama, buat ulang saat dibutuhkan
+            cache.on_invalidate(self._drop_batcher)
+
+    def _drop_batcher(self, model_type):
+        with self._lock:
+            batcher = self._batchers.pop(model_type, None)
+        if batcher is not None:
+            batcher.stop()
+
+    def get_batcher(self, model_type):
+        with self._lock:
+            batcher = self._batchers.get(model_type)
+            if batcher is not None:
+                return batcher
+            load_lock = self._load_locks.setdefault(model_type, threading.Lock())
+        with load_lock:
+            with self._lock:
+                batcher = self._batchers.get(model_type)
+            if batcher is None:
+                model = load_sentiment_model(model_type)
+                batcher = MicroBatcher(
+                    lambda batch: np.asarray(model.predict_on_batch(batch))[:, 0],
+                    self.max_batch_size, self.max_wait_ms, name=model_type
+                )
+                with self._lock:
+                    self._batchers[model_type] = batcher
+            return batcher
+
+    # Prediksi model utama; input dan skornya lalu dikirim ke model bayangan tanpa menunggu
+    def _predict(self, model_type, padded, keyword_scores=None):
+        start = time.perf_counter()
+        try:
+            scores = self.get_batcher(model_type).predict(padded)
+        except BatcherStopped:
+            # Batcher diganti (file model berubah) di tengah permintaan: ulangi dengan yang baru
+            scores = self.get_batcher(model_type).predict(padded)
+        if self.shadow is not None and self.shadow.model_type != model_type and len(padded):
+            self.shadow.submit(padded, model_type, scores, time.perf_counter() - start, keyword_scores)
+        return scores
+
+    def score(self, texts, model_type):
+        texts = ['' if text is None else str(text) for text in texts]
+        with Trace('server', model=model_type, texts=len(texts)) as trace:
+            with trace.span('keywords'):
+                keyword_results = check_sentiment_keywords_batch(texts)
+            if not texts or not model_files_available(model_type):
+                return build_results(keyword_results)
+
+            if self.cache is not None:
+                with trace.span('predict', cached=True):
+                    processed_texts, model_scores = predict_with_cache(
+                        texts, model_type, self.cache,
+                        predict_fn=lambda padded: self._predict(model_type, padded)
+                    )
+                return build_results(keyword_results, processed_texts, model_scores, model_type)
+
+            with trace.span('preprocess'):
+                processed_texts, _ = preprocess_texts(texts)
+            with trace.span('tokenize'):
+                padded = texts_to_padded(get_tokenizer(), processed_texts)
+            with trace.span('model_load'):
+                self.get_batcher(model_type)
+            # Termasuk waktu menunggu batch dikumpulkan oleh MicroBatcher
+            with trace.span('predict'):
+                model_scores = self._predict(model_type, padded, keyword_results['keyword_score'])
+            return build_results(keyword_results, processed_texts, model_scores, model_type)
+
+    def prometheus_metrics(self):
+        lines = [
+            '# TYPE sentimen_request_latency_seconds histogram',
+            '# TYPE sentimen_batch_size histogram',
+            '# TYPE sentimen_request_latency_p50_seconds gauge',
+            '# TYPE sentimen_request_latency_p99_seconds gauge'
+        ]
+        with self._lock:
+            batchers = dict(self._batchers)
+        for model_type, batcher in batchers.items():
+            labels = f'model="{model_type}"'
+            lines += batcher.latency.prometheus_lines('sentimen_request_latency_seconds', labels)
+            lines += batcher.batch_sizes.prometheus_lines('sentimen_batch_size', labels)
+            lines.append(f'sentimen_request_latency_p50_seconds{{{labels}}} {batcher.latency.percentile(50)}')
+            lines.append(f'sentimen_request_latency_p99_seconds{{{labels}}} {batcher.latency.percentile(99)}')
+        if self.cache is not None:
+            lines += self.cache.prometheus_lines()
+        if self.shadow is not None:
+            lines += self.shadow.prometheus_lines()
+        lines += STAGE_METRICS.prometheus_lines()
+        return '\n'.join(lines) + '\n'
+
+# Handler HTTP untuk SentimentService
+class SentimentRequestHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def _send(self, status, body, content_type='application/json'):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self._send(200, self.service.prometheus_metrics(), 'text/plain; version=0.0.4')
+        elif self.path == '/health':
+            self._send(200, json.dumps({'status': 'ok'}))
+        else:
+            self._send(404, json.dumps({'error': 'not found'}))
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send(404, json.dumps({'error': 'not found'}))
+            return
+        try:
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            except ValueError as e:
+                self._send(400, json.dumps({'error': f"Body bukan JSON yang valid: {e}"}))
+                return
+            if not isinstance(payload, dict):
+                self._send(400, json.dumps({'error': "Body harus berupa objek JSON."}))
+                return
+            texts = payload.get('texts')
+            if texts is None:
+                texts = [payload.get('text', '')]
+            if not isinstance(texts, list):
+                # String akan dinilai per karakter
+                self._send(400, json.dumps({'error': "Field texts harus berupa list teks."}))
+                return
+            model_type = payload.get('model', 'BI-LSTM')
+            if model_type not in MODEL_TYPES:
+                self._send(400, json.dumps({'error': f"Model type {model_type} tidak dikenali."}))
+                return
+            results = self.service.score(texts, model_type)
+        except Exception as e:
+            logger.exception("Permintaan /predict gagal")
+            self._send(500, json.dumps({'error': str(e)}))
+            return
+        self._send(200, json.dumps({'results': results}, ensure_ascii=False))
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+# HTTP server multi-thread dengan antrean koneksi yang cukup untuk banyak klien bersamaan
+class SentimentHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+# Fungsi untuk membuat HTTP server (belum dijalankan)
+def create_server(host='127.0.0.1', port=8500, max_batch_size=64, max_wait_ms=5.0, cache=None, shadow=None):
+    handler = type('Handler', (SentimentRequestHandler,), {
+        'service': SentimentService(max_batch_size, max_wait_ms, cache, shadow)
+    })
+    return SentimentHTTPServer((host, port), handler)
+
+# Fungsi klien untuk memanggil server dari proses lain (misalnya aplikasi Streamlit)
+def predict_remote(texts, model_type, url, timeout=30):
+    request = urllib.request.Request(
+        url.rstrip('/') + '/predict',
+        data=json.dumps({'texts': list(texts), 'model': model_type}).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8'))['results']
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.server',
+        description="Server inferensi sentimen dengan micro-batching."
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8500)
+    parser.add_argument('--max-batch-size', type=int, default=64,
+                        help="Ukuran batch maksimum per panggilan model (default: 64)")
+    parser.add_argument('--max-wait-ms', type=float, default=5.0,
+                        help="Waktu tunggu maksimum untuk mengumpulkan batch dalam milidetik (default: 5)")
+    parser.add_argument('--preload', default='',
+                        help="Algoritma yang dimuat saat start, dipisah koma (misalnya LSTM,GRU)")
+    parser.add_argument('--cache', action='store_true',
+                        help="Gunakan cache prediksi (memori + SQLite) untuk teks berulang")
+    parser.add_argument('--shadow-model', choices=MODEL_TYPES, default=None,
+                        help="Model bayangan yang menilai input yang sama di thread latar (statistik di /metrics)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    cache = get_prediction_cache() if args.cache else None
+    shadow = get_shadow_scorer(args.shadow_model) if args.shadow_model else None
+    server = create_server(args.host, args.port, args.max_batch_size, args.max_wait_ms, cache, shadow)
+    for model_type in filter(None, (name.strip() for name in args.preload.split(','))):
+        server.RequestHandlerClass.service.get_batcher(model_type)
+
+    logger.info("Server sentimen berjalan di http://%s:%d", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+# Penilaian bayangan (shadow) dengan model kedua di luar jalur permintaan.
+# Setelah model utama selesai dan hasilnya dikirim ke pengguna, input yang sama (matriks sequence
+# yang sudah di-padding) dimasukkan ke antrean berukuran tetap dan dinilai model bayangan di thread
+# latar. Kesesuaian label dan selisih latensi terhadap model utama dicatat per model utama, sehingga
+# pergantian model dapat dievaluasi dengan trafik nyata tanpa menambah latensi pengguna.
+# Jika antrean penuh, pekerjaan baru dibuang (dihitung sebagai dropped), tidak pernah menunggu.
+#
+#   SENTIMEN_SHADOW_MODEL=GRU streamlit run aplikasi.py          # statistik di panel debug
+#   python -m sentimen.server --shadow-model GRU                  # statistik di GET /metrics
+#   python -m sentimen.shadow --primary BI-LSTM --shadow GRU      # simulasi beban pada dataset
+#
+# Setiap input yang selesai dinilai ditulis sebagai satu baris log JSON (logger sentimen.shadow).
+import argparse
+import collections
+import functools
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+
+from .engine import (
+    DATASET_PATH,
+    MAX_SEQUENCE_LENGTH,
+    MODEL_TYPES,
+    SENTIMENT_THRESHOLD,
+    combine_scores,
+    get_blend,
+    load_sentiment_model,
+    load_texts,
+    model_files_available,
+    predict_padded,
+)
+from .tracing import LATENCY_BUCKETS, Histogram
+
+logger = logging.getLogger(__name__)
+
+# Jumlah input maksimum yang menunggu dinilai model bayangan
+SHADOW_MAX_PENDING = int(os.environ.get('SENTIMEN_SHADOW_MAX_PENDING', 32))
+
+# Statistik model bayangan terhadap satu model utama
+class ShadowStats:
+    def __init__(self):
+        self.requests = 0
+        self.texts = 0
+        self.model_label_agreements = 0
+        self.label_agreements = 0
+        self.labeled_texts = 0
+        self.latency_delta_total = 0.0
+        self.primary_latency = Histogram(LATENCY_BUCKETS)
+        self.shadow_latency = Histogram(LATENCY_BUCKETS)
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'texts': self.texts,
+            'model_label_agreement': self.model_label_agreements / self.texts if self.texts else None,
+            'label_agreement': self.label_agreements / self.labeled_texts if self.labeled_texts else None,
+            'primary_p50_ms': self.primary_latency.percentile(50) * 1000,
+            'shadow_p50_ms': self.shadow_latency.percentile(50) * 1000,
+            'latency_delta_mean_ms': self.latency_delta_total * 1000 / self.requests if self.requests else 0.0
+        }
+
+# Penilai bayangan: antrean berukuran tetap dan satu thread latar untuk model bayangan
+class ShadowScorer:
+    def __init__(self, model_type, max_pending=SHADOW_MAX_PENDING, predict_fn=None):
+        self.model_type = model_type
+        self.max_pending = max_pending
+        self.predict_fn = predict_fn or (lambda padded: predict_padded(load_sentiment_model(model_type), padded))
+        self.submitted = 0
+        self.dropped = 0
+        self.failed = 0
+        self._stats = collections.defaultdict(ShadowStats)
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name=f'shadow-{model_type}', daemon=True)
+        self._thread.start()
+
+    # Kirim input yang sudah dinilai model utama beserta skor dan durasi prediksinya (detik).
+    # Tidak pernah menunggu: mengembalikan False jika antrean penuh dan input dibuang.
+    def submit(self, padded_sequences, primary_model, primary_scores, primary_seconds, keyword_scores=None):
+        item = (np.asarray(padded_sequences), primary_model, np.asarray(primary_scores, dtype=float),
+                float(primary_seconds), None if keyword_scores is None else np.asarray(keyword_scores, dtype=float))
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.submitted += 1
+        return True
+
+    def _run(self):
+        # Model bayangan dimuat dan dipanaskan lebih dulu agar waktu muat dan tracing fungsi
+        # prediksi Keras tidak ikut terhitung sebagai selisih latensi
+        try:
+            self.predict_fn(np.zeros((1, MAX_SEQUENCE_LENGTH), dtype=np.int32))
+        except Exception:
+            logger.exception("Model shadow %s gagal dimuat", self.model_type)
+        while True:
+            padded, primary_model, primary_scores, primary_seconds, keyword_scores = self._queue.get()
+            try:
+                self._score(padded, primary_model, primary_scores, primary_seconds, keyword_scores)
+            except Exception:
+                logger.exception("Penilaian shadow %s gagal", self.model_type)
+                with self._lock:
+                    self.failed += 1
+            finally:
+                self._queue.task_done()
+
+    def _score(self, padded, primary_model, primary_scores, primary_seconds, keyword_scores):
+        start = time.perf_counter()
+        scores = np.asarray(self.predict_fn(padded), dtype=float)
+        seconds = time.perf_counter() - start
+
+        model_agreements = int(np.sum((scores >= SENTIMENT_THRESHOLD) == (primary_scores >= SENTIMENT_THRESHOLD)))
+        label_agreements = None
+        if keyword_scores is not None:
+            # Label akhir masing-masing model dengan bobot dan ambangnya sendiri
+            label_agreements = int(np.sum(
+                (combine_scores(scores, keyword_scores, self.model_type) >= get_blend(self.model_type)[2]) ==
+                (combine_scores(primary_scores, keyword_scores, primary_model) >= get_blend(primary_model)[2])
+            ))
+        with self._lock:
+            stats = self._stats[primary_model]
+            stats.requests += 1
+            stats.texts += len(scores)
+            stats.model_label_agreements += model_agreements
+            if label_agreements is not None:
+                stats.label_agreements += label_agreements
+                stats.labeled_texts += len(scores)
+            stats.latency_delta_total += seconds - primary_seconds
+            stats.primary_latency.observe(primary_seconds)
+            stats.shadow_latency.observe(seconds)
+
+        logger.info(json.dumps({
+            'shadow': self.model_type,
+            'primary': primary_model,
+            'texts': len(scores),
+            'model_label_agreement': model_agreements / len(scores) if len(scores) else None,
+            'label_agreement': label_agreements / len(scores) if label_agreements is not None and len(scores)
+            else None,
+            'primary_ms': round(primary_seconds * 1000, 3),
+            'shadow_ms': round(seconds * 1000, 3),
+            'latency_delta_ms': round((seconds - primary_seconds) * 1000, 3)
+        }))
+
+    # Fungsi untuk menunggu antrean kosong (untuk laporan dan pengujian); False jika timeout
+    def wait_idle(self, timeout=None):
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                'shadow': self.model_type,
+                'submitted': self.submitted,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'pending': self._queue.qsize(),
+                'max_pending': self.max_pending,
+                'primary': {model_type: stats.as_dict() for model_type, stats in self._stats.items()}
+            }
+
+    def prometheus_lines(self):
+        with self._lock:
+            labels = f'shadow="{self.model_type}"'
+            lines = [
+                '# TYPE sentimen_shadow_submitted_total counter',
+                f'sentimen_shadow_submitted_total{{{labels}}} {self.submitted}',
+                '# TYPE sentimen_shadow_dropped_total counter',
+                f'sentimen_shadow_dropped_total{{{labels}}} {self.dropped}',
+                '# TYPE sentimen_shadow_pending gauge',
+                f'sentimen_shadow_pending{{{labels}}} {self._queue.qsize()}',
+                '# TYPE sentimen_shadow_label_agreement gauge',
+                '# TYPE sentimen_shadow_latency_seconds histogram'
+            ]
+            for primary_model, stats in self._stats.items():
+                pair = f'{labels},primary="{primary_model}"'
+                summary = stats.as_dict()
+                if summary['model_label_agreement'] is not None:
+                    lines.append(f'sentimen_shadow_label_agreement{{{pair},score="model"}} '
+                                 f'{summary["model_label_agreement"]}')
+                if summary['label_agreement'] is not None:
+                    lines.append(f'sentimen_shadow_label_agreement{{{pair},score="combined"}} '
+                                 f'{summary["label_agreement"]}')
+                lines += stats.shadow_latency.prometheus_lines('sentimen_shadow_latency_seconds', pair)
+            return lines
+
+# Fungsi untuk mengambil penilai bayangan bersama (satu per model bayangan per proses)
+@functools.lru_cache(maxsize=None)
+def get_shadow_scorer(model_type):
+    if model_type not in MODEL_TYPES:
+        raise ValueError(f"Model type {model_type} tidak dikenali.")
+    return ShadowScorer(model_type)
+
+# Fungsi simulasi beban: model utama menilai teks satu per satu (seperti halaman analisis) dengan jeda
+# interval_ms antar permintaan, dan setiap input dikirim ke model bayangan. Melaporkan latensi model
+# utama dengan dan tanpa shadow, waktu submit, jumlah input yang dibuang dan statistik kesesuaian.
+def shadow_report(primary_model, shadow_model, texts, max_pending=SHADOW_MAX_PENDING, interval_ms=50.0):
+    from .engine import check_sentiment_keywords_batch, get_tokenizer, preprocess_texts, texts_to_padded
+
+    processed_texts, _ = preprocess_texts(texts)
+    padded = texts_to_padded(get_tokenizer(), processed_texts)
+    keyword_scores = np.asarray(check_sentiment_keywords_batch(texts)['keyword_score'], dtype=float)
+    primary = load_sentiment_model(primary_model)
+    load_sentiment_model(shadow_model)
+
+    def run(scorer):
+        latencies = []
+        submit_latencies = []
+        for row in range(len(padded)):
+            start = time.perf_counter()
+            scores = predict_padded(primary, padded[row:row + 1])
+            seconds = time.perf_counter() - start
+            latencies.append(seconds)
+            if scorer is not None:
+                start = time.perf_counter()
+                scorer.submit(padded[row:row + 1], primary_model, scores, seconds, keyword_scores[row:row + 1])
+                submit_latencies.append(time.perf_counter() - start)
+            time.sleep(interval_ms / 1000)
+        return latencies, submit_latencies
+
+    # Pemanasan kedua model agar tracing fungsi prediksi Keras tidak ikut terukur
+    predict_padded(primary, padded[:1])
+    predict_padded(load_sentiment_model(shadow_model), padded[:1])
+    baseline, _ = run(None)
+    scorer = ShadowScorer(shadow_model, max_pending)
+    with_shadow, submit_latencies = run(scorer)
+    scorer.wait_idle()
+    return {
+        'texts': len(texts),
+        'interval_ms': interval_ms,
+        'primary_p50_ms': float(np.percentile(baseline, 50) * 1000) if baseline else 0.0,
+        'primary_p50_ms_with_shadow': float(np.percentile(with_shadow, 50) * 1000) if with_shadow else 0.0,
+        'submit_p99_us': float(np.percentile(submit_latencies, 99) * 1e6) if submit_latencies else 0.0,
+        **scorer.stats()
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.shadow',
+        description="Simulasikan penilaian bayangan model kedua pada dataset dan laporkan kesesuaian serta latensi."
+    )
+    parser.add_argument('--primary', choices=MODEL_TYPES, default='BI-LSTM', help="Model utama (default: BI-LSTM)")
+    parser.add_argument('--shadow', choices=MODEL_TYPES, default='GRU', help="Model bayangan (default: GRU)")
+    parser.add_argument('--data', default=DATASET_PATH, help="File CSV teks uji")
+    parser.add_argument('--text-field', default='full_text', help="Kolom teks (default: full_text)")
+    parser.add_argument('--limit', type=int, default=300, help="Jumlah baris (default: 300)")
+    parser.add_argument('--max-pending', type=int, default=SHADOW_MAX_PENDING,
+                        help="Ukuran antrean model bayangan (default: %(default)s)")
+    parser.add_argument('--interval-ms', type=float, default=50.0,
+                        help="Jeda antar permintaan dalam milidetik, 0 = beban penuh (default: 50)")
+    args = parser.parse_args(argv)
+
+    missing = [name for name in (args.primary, args.shadow) if not model_files_available(name)]
+    if missing:
+        parser.error(f"File model tidak ditemukan: {', '.join(missing)}")
+    if args.primary == args.shadow:
+        parser.error("Model utama dan model bayangan harus berbeda.")
+    report = shadow_report(args.primary, args.shadow, load_texts(args.data, args.text_field, args.limit),
+                           args.max_pending, args.interval_ms)
+    print(json.dumps(report, indent=2))
+    if report['failed']:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
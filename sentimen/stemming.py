@@ -0,0 +1,177 @@
+# Stemmer Sastrawi bersama (satu instance per proses) dengan cache kata -> kata dasar.
+# Distribusi kata pada tweet sangat Zipfian, sehingga sebagian besar pekerjaan stemming
+# berulang dan cukup dihitung sekali. Cache dibatasi ukurannya (LRU), dapat diisi awal
+# dari kosakata tokenizer.pickle dan disimpan ke disk untuk dipakai di run berikutnya.
+# Cache bersama proses dimuat dari disk saat pertama dipakai dan disimpan kembali saat proses
+# selesai (atexit) jika ada kata baru yang di-stem:
+#
+#   python -m sentimen.stemming --preload   # isi cache dari kosakata tokenizer lalu simpan
+import argparse
+import atexit
+import collections
+import functools
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Lokasi default file cache stemming
+STEM_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'stem_cache.json')
+
+# Ukuran maksimum cache (jumlah kata), dapat diatur lewat environment variable
+STEM_CACHE_SIZE = int(os.environ.get('SENTIMEN_STEM_CACHE_SIZE', 100000))
+
+# Kamus kata dasar berbasis set. ArrayDictionary bawaan Sastrawi memakai list sehingga
+# setiap pengecekan kata memindai ~30 ribu kata dasar satu per satu.
+class SetDictionary:
+    def __init__(self, words=None):
+        self.words = set(word for word in (words or []) if word and word.strip())
+
+    def contains(self, word):
+        return word in self.words
+
+    def count(self):
+        return len(self.words)
+
+    def add(self, word):
+        if word and word.strip():
+            self.words.add(word)
+
+    def add_words(self, words):
+        for word in words:
+            self.add(word)
+
+# Fungsi untuk membuat stemmer Sastrawi satu kali per proses
+@functools.lru_cache(maxsize=None)
+def get_stemmer():
+    from Sastrawi.Stemmer.Stemmer import Stemmer
+    from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+    return Stemmer(SetDictionary(StemmerFactory().get_words()))
+
+# Cache kata -> kata dasar dengan batas ukuran (LRU) dan statistik hit/miss
+class StemCache:
+    def __init__(self, stemmer=None, maxsize=STEM_CACHE_SIZE):
+        self.stemmer = stemmer
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._cache)
+
+    # Stem satu kata, memakai cache jika kata pernah di-stem sebelumnya
+    def stem(self, word):
+        with self._lock:
+            stem = self._cache.get(word)
+            if stem is not None:
+                self._cache.move_to_end(word)
+                self.hits += 1
+                return stem
+            self.misses += 1
+
+        if self.stemmer is None:
+            self.stemmer = get_stemmer()
+        stem = self.stemmer.stem(word)
+        self._store(word, stem)
+        return stem
+
+    # Stem daftar token
+    def stem_tokens(self, tokens):
+        return [self.stem(word) for word in tokens]
+
+    def _store(self, word, stem):
+        with self._lock:
+            self._cache[word] = stem
+            self._cache.move_to_end(word)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    # Isi cache dengan daftar kata tanpa menghitungnya sebagai hit/miss
+    def preload(self, words):
+        if self.stemmer is None:
+            self.stemmer = get_stemmer()
+        for word in words:
+            if word not in self._cache:
+                self._store(word, self.stemmer.stem(word))
+
+    # Isi cache dari kosakata (word_index) tokenizer Keras
+    def preload_from_tokenizer(self, tokenizer):
+        words = sorted(tokenizer.word_index, key=tokenizer.word_index.get)
+        self.preload(words[:self.maxsize])
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'size': len(self._cache),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0
+        }
+
+    # Simpan isi cache ke file JSON (urutan dari yang paling lama dipakai)
+    def save(self, path=STEM_CACHE_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._lock:
+            items = list(self._cache.items())
+        # File sementara per proses: beberapa worker dapat menyimpan bersamaan saat selesai
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(items, handle, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    # Muat isi cache dari file JSON, jika ada
+    def load(self, path=STEM_CACHE_PATH):
+        if not os.path.exists(path):
+            return 0
+        with open(path, encoding='utf-8') as handle:
+            items = json.load(handle)
+        for word, stem in items[-self.maxsize:]:
+            self._store(word, stem)
+        return len(items)
+
+# Fungsi untuk menyimpan cache bersama saat proses selesai, hanya jika ada kata baru (miss)
+def _save_on_exit(cache, path):
+    if not cache.misses:
+        return
+    try:
+        cache.save(path)
+    except OSError as e:
+        logger.warning("Cache stemming tidak dapat disimpan ke '%s': %s", path, e)
+
+# Fungsi untuk mengambil cache stemming bersama (satu per proses, dimuat dari disk jika ada
+# dan disimpan kembali saat proses selesai)
+@functools.lru_cache(maxsize=None)
+def get_stem_cache():
+    cache = StemCache()
+    try:
+        cache.load()
+    except (OSError, ValueError) as e:
+        logger.warning("Cache stemming '%s' tidak dapat dibaca: %s", STEM_CACHE_PATH, e)
+    atexit.register(_save_on_exit, cache, STEM_CACHE_PATH)
+    return cache
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.stemming',
+        description="Isi dan simpan cache stemming Sastrawi."
+    )
+    parser.add_argument('--preload', action='store_true',
+                        help="Isi cache dari kosakata tokenizer.pickle")
+    parser.add_argument('--path', default=STEM_CACHE_PATH, help="Lokasi file cache")
+    args = parser.parse_args(argv)
+
+    cache = StemCache()
+    cache.load(args.path)
+    if args.preload:
+        from .engine import get_tokenizer
+        cache.preload_from_tokenizer(get_tokenizer())
+    cache.save(args.path)
+    print(f"{len(cache)} kata tersimpan di {args.path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# Penyimpanan hasil analisis batch dalam format Parquet, dipartisi per hari created_at
+# (results/date=2025-03-09/<run>-0.parquet). Dashboard cukup membaca kolom dan partisi
+# tanggal yang dibutuhkan, sehingga agregasi ulang data berbulan-bulan tidak perlu
+# menganalisis ulang CSV mentah.
+#
+#   python -m sentimen.ingest ekspor.csv --store results --model GRU
+#   python -m sentimen.store --start 2025-01-01 --end 2025-03-31   # ringkasan harian
+import argparse
+import json
+import os
+import time
+import uuid
+
+from .engine import BASE_DIR, MODEL_TYPES, blend_signature, model_files_available
+
+RESULT_STORE_PATH = os.environ.get('SENTIMEN_RESULT_STORE', os.path.join(BASE_DIR, 'results'))
+
+# Format created_at pada ekspor X/Twitter, contoh: "Sun Mar 09 06:52:17 +0000 2025"
+CREATED_AT_FORMAT = '%a %b %d %H:%M:%S %z %Y'
+
+SENTIMENT_LABELS = ['Positif', 'Negatif', 'Netral']
+
+def _schema():
+    import pyarrow as pa
+    return pa.schema([
+        ('id_str', pa.string()),
+        ('created_at', pa.timestamp('s', tz='UTC')),
+        ('lang', pa.string()),
+        ('sentiment', pa.string()),
+        ('combined_score', pa.float64()),
+        ('model_score', pa.float64()),
+        ('keyword_score', pa.float64()),
+        ('positive_matches', pa.list_(pa.string())),
+        ('negative_matches', pa.list_(pa.string())),
+        ('model_type', pa.string()),
+        ('model_version', pa.string()),
+        ('date', pa.date32())
+    ])
+
+def _partitioning():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    return ds.partitioning(pa.schema([('date', pa.date32())]), flavor='hive')
+
+# Fungsi versi model: algoritma, fingerprint file model + tokenizer, serta bobot gabungan dan
+# ambang yang dipakai (berubah setelah kalibrasi), contoh "GRU@1a2b3c4d5e6f7a8b;blend=0.3,0.7,0.5".
+# Untuk mode ensemble (bukan salah satu MODEL_TYPES) fingerprint semua model yang tersedia digabung.
+def model_version(model_type):
+    from .prediction_cache import model_fingerprint
+    names = [model_type] if model_type in MODEL_TYPES else \
+        [name for name in MODEL_TYPES if model_files_available(name)]
+    fingerprints = '+'.join(f'{name}@{model_fingerprint(name)}' for name in names)
+    return f'{fingerprints};blend={blend_signature(model_type)}'
+
+# Fungsi daftar kata kunci: hasil engine berupa list, hasil aplikasi berupa teks "a, b"
+def _match_list(value):
+    if isinstance(value, str):
+        return [word for word in value.split(', ') if word]
+    return list(value) if value is not None else []
+
+# Fungsi untuk mengubah DataFrame hasil analisis menjadi tabel Arrow sesuai skema store.
+# Baris tanpa skor model (analisis kata kunci saja) tidak diberi model_type/model_version.
+def results_to_table(results, model_type=None):
+    import pandas as pd
+    import pyarrow as pa
+
+    rows = len(results)
+    created_at = pd.to_datetime(
+        results['created_at'] if 'created_at' in results.columns else pd.Series([None] * rows, index=results.index),
+        format=CREATED_AT_FORMAT, errors='coerce', utc=True
+    )
+    model_score = pd.to_numeric(results['model_score'], errors='coerce') if 'model_score' in results.columns \
+        else pd.Series([float('nan')] * rows, index=results.index)
+    has_model = model_score.notna()
+    version = model_version(model_type) if model_type and has_model.any() else None
+
+    def column(name):
+        if name not in results.columns:
+            return [None] * rows
+        return [None if pd.isna(value) else str(value) for value in results[name]]
+
+    frame = pd.DataFrame({
+        'id_str': column('id_str'),
+        'created_at': created_at.dt.floor('s'),
+        'lang': column('lang'),
+        'sentiment': results['sentiment'].astype(str).tolist(),
+        'combined_score': pd.to_numeric(results['combined_score'], errors='coerce').tolist(),
+        'model_score': model_score.tolist(),
+        'keyword_score': pd.to_numeric(results['keyword_score'], errors='coerce').tolist(),
+        'positive_matches': [_match_list(value) for value in results['positive_matches']],
+        'negative_matches': [_match_list(value) for value in results['negative_matches']],
+        'model_type': [model_type if flag else None for flag in has_model],
+        'model_version': [version if flag else None for flag in has_model],
+        'date': created_at.dt.date.tolist()
+    })
+    return pa.Table.from_pandas(frame, schema=_schema(), preserve_index=False)
+
+# Fungsi untuk menulis hasil analisis ke store. basename menentukan nama file di setiap
+# partisi; menulis ulang dengan basename yang sama menimpa file lama (dipakai ingest saat resume).
+def write_results(results, model_type=None, path=RESULT_STORE_PATH, basename=None):
+    import pyarrow.dataset as ds
+
+    table = results_to_table(results, model_type)
+    if table.num_rows == 0:
+        return 0
+    ds.write_dataset(
+        table, path, format='parquet', partitioning=_partitioning(),
+        basename_template=f'{basename or uuid.uuid4().hex}-{{i}}.parquet',
+        existing_data_behavior='overwrite_or_ignore'
+    )
+    return table.num_rows
+
+def _dataset(path):
+    import pyarrow.dataset as ds
+    return ds.dataset(path, format='parquet', partitioning=_partitioning(), schema=_schema())
+
+def _date_filter(start=None, end=None, model_type=None):
+    import datetime
+    import pyarrow.dataset as ds
+
+    expression = None
+    for value, compare in [(start, lambda field, day: field >= day), (end, lambda field, day: field <= day)]:
+        if value is None:
+            continue
+        day = datetime.date.fromisoformat(value) if isinstance(value, str) else value
+        condition = compare(ds.field('date'), day)
+        expression = condition if expression is None else expression & condition
+    if model_type is not None:
+        condition = ds.field('model_type') == model_type
+        expression = condition if expression is None else expression & condition
+    return expression
+
+# Fungsi untuk membaca hasil dari store. Hanya kolom dan partisi tanggal (start/end inklusif,
+# "YYYY-MM-DD") yang diminta yang dibaca dari disk.
+def read_results(path=RESULT_STORE_PATH, columns=None, start=None, end=None, model_type=None):
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"Result store '{path}' tidak ditemukan.")
+    table = _dataset(path).to_table(columns=columns, filter=_date_filter(start, end, model_type))
+    return table.to_pandas()
+
+# Fungsi ringkasan harian: jumlah tweet per label dan rata-rata skor per hari
+def daily_summary(path=RESULT_STORE_PATH, start=None, end=None, model_type=None):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"Result store '{path}' tidak ditemukan.")
+    table = _dataset(path).to_table(columns=['date', 'sentiment', 'combined_score', 'model_score'],
+                                    filter=_date_filter(start, end, model_type))
+    for label in SENTIMENT_LABELS:
+        table = table.append_column(label, pc.cast(pc.equal(table['sentiment'], label), pa.int64()))
+
+    summary = table.group_by('date').aggregate(
+        [('sentiment', 'count')] + [(label, 'sum') for label in SENTIMENT_LABELS] +
+        [('combined_score', 'mean'), ('model_score', 'mean')]
+    ).to_pandas().rename(columns={
+        'date': 'tanggal',
+        'sentiment_count': 'jumlah',
+        **{f'{label}_sum': label.lower() for label in SENTIMENT_LABELS},
+        'combined_score_mean': 'rata_rata_skor',
+        'model_score_mean': 'rata_rata_skor_model'
+    })
+    columns = ['tanggal', 'jumlah'] + [label.lower() for label in SENTIMENT_LABELS] + \
+        ['rata_rata_skor', 'rata_rata_skor_model']
+    return summary[columns].sort_values('tanggal', na_position='last').reset_index(drop=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.store',
+        description="Ringkasan harian hasil analisis dari result store Parquet."
+    )
+    parser.add_argument('--path', default=RESULT_STORE_PATH, help="Direktori result store")
+    parser.add_argument('--start', default=None, help="Tanggal awal (YYYY-MM-DD, inklusif)")
+    parser.add_argument('--end', default=None, help="Tanggal akhir (YYYY-MM-DD, inklusif)")
+    parser.add_argument('--model', choices=MODEL_TYPES, default=None, help="Hanya hasil algoritma ini")
+    parser.add_argument('--format', choices=['table', 'csv', 'json'], default='table',
+                        help="Format output (default: table)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    summary = daily_summary(args.path, args.start, args.end, args.model)
+    elapsed = time.perf_counter() - start
+
+    if args.format == 'csv':
+        print(summary.to_csv(index=False), end='')
+    elif args.format == 'json':
+        print(json.dumps(json.loads(summary.to_json(orient='records', date_format='iso')), indent=2))
+    else:
+        print(summary.to_string(index=False))
+        print(f"\n{int(summary['jumlah'].sum()):,} tweet, {len(summary)} hari, {elapsed:.2f} detik")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,601 @@
+# Mode streaming: tweet dari sumber yang terus bertambah dianalisis di background per micro-batch.
+# Sumber berupa file JSONL/CSV (skema dataset_10k.csv) yang di-tail, atau endpoint pencarian
+# X API v2 (GET /2/tweets/search/recent, bisa mock lokal). Hasil skor langsung dijumlahkan ke
+# agregat bergulir per menit dan per jam (volume, porsi positif, kata kunci terbanyak) yang
+# diperbarui secara inkremental. Halaman Streamlit cukup membaca snapshot agregat, bukan stream.
+#
+#   python -m sentimen.streaming replay dataset/dataset_10k.csv live.jsonl --rate 20   # file yang terus bertambah
+#   python -m sentimen.streaming mock-api --port 8600 --rate 20                         # mock X search API
+#   python -m sentimen.streaming watch live.jsonl --model GRU                           # agregat di terminal
+#   python -m sentimen.streaming watch http://127.0.0.1:8600 --model GRU
+#   SENTIMEN_STREAM_SOURCE=live.jsonl streamlit run aplikasi.py
+import argparse
+import collections
+import csv
+import datetime
+import io
+import json
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .engine import DATASET_PATH, MODEL_TYPES, model_files_available, score_texts, sentiment_label
+from .store import CREATED_AT_FORMAT
+
+logger = logging.getLogger(__name__)
+
+# Resolusi agregat bergulir: (nama, lebar bucket dalam detik, jumlah bucket yang disimpan)
+RESOLUTIONS = {
+    'minute': (60, 60),
+    'hour': (3600, 24)
+}
+
+# Batas antrean record yang belum dianalisis; pembaca sumber menunggu jika penuh
+MAX_PENDING_RECORDS = 10000
+
+# Jumlah byte maksimum yang dibaca dari file per poll (file besar dibaca bertahap)
+READ_BYTES = 4 * 1024 * 1024
+
+# Fungsi untuk membaca waktu tweet (format ekspor X atau ISO 8601 dari X API v2) sebagai detik epoch
+def parse_created_at(value):
+    if not value:
+        return None
+    value = str(value)
+    for parse in (lambda text: datetime.datetime.strptime(text, CREATED_AT_FORMAT),
+                  lambda text: datetime.datetime.fromisoformat(text.replace('Z', '+00:00'))):
+        try:
+            parsed = parse(value)
+        except ValueError:
+            continue
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+        return parsed.timestamp()
+    return None
+
+# Batas record CSV lengkap terakhir: baris baru di luar tanda kutip (field boleh berisi newline)
+_CSV_TOKEN = re.compile(rb'["\n]')
+
+def _csv_boundary(data):
+    quoted = False
+    boundary = 0
+    for match in _CSV_TOKEN.finditer(data):
+        if match.group() == b'"':
+            quoted = not quoted
+        elif not quoted:
+            boundary = match.end()
+    return boundary
+
+# Sumber file JSONL/CSV yang terus bertambah. poll() mengembalikan record lengkap yang baru
+# ditulis sejak poll sebelumnya; baris yang belum selesai ditulis ditunda ke poll berikutnya.
+# Jika file dipotong atau diganti (ukuran mengecil), pembacaan dimulai lagi dari awal.
+class TailFileSource:
+    def __init__(self, path, text_field='full_text', from_start=True):
+        self.path = path
+        self.text_field = text_field
+        self.format = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+        self.offset = 0 if from_start or not os.path.exists(path) else os.path.getsize(path)
+        self.header = None
+        self._pending = b''
+        if self.offset and self.format == 'csv':
+            with open(path, newline='', encoding='utf-8') as handle:
+                self.header = next(csv.reader(handle), None)
+
+    def __str__(self):
+        return self.path
+
+    def poll(self):
+        if not os.path.exists(self.path):
+            return []
+        size = os.path.getsize(self.path)
+        if size < self.offset:
+            self.offset, self.header, self._pending = 0, None, b''
+        if size == self.offset:
+            return []
+        with open(self.path, 'rb') as handle:
+            handle.seek(self.offset)
+            chunk = handle.read(min(size - self.offset, READ_BYTES))
+        self.offset += len(chunk)
+        data = self._pending + chunk
+
+        boundary = _csv_boundary(data) if self.format == 'csv' else data.rfind(b'\n') + 1
+        data, self._pending = data[:boundary], data[boundary:]
+        if not data:
+            return []
+        text = data.decode('utf-8', errors='replace')
+        return self._parse_csv(text) if self.format == 'csv' else self._parse_jsonl(text)
+
+    def _parse_jsonl(self, text):
+        records = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning("Baris JSONL tidak valid dilewati: %.80s", line)
+                continue
+            records.append(record if isinstance(record, dict) else {self.text_field: record})
+        return records
+
+    def _parse_csv(self, text):
+        rows = csv.reader(io.StringIO(text, newline=''))
+        if self.header is None:
+            self.header = next(rows, None)
+        return [dict(zip(self.header, row)) for row in rows if row]
+
+# Sumber endpoint pencarian X API v2 (atau mock-api). Setiap poll() meminta tweet dengan id
+# lebih besar dari since_id terakhir, mengikuti next_token sampai habis, lalu mengubahnya
+# ke skema dataset_10k.csv (id_str, full_text, created_at, lang).
+class SearchAPISource:
+    def __init__(self, url, query='makan bergizi gratis', max_results=100, bearer_token=None, timeout=10):
+        self.url = url.rstrip('/')
+        self.query = query
+        self.max_results = max_results
+        self.bearer_token = bearer_token or os.environ.get('SENTIMEN_X_BEARER_TOKEN', '')
+        self.timeout = timeout
+        self.since_id = None
+
+    def __str__(self):
+        return self.url
+
+    def _request(self, params):
+        request = urllib.request.Request(f"{self.url}/2/tweets/search/recent?{urllib.parse.urlencode(params)}")
+        if self.bearer_token:
+            request.add_header('Authorization', f'Bearer {self.bearer_token}')
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+    def poll(self):
+        params = {'query': self.query, 'max_results': self.max_results, 'tweet.fields': 'created_at,lang'}
+        if self.since_id is not None:
+            params['since_id'] = self.since_id
+        tweets, newest_id = [], None
+        while True:
+            payload = self._request(params)
+            meta = payload.get('meta', {})
+            newest_id = newest_id or meta.get('newest_id')
+            tweets += payload.get('data', [])
+            if not meta.get('next_token'):
+                break
+            params['next_token'] = meta['next_token']
+        if newest_id:
+            self.since_id = newest_id
+        # API mengembalikan tweet terbaru lebih dulu
+        return [{
+            'id_str': tweet.get('id'),
+            'full_text': tweet.get('text', ''),
+            'created_at': tweet.get('created_at'),
+            'lang': tweet.get('lang')
+        } for tweet in reversed(tweets)]
+
+# Fungsi untuk membuat sumber dari alamat: URL http(s) untuk X API, selain itu path file
+def open_source(spec, text_field='full_text', from_start=True):
+    if spec.startswith(('http://', 'https://')):
+        return SearchAPISource(spec)
+    return TailFileSource(spec, text_field, from_start)
+
+# Agregat satu bucket waktu
+class Bucket:
+    __slots__ = ('volume', 'positive', 'score_sum', 'positive_words', 'negative_words')
+
+    def __init__(self):
+        self.volume = 0
+        self.positive = 0
+        self.score_sum = 0.0
+        self.positive_words = collections.Counter()
+        self.negative_words = collections.Counter()
+
+# Agregat bergulir dengan satu resolusi: bucket disimpan berurutan waktu dan dibuang setelah
+# keluar jendela retensi (dihitung dari bucket terbaru, sehingga data replay tetap berlaku).
+# Kata kunci terbanyak di seluruh jendela disimpan sebagai Counter berjalan: ditambah saat
+# hasil masuk dan dikurangi saat bucket dibuang, tanpa menjumlah ulang semua bucket.
+class RollingWindow:
+    def __init__(self, width, retention):
+        self.width = width
+        self.retention = retention
+        self.buckets = collections.OrderedDict()
+        self.positive_words = collections.Counter()
+        self.negative_words = collections.Counter()
+        self.late = 0
+
+    def add(self, timestamp, positive, score, positive_words, negative_words):
+        start = int(timestamp // self.width) * self.width
+        newest = next(reversed(self.buckets)) if self.buckets else start
+        if start <= newest - self.width * self.retention:
+            # Lebih tua dari jendela retensi
+            self.late += 1
+            return
+        bucket = self.buckets.get(start)
+        if bucket is None:
+            bucket = self.buckets[start] = Bucket()
+            if start < newest:
+                # Tweet terlambat membuka bucket lama: urutkan ulang (jarang terjadi)
+                self.buckets = collections.OrderedDict(sorted(self.buckets.items()))
+        bucket.volume += 1
+        bucket.positive += positive
+        bucket.score_sum += score
+        bucket.positive_words.update(positive_words)
+        bucket.negative_words.update(negative_words)
+        self.positive_words.update(positive_words)
+        self.negative_words.update(negative_words)
+        self._evict()
+
+    def _evict(self):
+        newest = next(reversed(self.buckets))
+        while self.buckets:
+            start = next(iter(self.buckets))
+            if start > newest - self.width * self.retention:
+                break
+            bucket = self.buckets.pop(start)
+            self.positive_words.subtract(bucket.positive_words)
+            self.negative_words.subtract(bucket.negative_words)
+            # Buang kata yang hitungannya sudah nol agar Counter tidak terus membesar
+            self.positive_words = +self.positive_words
+            self.negative_words = +self.negative_words
+
+    def snapshot(self, top=10):
+        volume = sum(bucket.volume for bucket in self.buckets.values())
+        positive = sum(bucket.positive for bucket in self.buckets.values())
+        return {
+            'width_seconds': self.width,
+            'buckets': [{
+                'start': datetime.datetime.fromtimestamp(start, datetime.timezone.utc).isoformat(),
+                'volume': bucket.volume,
+                'positive_share': bucket.positive / bucket.volume,
+                'mean_score': bucket.score_sum / bucket.volume
+            } for start, bucket in self.buckets.items()],
+            'volume': volume,
+            'positive_share': positive / volume if volume else 0.0,
+            'top_positive_words': self.positive_words.most_common(top),
+            'top_negative_words': self.negative_words.most_common(top),
+            'late': self.late
+        }
+
+# Agregat bergulir per menit dan per jam. version bertambah setiap update, sehingga pembaca
+# dapat melewati render ulang jika tidak ada data baru.
+class RollingAggregates:
+    def __init__(self, resolutions=None, model_type=None):
+        # Model yang menskor hasil, menentukan ambang label positif (None: ambang bawaan)
+        self.model_type = model_type
+        self.windows = {name: RollingWindow(width, retention)
+                        for name, (width, retention) in (resolutions or RESOLUTIONS).items()}
+        self.total = 0
+        self.version = 0
+        self._lock = threading.Lock()
+
+    # Tambahkan hasil skor (dict dari build_results) dengan waktu masing-masing (detik epoch)
+    def update(self, results, timestamps):
+        with self._lock:
+            for result, timestamp in zip(results, timestamps):
+                positive = sentiment_label(result['combined_score'], self.model_type) == "Positif"
+                for window in self.windows.values():
+                    window.add(timestamp, positive, result['combined_score'],
+                               result['positive_matches'], result['negative_matches'])
+            self.total += len(results)
+            self.version += 1
+
+    def snapshot(self, top=10):
+        with self._lock:
+            return {
+                'version': self.version,
+                'total': self.total,
+                'windows': {name: window.snapshot(top) for name, window in self.windows.items()}
+            }
+
+# Penganalisis stream di background: satu thread membaca sumber ke antrean terbatas, satu
+# thread mengambil micro-batch (maksimal batch_size record atau menunggu max_wait detik)
+# lalu menskor dan menambahkannya ke agregat. score_fn(texts) -> list hasil build_results;
+# default score_texts lokal dengan model_type.
+class StreamScorer:
+    def __init__(self, source, model_type='BI-LSTM', aggregates=None, batch_size=256, max_wait=1.0,
+                 poll_interval=1.0, text_field='full_text', score_fn=None):
+        self.source = source
+        self.model_type = model_type
+        use_model = model_files_available(model_type)
+        self.aggregates = aggregates or RollingAggregates(model_type=model_type if use_model else None)
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.poll_interval = poll_interval
+        self.text_field = text_field
+        self.score_fn = score_fn or (lambda texts: score_texts(texts, model_type, batch_size, use_model=use_model))
+        self.received = self.scored = self.batches = self.errors = 0
+        self.last_batch_seconds = 0.0
+        self.last_error = None
+        self.started = time.time()
+        # Id unik per stream: versi agregat selalu mulai dari 0, sehingga stream lain atau stream
+        # yang dimulai ulang tidak boleh memakai cache grafik stream ini
+        self.run_id = uuid.uuid4().hex
+        self._queue = queue.Queue(MAX_PENDING_RECORDS)
+        self._stop = threading.Event()
+        self._threads = [threading.Thread(target=self._read, name='stream-reader', daemon=True),
+                         threading.Thread(target=self._score, name='stream-scorer', daemon=True)]
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join(timeout)
+
+    @property
+    def running(self):
+        return not self._stop.is_set() and all(thread.is_alive() for thread in self._threads)
+
+    def _read(self):
+        while not self._stop.is_set():
+            try:
+                records = self.source.poll()
+            except Exception as e:
+                logger.warning("Gagal membaca sumber stream %s: %s", self.source, e)
+                self.errors += 1
+                self.last_error = str(e)
+                records = []
+            for record in records:
+                arrived = time.time()
+                while not self._stop.is_set():
+                    try:
+                        self._queue.put((record, arrived), timeout=self.poll_interval)
+                        self.received += 1
+                        break
+                    except queue.Full:
+                        continue
+            if not records:
+                self._stop.wait(self.poll_interval)
+
+    def _collect_batch(self):
+        try:
+            batch = [self._queue.get(timeout=self.poll_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _score(self):
+        while not self._stop.is_set():
+            batch = self._collect_batch()
+            if not batch:
+                continue
+            records, arrivals = zip(*batch)
+            texts = ['' if record.get(self.text_field) is None else str(record.get(self.text_field))
+                     for record in records]
+            start = time.perf_counter()
+            try:
+                results = self.score_fn(texts)
+            except Exception as e:
+                logger.exception("Analisis micro-batch stream gagal")
+                self.errors += 1
+                self.last_error = str(e)
+                continue
+            # Waktu tweet dari created_at; waktu kedatangan jika tidak ada atau tidak valid
+            timestamps = [parse_created_at(record.get('created_at')) or arrived
+                          for record, arrived in zip(records, arrivals)]
+            self.aggregates.update(results, timestamps)
+            self.last_batch_seconds = time.perf_counter() - start
+            self.scored += len(results)
+            self.batches += 1
+
+    def stats(self):
+        elapsed = time.time() - self.started
+        return {
+            'source': str(self.source),
+            'model_type': self.model_type,
+            'running': self.running,
+            'received': self.received,
+            'scored': self.scored,
+            'pending': self._queue.qsize(),
+            'batches': self.batches,
+            'mean_batch_size': self.scored / self.batches if self.batches else 0.0,
+            'last_batch_ms': self.last_batch_seconds * 1000,
+            'tweets_per_second': self.scored / elapsed if elapsed else 0.0,
+            'errors': self.errors,
+            'last_error': self.last_error
+        }
+
+# Stream yang sedang berjalan per (sumber, model), dipakai bersama oleh semua sesi Streamlit
+_streams = {}
+_streams_lock = threading.Lock()
+
+def get_stream(spec, model_type, **options):
+    with _streams_lock:
+        scorer = _streams.get((spec, model_type))
+        if scorer is None or not scorer.running:
+            scorer = _streams[(spec, model_type)] = StreamScorer(open_source(spec), model_type, **options).start()
+        return scorer
+
+def stop_stream(spec, model_type):
+    with _streams_lock:
+        scorer = _streams.pop((spec, model_type), None)
+    if scorer is not None:
+        scorer.stop()
+
+def running_streams():
+    with _streams_lock:
+        return {key: scorer for key, scorer in _streams.items() if scorer.running}
+
+# Mock endpoint GET /2/tweets/search/recent: baris dataset dirilis bertahap sebanyak rate per
+# detik sejak server dimulai, dengan id berurutan dan created_at waktu rilis.
+class MockSearchAPI:
+    def __init__(self, records, rate=10.0, text_field='full_text'):
+        self.records = records
+        self.rate = rate
+        self.text_field = text_field
+        self.started = time.time()
+
+    def released(self):
+        return min(len(self.records), int((time.time() - self.started) * self.rate))
+
+    def search(self, since_id=None, max_results=10, next_token=None):
+        max_results = max(10, min(int(max_results), 100))
+        newest = self.released()
+        # Id tweet = posisi baris + 1; halaman diurutkan dari tweet terbaru
+        until = int(next_token) if next_token else newest
+        since = int(since_id) if since_id else 0
+        ids = list(range(until, max(since, until - max_results), -1))
+        data = [{
+            'id': str(tweet_id),
+            'text': self.records[tweet_id - 1].get(self.text_field, ''),
+            'created_at': datetime.datetime.fromtimestamp(
+                self.started + tweet_id / self.rate, datetime.timezone.utc).isoformat().replace('+00:00', 'Z'),
+            'lang': self.records[tweet_id - 1].get('lang')
+        } for tweet_id in ids]
+        meta = {'result_count': len(data)}
+        if data:
+            meta['newest_id'], meta['oldest_id'] = data[0]['id'], data[-1]['id']
+            if ids[-1] - 1 > since:
+                meta['next_token'] = str(ids[-1] - 1)
+        return {'data': data, 'meta': meta} if data else {'meta': meta}
+
+class MockSearchRequestHandler(BaseHTTPRequestHandler):
+    api = None
+
+    def _send(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        if url.path != '/2/tweets/search/recent':
+            self._send(404, {'error': 'not found'})
+            return
+        params = dict(urllib.parse.parse_qsl(url.query))
+        try:
+            self._send(200, self.api.search(params.get('since_id'), params.get('max_results', 10),
+                                            params.get('next_token')))
+        except ValueError as e:
+            self._send(400, {'error': str(e)})
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+# Fungsi untuk membuat mock server X search API (belum dijalankan)
+def create_mock_server(records, host='127.0.0.1', port=8600, rate=10.0):
+    handler = type('Handler', (MockSearchRequestHandler,), {'api': MockSearchAPI(records, rate)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+# Fungsi untuk menulis ulang baris dataset ke file JSONL/CSV secara bertahap (simulasi sumber live).
+# created_at diganti waktu saat ditulis, karena ekspor diurutkan dari tweet terbaru dan
+# rentangnya berbulan-bulan; keep_created_at mempertahankan waktu asli.
+def replay(data_path, output_path, rate=10.0, limit=None, keep_created_at=False):
+    with open(data_path, newline='', encoding='utf-8') as handle:
+        records = list(csv.DictReader(handle))[:limit]
+    as_csv = output_path.lower().endswith('.csv')
+    with open(output_path, 'a', newline='', encoding='utf-8') as output:
+        writer = None
+        if as_csv and records:
+            writer = csv.DictWriter(output, fieldnames=list(records[0]))
+            if output.tell() == 0:
+                writer.writeheader()
+        for i, record in enumerate(records):
+            if not keep_created_at:
+                record['created_at'] = time.strftime('%a %b %d %H:%M:%S +0000 %Y', time.gmtime())
+            if writer:
+                writer.writerow(record)
+            else:
+                output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            output.flush()
+            time.sleep(1.0 / rate)
+    return len(records)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.streaming',
+        description="Analisis sentimen live dari file yang terus bertambah atau X search API."
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    watch = commands.add_parser('watch', help="Analisis stream dan cetak agregat bergulir secara berkala")
+    watch.add_argument('source', help="File JSONL/CSV yang di-tail atau URL X API (http://...)")
+    watch.add_argument('--model', choices=MODEL_TYPES, default='BI-LSTM',
+                       help="Algoritma yang digunakan (default: BI-LSTM)")
+    watch.add_argument('--batch-size', type=int, default=256, help="Ukuran micro-batch maksimum (default: 256)")
+    watch.add_argument('--max-wait', type=float, default=1.0,
+                       help="Waktu tunggu maksimum untuk mengumpulkan micro-batch dalam detik (default: 1)")
+    watch.add_argument('--interval', type=float, default=5.0, help="Jeda cetak agregat dalam detik (default: 5)")
+    watch.add_argument('--duration', type=float, default=None, help="Berhenti setelah sekian detik")
+    watch.add_argument('--text-field', default='full_text', help="Kolom teks (default: full_text)")
+    watch.add_argument('--tail', action='store_true', help="Mulai dari akhir file (abaikan isi yang sudah ada)")
+
+    mock = commands.add_parser('mock-api', help="Jalankan mock X search API dari baris dataset")
+    mock.add_argument('--data', default=DATASET_PATH, help="File CSV sumber tweet")
+    mock.add_argument('--host', default='127.0.0.1')
+    mock.add_argument('--port', type=int, default=8600)
+    mock.add_argument('--rate', type=float, default=10.0, help="Tweet baru per detik (default: 10)")
+
+    replay_parser = commands.add_parser('replay', help="Tulis baris dataset ke file JSONL/CSV secara bertahap")
+    replay_parser.add_argument('data', help="File CSV sumber tweet")
+    replay_parser.add_argument('output', help="File JSONL/CSV tujuan (ditambahkan di akhir)")
+    replay_parser.add_argument('--rate', type=float, default=10.0, help="Baris per detik (default: 10)")
+    replay_parser.add_argument('--limit', type=int, default=None, help="Jumlah baris maksimum")
+    replay_parser.add_argument('--keep-created-at', action='store_true',
+                               help="Pertahankan created_at asli (default: diganti waktu saat ditulis)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == 'replay':
+        rows = replay(args.data, args.output, args.rate, args.limit, args.keep_created_at)
+        print(f"{rows:,} baris ditulis ke {args.output}", file=sys.stderr)
+    elif args.command == 'mock-api':
+        with open(args.data, newline='', encoding='utf-8') as handle:
+            records = list(csv.DictReader(handle))
+        server = create_mock_server(records, args.host, args.port, args.rate)
+        logger.info("Mock X search API berjalan di http://%s:%d/2/tweets/search/recent", args.host, args.port)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    else:
+        if not model_files_available(args.model):
+            print(f"Peringatan: file model {args.model} atau tokenizer tidak ditemukan. "
+                  "Menggunakan analisis berdasarkan kata kunci saja.", file=sys.stderr)
+        source = open_source(args.source, args.text_field, from_start=not args.tail)
+        scorer = StreamScorer(source, args.model, batch_size=args.batch_size, max_wait=args.max_wait,
+                              text_field=args.text_field).start()
+        deadline = time.time() + args.duration if args.duration else None
+        try:
+            while deadline is None or time.time() < deadline:
+                time.sleep(args.interval if deadline is None else max(0.0, min(args.interval, deadline - time.time())))
+                snapshot = scorer.aggregates.snapshot(top=5)
+                minute = snapshot['windows']['minute']
+                print(json.dumps({
+                    'stream': scorer.stats(),
+                    'last_minutes': minute['buckets'][-5:],
+                    'positive_share_60m': minute['positive_share'],
+                    'top_positive_words': minute['top_positive_words'],
+                    'top_negative_words': minute['top_negative_words']
+                }, ensure_ascii=False))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            scorer.stop()
+
+if __name__ == "__main__":
+    main()
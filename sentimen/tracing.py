@@ -0,0 +1,222 @@
+# Tracing dan metrik per tahap (kata kunci, muat model, preprocessing, tokenisasi, prediksi,
+# render grafik). Setiap permintaan dicatat sebagai Trace berisi span per tahap; durasi span
+# juga masuk ke histogram per tahap milik proses (STAGE_METRICS) yang diekspor dalam format
+# Prometheus. Trace yang selesai ditulis sebagai satu baris log JSON (logger sentimen.tracing,
+# level INFO; aktifkan dengan SENTIMEN_TRACE_LOG=1 untuk aplikasi Streamlit).
+#
+#   SENTIMEN_METRICS_PORT=9100 streamlit run aplikasi.py   # GET http://127.0.0.1:9100/metrics
+#   SENTIMEN_TRACE_LOG=1 streamlit run aplikasi.py         # satu baris JSON per analisis
+import collections
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+if os.environ.get('SENTIMEN_TRACE_LOG') == '1':
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+# Batas bucket histogram latensi (detik)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Nama tahap yang dipakai aplikasi dan server beserta labelnya
+STAGE_LABELS = {
+    'keywords': "Analisis kata kunci",
+    'model_load': "Memuat model",
+    'preprocess': "Preprocessing (regex, stopwords, stemming)",
+    'tokenize': "Tokenisasi dan padding",
+    'near_duplicates': "Pengelompokan hampir-duplikat",
+    'predict': "Prediksi model",
+    'explain': "Atribusi token (occlusion)",
+    'render': "Render grafik"
+}
+
+# Histogram sederhana dengan jendela nilai terakhir untuk menghitung persentil
+class Histogram:
+    def __init__(self, buckets, window=10000):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.recent = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.count += 1
+            self.total += value
+            self.recent.append(value)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+
+    def percentile(self, q):
+        with self._lock:
+            values = list(self.recent)
+        return float(np.percentile(values, q)) if values else 0.0
+
+    # Baris-baris metrik format Prometheus untuk histogram ini
+    def prometheus_lines(self, name, labels=''):
+        label_prefix = labels + ',' if labels else ''
+        with self._lock:
+            lines = [f'{name}_bucket{{{label_prefix}le="{bound}"}} {count}'
+                     for bound, count in zip(self.buckets, self.counts)]
+            lines.append(f'{name}_bucket{{{label_prefix}le="+Inf"}} {self.count}')
+            lines.append(f'{name}_sum{{{labels}}} {self.total}')
+            lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+# Metrik per tahap untuk seluruh proses: histogram durasi, jumlah error dan jumlah trace
+class StageMetrics:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._stages = {}
+        self._errors = collections.Counter()
+        self._traces = collections.Counter()
+        self._lock = threading.Lock()
+
+    def observe(self, trace_name, stage, seconds, error=False):
+        with self._lock:
+            key = (trace_name, stage)
+            if key not in self._stages:
+                self._stages[key] = Histogram(self.buckets)
+            histogram = self._stages[key]
+            if error:
+                self._errors[key] += 1
+        histogram.observe(seconds)
+
+    def count_trace(self, trace_name):
+        with self._lock:
+            self._traces[trace_name] += 1
+
+    # Ringkasan per tahap: jumlah, rata-rata dan persentil (ms)
+    def summary(self):
+        with self._lock:
+            stages = dict(self._stages)
+            errors = dict(self._errors)
+        return [{
+            'trace': trace_name,
+            'stage': stage,
+            'count': histogram.count,
+            'errors': errors.get((trace_name, stage), 0),
+            'mean_ms': histogram.total / histogram.count * 1000 if histogram.count else 0.0,
+            'p50_ms': histogram.percentile(50) * 1000,
+            'p95_ms': histogram.percentile(95) * 1000
+        } for (trace_name, stage), histogram in sorted(stages.items())]
+
+    def prometheus_lines(self):
+        with self._lock:
+            stages = dict(self._stages)
+            errors = dict(self._errors)
+            traces = dict(self._traces)
+        lines = ['# TYPE sentimen_stage_duration_seconds histogram']
+        for (trace_name, stage), histogram in sorted(stages.items()):
+            lines += histogram.prometheus_lines('sentimen_stage_duration_seconds',
+                                                f'trace="{trace_name}",stage="{stage}"')
+        lines.append('# TYPE sentimen_stage_errors_total counter')
+        for (trace_name, stage), count in sorted(errors.items()):
+            lines.append(f'sentimen_stage_errors_total{{trace="{trace_name}",stage="{stage}"}} {count}')
+        lines.append('# TYPE sentimen_traces_total counter')
+        for trace_name, count in sorted(traces.items()):
+            lines.append(f'sentimen_traces_total{{trace="{trace_name}"}} {count}')
+        return lines
+
+# Metrik tahap milik proses ini
+STAGE_METRICS = StageMetrics()
+
+# Trace satu permintaan. on_span dipanggil dengan dict span setiap kali satu tahap selesai
+# (misalnya untuk menampilkan progres yang benar-benar diukur).
+class Trace:
+    def __init__(self, name, metrics=STAGE_METRICS, on_span=None, **attributes):
+        self.name = name
+        self.metrics = metrics
+        self.on_span = on_span
+        self.attributes = attributes
+        self.spans = []
+        self.started = time.perf_counter()
+        self.duration = None
+
+    @contextlib.contextmanager
+    def span(self, stage, **attributes):
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            span = {
+                'stage': stage,
+                'start_ms': (start - self.started) * 1000,
+                'duration_ms': seconds * 1000,
+                'error': error,
+                **attributes
+            }
+            self.spans.append(span)
+            if self.metrics is not None:
+                self.metrics.observe(self.name, stage, seconds, error)
+            if self.on_span is not None and not error:
+                self.on_span(span)
+
+    # Tutup trace: hitung durasi total, catat jumlah trace dan tulis baris log JSON
+    def finish(self):
+        if self.duration is None:
+            self.duration = time.perf_counter() - self.started
+            if self.metrics is not None:
+                self.metrics.count_trace(self.name)
+            logger.info(json.dumps(self.as_dict(), ensure_ascii=False))
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.finish()
+
+    def as_dict(self):
+        duration = self.duration if self.duration is not None else time.perf_counter() - self.started
+        return {
+            'trace': self.name,
+            'duration_ms': duration * 1000,
+            **self.attributes,
+            'spans': list(self.spans)
+        }
+
+# Handler HTTP endpoint metrik (GET /metrics)
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    metrics = STAGE_METRICS
+
+    def do_GET(self):
+        if self.path != '/metrics':
+            self.send_response(404)
+            self.end_headers()
+            return
+        data = ('\n'.join(self.metrics.prometheus_lines()) + '\n').encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+# Fungsi untuk menjalankan endpoint metrik di thread latar belakang
+def start_metrics_server(port, host='127.0.0.1', metrics=STAGE_METRICS):
+    handler = type('Handler', (MetricsRequestHandler,), {'metrics': metrics})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='sentimen-metrics', daemon=True).start()
+    return server
@@ -0,0 +1,269 @@
+# Vocabulary ringkas pengganti Tokenizer Keras yang di-pickle (tokenizer.pickle).
+# Memuat tokenizer.pickle membutuhkan import TensorFlow (beberapa detik). File tokenizer.vocab
+# berisi tabel kata terurut (blob UTF-8 + offset) dan array id int32 yang dibaca dengan mmap
+# dalam hitungan milidetik, tanpa TensorFlow. encode_padded mengubah satu batch teks hasil
+# preprocessing langsung menjadi matriks int32 yang sudah di-padding.
+#
+# Id identik dengan tokenizer.pickle: filter karakter, lowercase, num_words (id >= num_words
+# menjadi id OOV) dan token OOV mengikuti konfigurasi Tokenizer asli (lihat --check).
+#
+#   python -m sentimen.vocab convert   # tokenizer.pickle -> tokenizer.vocab
+#   python -m sentimen.vocab --check   # bandingkan id dengan tokenizer.pickle pada dataset
+import argparse
+import hashlib
+import json
+import logging
+import mmap
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+
+from .engine import DATASET_PATH, MAX_SEQUENCE_LENGTH, TOKENIZER_PATH, load_texts
+
+logger = logging.getLogger(__name__)
+
+VOCAB_MAGIC = b'SENTIMEN-VOCAB-1\n'
+
+# Perataan awal setiap array di dalam file (byte)
+_ALIGNMENT = 64
+
+# Fungsi lokasi file vocabulary untuk sebuah tokenizer.pickle
+def vocab_path_for(tokenizer_path=TOKENIZER_PATH):
+    return os.path.splitext(tokenizer_path)[0] + '.vocab'
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _aligned(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+# Vocabulary hasil konversi Tokenizer Keras. File berisi kata-kata terurut dalam satu blob
+# UTF-8, offset uint32 setiap kata dan id int32, semuanya dibaca sebagai view mmap.
+class Vocabulary:
+    def __init__(self, blob, offsets, ids, num_words=None, oov_index=None, lower=True,
+                 filters='', split=' ', source_sha256=None):
+        self.blob = blob
+        self.offsets = offsets
+        self.ids = ids
+        self.num_words = num_words
+        self.oov_index = oov_index
+        self.lower = lower
+        self.filters = filters
+        self.split = split
+        self.source_sha256 = source_sha256
+        self._filter_table = str.maketrans({char: split for char in filters})
+        self._encoding = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def words(self):
+        blob = bytes(self.blob)
+        return [blob[start:end].decode('utf-8') for start, end in zip(self.offsets[:-1].tolist(),
+                                                                       self.offsets[1:].tolist())]
+
+    # word_index seperti Tokenizer Keras
+    @property
+    def word_index(self):
+        return dict(zip(self.words(), self.ids.tolist()))
+
+    # Id yang dipakai saat encode: id >= num_words diganti id OOV (atau dibuang jika tanpa OOV).
+    # Dibuat sekali saat encode pertama (dict beberapa ribu kata, hitungan milidetik).
+    def _encoding_table(self):
+        if self._encoding is None:
+            table = {}
+            for word, index in zip(self.words(), self.ids.tolist()):
+                if self.num_words and index >= self.num_words:
+                    index = self.oov_index
+                if index is not None:
+                    table[word] = index
+            self._encoding = table
+        return self._encoding
+
+    # Konversi dari Tokenizer Keras (atau objek dengan atribut yang sama)
+    @classmethod
+    def from_tokenizer(cls, tokenizer, source_sha256=None):
+        if getattr(tokenizer, 'char_level', False) or getattr(tokenizer, 'analyzer', None) is not None:
+            raise ValueError("Tokenizer char_level atau dengan analyzer khusus tidak didukung.")
+        items = sorted(tokenizer.word_index.items())
+        encoded = [word.encode('utf-8') for word, _ in items]
+        offsets = np.zeros(len(items) + 1, dtype='<u4')
+        offsets[1:] = np.cumsum([len(word) for word in encoded])
+        oov_token = tokenizer.oov_token
+        return cls(
+            b''.join(encoded), offsets, np.array([index for _, index in items], dtype='<i4'),
+            num_words=tokenizer.num_words,
+            oov_index=tokenizer.word_index.get(oov_token) if oov_token is not None else None,
+            lower=tokenizer.lower,
+            filters=tokenizer.filters,
+            split=tokenizer.split,
+            source_sha256=source_sha256
+        )
+
+    def save(self, path):
+        header = json.dumps({
+            'count': len(self.ids),
+            'blob_bytes': len(self.blob),
+            'num_words': self.num_words,
+            'oov_index': self.oov_index,
+            'lower': self.lower,
+            'filters': self.filters,
+            'split': self.split,
+            'source_sha256': self.source_sha256
+        }, ensure_ascii=False).encode('utf-8')
+        prefix = VOCAB_MAGIC + len(header).to_bytes(4, 'little') + header
+        offsets_offset = _aligned(len(prefix))
+        ids_offset = _aligned(offsets_offset + self.offsets.nbytes)
+        blob_offset = _aligned(ids_offset + self.ids.nbytes)
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as handle:
+            for offset, data in [(0, prefix), (offsets_offset, np.asarray(self.offsets, dtype='<u4').tobytes()),
+                                 (ids_offset, np.asarray(self.ids, dtype='<i4').tobytes()),
+                                 (blob_offset, bytes(self.blob))]:
+                handle.write(b'\0' * (offset - handle.tell()))
+                handle.write(data)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as handle:
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if buffer[:len(VOCAB_MAGIC)] != VOCAB_MAGIC:
+            raise ValueError(f"File '{path}' bukan file vocabulary.")
+        header_start = len(VOCAB_MAGIC) + 4
+        header_length = int.from_bytes(buffer[len(VOCAB_MAGIC):header_start], 'little')
+        header = json.loads(buffer[header_start:header_start + header_length].decode('utf-8'))
+
+        count = header['count']
+        offsets_offset = _aligned(header_start + header_length)
+        ids_offset = _aligned(offsets_offset + (count + 1) * 4)
+        blob_offset = _aligned(ids_offset + count * 4)
+        offsets = np.frombuffer(buffer, dtype='<u4', count=count + 1, offset=offsets_offset)
+        ids = np.frombuffer(buffer, dtype='<i4', count=count, offset=ids_offset)
+        blob = memoryview(buffer)[blob_offset:blob_offset + header['blob_bytes']]
+        return cls(blob, offsets, ids, header['num_words'], header['oov_index'], header['lower'],
+                   header['filters'], header['split'], header['source_sha256'])
+
+    # Pemecahan teks sama dengan text_to_word_sequence Keras; token list hanya di-lowercase
+    def split_text(self, text):
+        if isinstance(text, list):
+            return [token.lower() for token in text] if self.lower else text
+        if self.lower:
+            text = text.lower()
+        return [word for word in text.translate(self._filter_table).split(self.split) if word]
+
+    # Antarmuka sama dengan Tokenizer.texts_to_sequences
+    def texts_to_sequences(self, texts):
+        table = self._encoding_table()
+        oov_index = self.oov_index
+        sequences = []
+        for text in texts:
+            ids = [table.get(word, oov_index) for word in self.split_text(text)]
+            sequences.append([index for index in ids if index is not None] if oov_index is None else ids)
+        return sequences
+
+    # Fungsi encode batch: teks hasil preprocessing (atau list token) -> matriks int32 padded
+    # (padding dan truncating 'post', sama dengan engine.pad_token_sequences)
+    def encode_padded(self, texts, maxlen=MAX_SEQUENCE_LENGTH):
+        sequences = self.texts_to_sequences(texts)
+        lengths = np.fromiter((min(len(ids), maxlen) for ids in sequences), dtype=np.int64, count=len(sequences))
+        flat = np.fromiter((index for ids in sequences for index in ids[:maxlen]), dtype=np.int32,
+                           count=int(lengths.sum()))
+        rows = np.repeat(np.arange(len(sequences)), lengths)
+        starts = np.cumsum(lengths) - lengths
+        padded = np.zeros((len(sequences), maxlen), dtype=np.int32)
+        padded[rows, np.arange(len(flat)) - np.repeat(starts, lengths)] = flat
+        return padded
+
+# Fungsi konversi tokenizer.pickle ke tokenizer.vocab (membutuhkan Keras untuk unpickle)
+def convert_tokenizer(tokenizer_path=TOKENIZER_PATH, vocab_path=None):
+    with open(tokenizer_path, 'rb') as handle:
+        tokenizer = pickle.load(handle)
+    vocabulary = Vocabulary.from_tokenizer(tokenizer, _file_sha256(tokenizer_path))
+    vocabulary.save(vocab_path or vocab_path_for(tokenizer_path))
+    return vocabulary
+
+# Fungsi untuk memuat vocabulary untuk tokenizer.pickle. Jika tokenizer.vocab belum ada atau
+# dibuat dari tokenizer.pickle yang berbeda, file dikonversi ulang (sekali) lalu disimpan.
+def load_vocabulary(tokenizer_path=TOKENIZER_PATH):
+    vocab_path = vocab_path_for(tokenizer_path)
+    source_sha256 = _file_sha256(tokenizer_path)
+    if os.path.exists(vocab_path):
+        try:
+            vocabulary = Vocabulary.load(vocab_path)
+            if vocabulary.source_sha256 == source_sha256:
+                return vocabulary
+        except (ValueError, KeyError, OSError) as e:
+            logger.warning("File vocabulary '%s' tidak dapat dibaca: %s", vocab_path, e)
+
+    with open(tokenizer_path, 'rb') as handle:
+        vocabulary = Vocabulary.from_tokenizer(pickle.load(handle), source_sha256)
+    try:
+        vocabulary.save(vocab_path)
+    except OSError as e:
+        logger.warning("File vocabulary '%s' tidak dapat disimpan: %s", vocab_path, e)
+    return vocabulary
+
+# Fungsi untuk membandingkan id vocabulary dengan Tokenizer Keras pada teks yang sama
+def check(texts, tokenizer_path=TOKENIZER_PATH):
+    from .engine import pad_token_sequences, preprocess_texts
+
+    with open(tokenizer_path, 'rb') as handle:
+        tokenizer = pickle.load(handle)
+    vocabulary = Vocabulary.load(vocab_path_for(tokenizer_path))
+    processed_texts, token_lists = preprocess_texts(texts)
+    # Kasus tepi: kata tidak dikenal, garis bawah/tanda baca (filter), huruf besar, kata sangat panjang
+    processed_texts += ['', 'kata_tidak_dikenal xyz', 'MAKAN Gratis!!', 'a' * 200, 'makan ' * 150]
+
+    expected = tokenizer.texts_to_sequences(processed_texts)
+    mismatches = [text for text, ids, want in zip(processed_texts, vocabulary.texts_to_sequences(processed_texts),
+                                                  expected) if ids != want]
+    padded_equal = np.array_equal(vocabulary.encode_padded(processed_texts), pad_token_sequences(expected))
+    token_lists_equal = np.array_equal(vocabulary.encode_padded(token_lists),
+                                       pad_token_sequences(tokenizer.texts_to_sequences(token_lists)))
+    return len(processed_texts), mismatches, padded_equal and token_lists_equal
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sentimen.vocab',
+        description="Konversi tokenizer.pickle ke vocabulary ringkas (mmap) dan cek kesamaan id."
+    )
+    parser.add_argument('command', nargs='?', choices=['convert'], help="Konversi tokenizer.pickle")
+    parser.add_argument('--tokenizer', default=TOKENIZER_PATH, help="File tokenizer.pickle")
+    parser.add_argument('--check', action='store_true',
+                        help="Bandingkan id dengan tokenizer.pickle, exit code 1 jika berbeda")
+    parser.add_argument('--data', default=DATASET_PATH, help="File CSV teks uji untuk --check")
+    parser.add_argument('--text-field', default='full_text', help="Kolom teks (default: full_text)")
+    parser.add_argument('--limit', type=int, default=None, help="Jumlah baris maksimum untuk --check")
+    args = parser.parse_args(argv)
+
+    if args.command == 'convert':
+        vocabulary = convert_tokenizer(args.tokenizer)
+        path = vocab_path_for(args.tokenizer)
+        print(f"{path}: {len(vocabulary)} kata, {os.path.getsize(path)} byte")
+
+    start = time.perf_counter()
+    vocabulary = Vocabulary.load(vocab_path_for(args.tokenizer)) if os.path.exists(vocab_path_for(args.tokenizer)) \
+        else load_vocabulary(args.tokenizer)
+    print(f"Waktu muat vocabulary: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    if args.check:
+        total, mismatches, padded_equal = check(load_texts(args.data, args.text_field, args.limit), args.tokenizer)
+        print(f"{total - len(mismatches)}/{total} sequence identik, matriks padded "
+              f"{'identik' if padded_equal else 'BERBEDA'}")
+        for text in mismatches[:10]:
+            print(f"  berbeda: {text[:100]!r}")
+        if mismatches or not padded_equal:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
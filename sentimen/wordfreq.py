@@ -0,0 +1,27 @@
+# Frekuensi kata untuk word cloud hasil analisis batch.
+# Teks hasil preprocessing dijumlahkan sekali saat dianalisis, sehingga word cloud cukup membaca
+# kata terbanyak tanpa memecah ulang seluruh korpus setiap rerun.
+import collections
+
+class WordFrequencies:
+    def __init__(self):
+        self.counts = collections.Counter()
+        self.documents = 0
+
+    # Tambahkan teks (kata dipisah spasi, seperti hasil preprocess_texts) atau list token
+    def update(self, texts):
+        texts = list(texts)
+        if texts and all(isinstance(text, str) for text in texts):
+            self.counts.update(' '.join(texts).split())
+        else:
+            for tokens in texts:
+                self.counts.update(tokens.split() if isinstance(tokens, str) else tokens)
+        self.documents += len(texts)
+        return self
+
+    # Kata terbanyak sebagai tuple (kata, jumlah), bisa dipakai sebagai kunci cache gambar
+    def most_common(self, n=100):
+        return tuple(self.counts.most_common(n))
+
+    def __len__(self):
+        return len(self.counts)
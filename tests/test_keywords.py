@@ -0,0 +1,59 @@
+# Pencocokan kata kunci: batas kata, frasa dengan whitespace ganda, dan kesamaan hasil
+# match (satu teks) dengan match_batch (banyak teks sekaligus).
+import numpy as np
+import pytest
+
+from sentimen.keywords import KeywordMatcher
+
+@pytest.fixture(scope='module')
+def matcher():
+    return KeywordMatcher({'bisa': 1.0, 'terima kasih': 2.0, 'baik': 0.5}, ['tai', 'tidak', 'buruk'])
+
+TEXTS = [
+    "Liburan ke pantai",
+    "Dasar tai!",
+    "bisanya cuma mengeluh",
+    "Kita BISA, pasti bisa",
+    "terima   kasih banyak",
+    "terima\tkasih\nsemua",
+    "terimakasih",
+    "tidak baik, buruk sekali",
+    "",
+    "pantai\x00tai",
+]
+
+@pytest.mark.parametrize('text, positive, negative', [
+    ("Liburan ke pantai", [], []),
+    ("Dasar tai!", [], ['tai']),
+    ("bisanya cuma mengeluh", [], []),
+    ("Kita BISA, pasti bisa", ['bisa'], []),
+    ("terima   kasih banyak", ['terima kasih'], []),
+    ("terimakasih", [], []),
+])
+def test_word_boundaries_and_phrases(matcher, text, positive, negative):
+    positive_matches, negative_matches, _, _ = matcher.match(text)
+    assert positive_matches == positive
+    assert negative_matches == negative
+
+def test_weights(matcher):
+    assert matcher.match("terima   kasih, baik") == (['terima kasih', 'baik'], [], 2.5, 0.0)
+
+def test_match_batch_parity(matcher):
+    batch = matcher.match_batch(TEXTS)
+    for i, text in enumerate(TEXTS):
+        positive_matches, negative_matches, positive_weight, negative_weight = matcher.match(text)
+        assert batch['positive_matches'][i] == positive_matches
+        assert batch['negative_matches'][i] == negative_matches
+        assert batch['positive_count'][i] == len(positive_matches)
+        assert batch['negative_count'][i] == len(negative_matches)
+        assert batch['positive_weight'][i] == positive_weight
+        assert batch['negative_weight'][i] == negative_weight
+
+def test_match_batch_does_not_join_across_texts(matcher):
+    batch = matcher.match_batch(["terima", "kasih"])
+    assert batch['positive_matches'] == [[], []]
+
+def test_match_batch_empty():
+    batch = KeywordMatcher([], []).match_batch(["apa saja", ""])
+    assert batch['positive_matches'] == [[], []]
+    assert np.array_equal(batch['positive_weight'], [0.0, 0.0])
@@ -0,0 +1,28 @@
+# Golden test normalisasi: hasil normalize_text/normalize_texts harus identik byte demi byte
+# dengan rangkaian re.sub lama (reference_clean_text) pada dataset_10k.csv dan kasus tepi.
+import os
+
+import pytest
+
+from sentimen.engine import DATASET_PATH, load_texts
+from sentimen.normalizer import EDGE_CASES, check, normalize_text, normalize_texts, reference_clean_text
+
+@pytest.fixture(scope='module')
+def dataset_texts():
+    if not os.path.exists(DATASET_PATH):
+        pytest.skip(f"Dataset '{DATASET_PATH}' tidak ditemukan.")
+    return load_texts(DATASET_PATH)
+
+def test_dataset_identical_to_legacy_chain(dataset_texts):
+    total, mismatches = check(dataset_texts)
+    assert total == len(dataset_texts) + len(EDGE_CASES)
+    assert mismatches == []
+
+def test_dataset_byte_identical(dataset_texts):
+    expected = [reference_clean_text(text).encode('utf-8') for text in dataset_texts]
+    assert [normalize_text(text).encode('utf-8') for text in dataset_texts] == expected
+    assert [text.encode('utf-8') for text in normalize_texts(dataset_texts)] == expected
+
+@pytest.mark.parametrize('text', EDGE_CASES)
+def test_edge_case_identical_to_legacy_chain(text):
+    assert normalize_text(text) == reference_clean_text(text)